@@ -0,0 +1,573 @@
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import discord
+from pymongo import monitoring
+
+from benchmarks.memorydb import COLLECTIONS, POOL_WAIT_BUCKETS_MS, MemoryDatabase
+from benchmarks.run import CONFIG_PATH, ROOT, _git_commit
+from server.events import GATHER, EventBus
+from server.loopMonitor import LoopLagMonitor
+from server.metrics import CommandMetrics, Histogram
+
+logger = logging.getLogger("bench.load")
+
+# Load generator: thousands of simulated players sharing one bot and one database, each a
+# loop of think time and a command picked from a weighted mix (gathering, crafting,
+# hunting, dungeon runs, inventory browsing). Unlike benchmarks/run.py nothing is lined up
+# in rounds, so commands from different players, and with --overlap from the same
+# impatient player, interleave the way gateway traffic does. The JSON report has
+# throughput, tail latency per command, contention (connection-pool waits, event-loop lag,
+# same-player overlaps) and the anomalies the interleaving produced: collection counts
+# that lost gathers to racing read-modify-writes, and ingredients crafted below zero.
+#
+#   python -m benchmarks.load --players 2000 --duration 60 --output load.json
+#   python -m benchmarks.load --backend mongo --mongo-uri mongodb://localhost:27017
+#
+# The mongo backend writes players with ids from FIRST_USER_ID up into --db-name and
+# deletes them again afterwards (unless --keep-data).
+
+# Relative weights of what an idle player does next; a player in a dungeon run keeps
+# clicking through it instead
+MIXES: Dict[str, Dict[str, int]] = {
+    "gather-heavy": {"mine": 25, "forage": 20, "scavenge": 20, "hunt": 10, "craft": 10, "inventory": 10, "dungeon": 5},
+    "balanced": {"mine": 12, "forage": 12, "scavenge": 12, "hunt": 16, "craft": 16, "inventory": 16, "dungeon": 16},
+    "dungeon": {"mine": 5, "forage": 5, "scavenge": 5, "hunt": 10, "craft": 5, "inventory": 10, "dungeon": 60},
+}
+# command -> (cog, callback attribute)
+SIMPLE_COMMANDS: Dict[str, Tuple[str, str]] = {
+    "mine": ("MiningCog", "mine"),
+    "forage": ("ForagingCog", "forage"),
+    "scavenge": ("ScavengingCog", "scavenge"),
+    "hunt": ("CombatCog", "hunt"),
+}
+# recipe -> weight: a plain item and an instanced armor piece
+CRAFTS: Dict[str, int] = {"toolrod": 7, "wooden helmet": 3}
+# Crafts' worth of ingredients handed out at a time. Small on purpose: players run dry and
+# restock, and two crafts racing for the last set is what can overspend
+CRAFT_STOCK = 3
+INVENTORY_NEXT_PAGE = 0.5
+# collection counters fed by the gathering commands in the mix
+LEDGER_KEYS = ("ore", "wood", "herb")
+# the database index.py runs the bot against
+PROTECTED_DB = "alphaworks"
+
+
+class LedgerBus(EventBus):
+    """
+    The bot's event bus, also tallying collection gathers as they are emitted. A gather
+    emits only after its writes went through, so the tally is what the collections
+    should add up to.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.gathered: Counter = Counter()
+
+    def emit(self, user_id: int, kind: str, target: str, amount: int = 1, interaction: Any = None) -> None:
+        super().emit(user_id, kind, target, amount, interaction)
+        if kind == GATHER and target in LEDGER_KEYS and amount > 0:
+            self.gathered[user_id, target] += amount
+
+
+class PoolWaitListener(monitoring.ConnectionPoolListener):
+    """Time spent waiting for a pooled connection (ms), from pymongo's checkout events."""
+
+    def __init__(self) -> None:
+        self.wait = Histogram(POOL_WAIT_BUCKETS_MS)
+        self._lock = threading.Lock()
+
+    def _observe(self, event) -> None:
+        if event.duration is not None:
+            with self._lock:
+                self.wait.observe(event.duration * 1000)
+
+    def connection_checked_out(self, event: monitoring.ConnectionCheckedOutEvent) -> None:
+        self._observe(event)
+
+    def connection_check_out_failed(self, event: monitoring.ConnectionCheckOutFailedEvent) -> None:
+        self._observe(event)
+
+    def pool_created(self, event) -> None:
+        pass
+
+    def pool_ready(self, event) -> None:
+        pass
+
+    def pool_cleared(self, event) -> None:
+        pass
+
+    def pool_closed(self, event) -> None:
+        pass
+
+    def connection_created(self, event) -> None:
+        pass
+
+    def connection_ready(self, event) -> None:
+        pass
+
+    def connection_closed(self, event) -> None:
+        pass
+
+    def connection_check_out_started(self, event) -> None:
+        pass
+
+    def connection_checked_in(self, event) -> None:
+        pass
+
+
+def _percentiles(hist: Histogram) -> Dict[str, float]:
+    return {
+        "count": hist.count,
+        "mean_ms": round(hist.mean, 3),
+        "p50_ms": round(hist.percentile(0.50), 3),
+        "p99_ms": round(hist.percentile(0.99), 3),
+        "p999_ms": round(hist.percentile(0.999), 3),
+    }
+
+
+class LoadTest:
+    """Simulated players playing concurrently for a fixed time, plus what they ran into."""
+
+    def __init__(self, bot, db, players: List, args: argparse.Namespace) -> None:
+        self.bot = bot
+        self.db = db
+        self.players = players
+        self.mix = MIXES[args.mix]
+        self.think = args.think_ms / 1000
+        self.overlap = args.overlap
+        self.rng = random.Random(args.seed)
+        # player id -> the dungeon room view they are looking at
+        self.views: Dict[int, discord.ui.View] = {}
+        self.in_flight: Counter = Counter()
+        self.overlaps = 0
+        self.refusals: Dict[str, Counter] = {}
+        self.errors: Dict[str, Dict[str, Any]] = {}
+        # (player id, collection key) -> count before the load started
+        self.baseline: Dict[Tuple[int, str], int] = {}
+        # (player id, item, count) seen below zero when restocking
+        self.overspent: List[Tuple[int, str, int]] = []
+        self._tasks: Set[asyncio.Task] = set()
+
+    @property
+    def metrics(self) -> CommandMetrics:
+        return self.bot.metrics
+
+    @property
+    def _id_range(self) -> Dict[str, int]:
+        ids = [p.id for p in self.players]
+        return {"$gte": min(ids), "$lte": max(ids)}
+
+    # --- fixtures (DB API only, charged to a sample that is never finished) ---
+    async def fixture(self, player, coro) -> None:
+        from benchmarks.scenarios import SETUP
+        from benchmarks.stubs import StubInteraction
+        self.metrics.begin(StubInteraction(self.bot, player.user, data={"name": SETUP}))
+        await coro
+
+    async def _rest(self, player, leave_dungeon: bool = False) -> None:
+        """Stands in for waiting out stamina/HP regen (and walking out of a stuck run)."""
+        fields: Dict[str, Any] = {"lastStaminaUpdate": time.time()}
+        if leave_dungeon:
+            self.views.pop(player.id, None)
+            await self.bot.get_cog("DungeonCog").drop_run(player.id)
+            fields["inDungeon"] = False
+        general = await self.db.general.find_one({"id": player.id}, {"maxStamina": 1, "maxHP": 1})
+        fields.update(stamina=general.get("maxStamina", 200), hp=general.get("maxHP", 100))
+        await self.db.general.update_one({"id": player.id}, {"$set": fields})
+
+    async def _restock(self, player, recipe: str) -> None:
+        from benchmarks.scenarios import recipe_ingredients
+        from server.inventoryData import change_items
+        stock = recipe_ingredients(recipe, CRAFT_STOCK)
+        inventory = await self.db.inventory.find_one({"id": player.id}, {item: 1 for item in stock}) or {}
+        deltas = {}
+        for item, wanted in stock.items():
+            have = int(inventory.get(item, 0))
+            if have < 0:
+                self.overspent.append((player.id, item, have))
+            if have < wanted:
+                deltas[item] = wanted - have
+        await change_items(self.db, player.id, deltas)
+
+    async def prepare(self) -> None:
+        from benchmarks.scenarios import DUNGEON_STRENGTH
+
+        async def one(player) -> None:
+            await self.db.general.update_one({"id": player.id}, {"$set": {"strength": DUNGEON_STRENGTH}})
+            for recipe in CRAFTS:
+                await self._restock(player, recipe)
+            doc = await self.db.collections.find_one({"id": player.id}, {key: 1 for key in LEDGER_KEYS}) or {}
+            for key in LEDGER_KEYS:
+                self.baseline[player.id, key] = int(doc.get(key, 0))
+
+        await asyncio.gather(*(self.fixture(p, one(p)) for p in self.players))
+
+    # --- measured calls ---
+    async def _measure(self, name: str, interaction, call) -> bool:
+        """Run one command or click; False when it failed or the player was turned away."""
+        self.metrics.begin(interaction)
+        failed = False
+        try:
+            await call
+        except Exception as exc:
+            failed = True
+            errors = self.errors.setdefault(name, {"count": 0, "first": None})
+            errors["count"] += 1
+            if errors["first"] is None:
+                errors["first"] = repr(exc)
+                logger.exception("%s failed for player %s", name, interaction.user.id)
+        finally:
+            self.metrics.finish(interaction, failed=failed)
+        if failed:
+            return False
+        refusal = interaction.refusal()
+        if refusal is not None:
+            self.refusals.setdefault(name, Counter())[refusal] += 1
+            return False
+        return True
+
+    async def _simple(self, player, name: str) -> None:
+        from benchmarks.stubs import StubInteraction
+        cog_name, attr = SIMPLE_COMMANDS[name]
+        cog = self.bot.get_cog(cog_name)
+        interaction = StubInteraction(self.bot, player.user, command=name)
+        if not await self._measure(name, interaction, getattr(cog, attr).callback(cog, interaction)):
+            await self.fixture(player, self._rest(player))
+
+    async def _craft(self, player) -> None:
+        from benchmarks.stubs import StubInteraction
+        recipe = self.rng.choices(list(CRAFTS), weights=list(CRAFTS.values()))[0]
+        cog = self.bot.get_cog("CraftingCog")
+        interaction = StubInteraction(self.bot, player.user, command="craft")
+        if not await self._measure("craft", interaction, cog.craft.callback(cog, interaction, recipe, 1)):
+            await self.fixture(player, self._restock(player, recipe))
+
+    async def _inventory(self, player) -> None:
+        from benchmarks.stubs import StubInteraction
+        cog = self.bot.get_cog("InventoryCog")
+        interaction = StubInteraction(self.bot, player.user, command="inventory")
+        if not await self._measure("inventory", interaction, cog.inventory.callback(cog, interaction)):
+            return
+        view = interaction.last_view()
+        if view is not None and self.rng.random() < INVENTORY_NEXT_PAGE:
+            click = StubInteraction(self.bot, player.user, data={"name": "inventory_page", "custom_id": "next"})
+            await self._measure("inventory_page", click, view.next_button.callback(click))
+
+    async def _dungeon(self, player) -> None:
+        from benchmarks.stubs import StubInteraction
+        cog = self.bot.get_cog("DungeonCog")
+        view = self.views.pop(player.id, None)
+        if view is None:
+            interaction = StubInteraction(self.bot, player.user, command="dungeon")
+            if not await self._measure("dungeon", interaction, cog.dungeon.callback(cog, interaction)):
+                await self.fixture(player, self._rest(player, leave_dungeon=True))
+                return
+            if interaction.last_view() is not None:
+                self.views[player.id] = interaction.last_view()
+            return
+
+        # load_extension re-imports the module, so take the class from the loaded copy
+        combat_view = self.bot.extensions["cogs.features.dungeons"].DungeonCombatView
+        if isinstance(view, combat_view):
+            name, button = "dungeon_turn", view.attack_button
+        else:
+            # puzzle: first answer; trap: take the risk
+            name, button = "dungeon_room", view.children[0]
+        interaction = StubInteraction(self.bot, player.user, data={"name": name, "custom_id": name})
+        await self._measure(name, interaction, button.callback(interaction))
+
+        following = interaction.last_view()
+        if following is not None and following is not view:
+            self.views[player.id] = following
+        elif (isinstance(view, combat_view) and player.id in cog.active_dungeons
+              and view.current_mob_index < len(view.mobs)):
+            self.views[player.id] = view
+        # otherwise the run is over: defeated, floor cleared, or nothing left to click
+
+    async def _act(self, player, action: str) -> None:
+        try:
+            if action in SIMPLE_COMMANDS:
+                await self._simple(player, action)
+            elif action == "craft":
+                await self._craft(player)
+            elif action == "inventory":
+                await self._inventory(player)
+            else:
+                await self._dungeon(player)
+        except Exception:
+            # fixture trouble; the measured part records its own errors
+            logger.exception("%s fixture failed for player %s", action, player.id)
+        finally:
+            self.in_flight[player.id] -= 1
+
+    # --- players ---
+    async def _play(self, player, start_delay: float) -> None:
+        actions, weights = list(self.mix), list(self.mix.values())
+        await asyncio.sleep(start_delay)
+        while True:
+            if self.think:
+                await asyncio.sleep(self.rng.expovariate(1 / self.think))
+            # a run is clicked through to the end, one button at a time
+            action = "dungeon" if player.id in self.views else self.rng.choices(actions, weights=weights)[0]
+            if self.in_flight[player.id]:
+                self.overlaps += 1
+            self.in_flight[player.id] += 1
+            task = asyncio.create_task(self._act(player, action))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+            # only impatient players fire again before the reply; a button can't be clicked
+            # before the message showing it arrives
+            if action == "dungeon" or self.rng.random() >= self.overlap:
+                # shielded: stopping the player lets the command finish
+                await asyncio.shield(task)
+
+    async def _progress(self, every: float, monitor: LoopLagMonitor, pool_wait: Histogram, started: float) -> None:
+        while True:
+            await asyncio.sleep(every)
+            window = self.metrics.flush_window()
+            calls = sum(stats["count"] for stats in window.values())
+            worst = max(window.items(), key=lambda item: item[1]["p99_ms"], default=("-", {"p99_ms": 0.0}))
+            logger.info(
+                "%5.0fs %8.1f cmd/s  worst p99 %7.1f ms (/%s)  loop lag %5.1f ms (max %.1f)  pool wait p99 %.1f ms",
+                time.perf_counter() - started, calls / every, worst[1]["p99_ms"], worst[0],
+                monitor.last_lag * 1000, monitor.max_lag * 1000, pool_wait.percentile(0.99),
+            )
+
+    async def run(self, duration: float, ramp_up: float, report_every: float,
+                  monitor: LoopLagMonitor, pool_wait: Histogram) -> float:
+        """Play for `duration` seconds; returns the seconds until the last command finished."""
+        started = time.perf_counter()
+        players = [asyncio.create_task(self._play(p, self.rng.uniform(0, ramp_up))) for p in self.players]
+        progress = asyncio.create_task(self._progress(report_every, monitor, pool_wait, started)) if report_every else None
+        await asyncio.sleep(duration)
+        for player in players:
+            player.cancel()
+        await asyncio.gather(*players, return_exceptions=True)
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks))
+        elapsed = time.perf_counter() - started
+        if progress is not None:
+            progress.cancel()
+        return elapsed
+
+    # --- anomalies ---
+    async def audit(self) -> Dict[str, Any]:
+        """Compare stored collections with the emitted gathers; find negative item counts."""
+        from server.inventoryData import INVENTORY_META_FIELDS
+        gathered: Counter = self.bot.events.gathered
+        lost: Counter = Counter()
+        excess: Counter = Counter()
+        lost_players: Set[int] = set()
+        for doc in await self.db.collections.find({"id": self._id_range}).to_list(None):
+            for key in LEDGER_KEYS:
+                expected = self.baseline.get((doc["id"], key), 0) + gathered[doc["id"], key]
+                stored = int(doc.get(key, 0))
+                if stored < expected:
+                    lost[key] += expected - stored
+                    lost_players.add(doc["id"])
+                elif stored > expected:
+                    excess[key] += stored - expected
+
+        negative = list(self.overspent)
+        for doc in await self.db.inventory.find({"id": self._id_range}).to_list(None):
+            negative.extend(
+                (doc["id"], key, value) for key, value in doc.items()
+                if key not in INVENTORY_META_FIELDS and key not in ("_id", "id")
+                and isinstance(value, (int, float)) and value < 0
+            )
+        return {
+            "lost_updates": {
+                "gathered": sum(gathered.values()),
+                "lost": sum(lost.values()),
+                "by_collection": dict(sorted(lost.items())),
+                "players": len(lost_players),
+                # more stored than gathered would mean a write applied twice
+                "excess": sum(excess.values()),
+            },
+            "negative_inventory": {
+                "occurrences": len(negative),
+                "players": len({player_id for player_id, _, _ in negative}),
+                "examples": [{"id": i, "item": item, "count": count} for i, item, count in negative[:5]],
+            },
+        }
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.load",
+                                     description="Simulate many concurrent players against the cogs.")
+    parser.add_argument("--players", type=int, default=2000, help="simulated players (default 2000)")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds of load after seeding (default 30)")
+    parser.add_argument("--ramp-up", type=float, default=5.0, help="players join over this many seconds (default 5)")
+    parser.add_argument("--mix", choices=sorted(MIXES), default="gather-heavy", help="command mix (default gather-heavy)")
+    parser.add_argument("--think-ms", type=float, default=2000.0,
+                        help="mean pause between a player's commands, exponentially distributed (default 2000)")
+    parser.add_argument("--overlap", type=float, default=0.05,
+                        help="chance a player sends the next command without waiting for the reply (default 0.05)")
+    parser.add_argument("--backend", choices=("memory", "mongo"), default="memory")
+    parser.add_argument("--mongo-uri", default="mongodb://localhost:27017")
+    parser.add_argument("--db-name", default="starfall_loadtest", help="mongo backend database (default starfall_loadtest)")
+    parser.add_argument("--keep-data", action="store_true", help="mongo backend: leave the simulated players in place")
+    parser.add_argument("--reply-bytes", action="store_true",
+                        help="mongo backend: size every reply for db_kb (re-encodes each reply)")
+    parser.add_argument("--latency-ms", type=float, default=1.0, help="memory backend: simulated round trip (default 1)")
+    parser.add_argument("--jitter-ms", type=float, default=0.5, help="memory backend: random extra round-trip time (default 0.5)")
+    parser.add_argument("--pool-size", type=int, default=100,
+                        help="memory backend: connection pool size, like Motor's maxPoolSize (default 100, 0 for none)")
+    parser.add_argument("--stall-ms", type=float, default=500.0,
+                        help="log the loop's stack when it is blocked this long (default 500, 0 to disable)")
+    parser.add_argument("--report-every", type=float, default=5.0, help="progress line interval in seconds (0 for none)")
+    parser.add_argument("--seed", type=int, default=1, help="seed for player behaviour, game RNG and simulated latency")
+    parser.add_argument("--output", type=Path, help="also write the JSON report to this file")
+    args = parser.parse_args(argv)
+    if args.backend == "mongo" and args.db_name == PROTECTED_DB:
+        parser.error(f"refusing to load-test the bot's own database ({PROTECTED_DB})")
+    if not 0 <= args.overlap <= 1:
+        parser.error("--overlap must be between 0 and 1")
+    return args
+
+
+async def _clear_players(db, first_id: int, count: int) -> None:
+    ids = {"id": {"$gte": first_id, "$lt": first_id + count}}
+    for name in COLLECTIONS:
+        await getattr(db, name).delete_many(ids)
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    from benchmarks.scenarios import FIRST_USER_ID, seed_players
+    from benchmarks.stubs import build_bot, close_bot
+
+    random.seed(args.seed)
+    metrics = CommandMetrics(log_interval=0)
+    listener: Optional[PoolWaitListener] = None
+    if args.backend == "memory":
+        db = MemoryDatabase(latency=args.latency_ms / 1000, jitter=args.jitter_ms / 1000, seed=args.seed,
+                            pool_size=args.pool_size or None)
+    else:
+        from database import Database
+        from server.metrics import MongoListener
+        listener = PoolWaitListener()
+        db = Database(args.mongo_uri, db_name=args.db_name, event_listeners=[MongoListener(metrics, reply_bytes=args.reply_bytes), listener])
+        if not await db.connect():
+            raise SystemExit(f"Could not connect to {args.mongo_uri}")
+        await _clear_players(db, FIRST_USER_ID, args.players)
+        for name in COLLECTIONS:
+            await getattr(db, name).create_index("id")
+
+    bot = await build_bot(db, events=LedgerBus(), metrics=metrics)
+    monitor = LoopLagMonitor(interval=0.1, slow_threshold=args.stall_ms / 1000, metrics=metrics)
+    try:
+        started = time.perf_counter()
+        players = await seed_players(bot, db, args.players)
+        load = LoadTest(bot, db, players, args)
+        await load.prepare()
+        logger.info("Seeded %d players in %.2fs", len(players), time.perf_counter() - started)
+
+        # measure waits from here on, not the seeding burst
+        pool_wait = Histogram(POOL_WAIT_BUCKETS_MS)
+        if listener is not None:
+            listener.wait = pool_wait
+        else:
+            db.pool_wait = pool_wait
+        background = (metrics.background.db_ops, metrics.background.db_bytes)
+        monitor.start()
+        elapsed = await load.run(args.duration, args.ramp_up, args.report_every, monitor, pool_wait)
+        await monitor.stop()
+        anomalies = await load.audit()
+    finally:
+        await monitor.stop()
+        await close_bot(bot)
+        if args.backend == "mongo":
+            if not args.keep_data:
+                await _clear_players(db, FIRST_USER_ID, args.players)
+            db.close()
+
+    stats, mongo_ops, mongo_failures = metrics.collect()
+    commands: Dict[str, Any] = {}
+    for name, command in sorted(stats.items()):
+        summary = command.summary()
+        summary["p999_ms"] = round(command.latency.percentile(0.999), 1)
+        summary["per_second"] = round(command.latency.count / elapsed, 1)
+        summary["refused"] = sum(load.refusals.get(name, Counter()).values())
+        if name in load.errors:
+            summary["first_error"] = load.errors[name]["first"]
+        if load.refusals.get(name):
+            summary["top_refusal"] = load.refusals[name].most_common(1)[0][0]
+        commands[name] = summary
+
+    calls = sum(c.latency.count for c in stats.values())
+    return {
+        "commit": _git_commit(),
+        "timestamp": int(time.time()),
+        "python": platform.python_version(),
+        "settings": {
+            "players": args.players,
+            "duration_s": args.duration,
+            "ramp_up_s": args.ramp_up,
+            "mix": args.mix,
+            "think_ms": args.think_ms,
+            "overlap": args.overlap,
+            "backend": args.backend,
+            "latency_ms": args.latency_ms if args.backend == "memory" else None,
+            "jitter_ms": args.jitter_ms if args.backend == "memory" else None,
+            "pool_size": args.pool_size if args.backend == "memory" else None,
+            "seed": args.seed,
+        },
+        "totals": {
+            "calls": calls,
+            "seconds": round(elapsed, 2),
+            "per_second": round(calls / elapsed, 1),
+            "errors": sum(c.errors for c in stats.values()),
+            "refused": sum(sum(r.values()) for r in load.refusals.values()),
+        },
+        "commands": commands,
+        # there are no explicit locks in the bot; these are the places commands queue up
+        "contention": {
+            "pool_wait": _percentiles(pool_wait),
+            "loop_lag": {**_percentiles(monitor.lag), "max_ms": round(monitor.max_lag * 1000, 1)},
+            "loop_stalls": monitor.stalls,
+            # commands sent while the same player still had one in flight
+            "same_player_overlaps": load.overlaps,
+        },
+        "anomalies": anomalies,
+        # every round trip by op, seeding and fixtures included
+        "db_ops_total": dict(sorted(mongo_ops.items())),
+        "db_failures": mongo_failures,
+        # event bus handlers (quest progress) and other work outside the commands, during the load
+        "background": {
+            "db_ops": metrics.background.db_ops - background[0],
+            "db_kb": round((metrics.background.db_bytes - background[1]) / 1024, 1),
+        },
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    if not CONFIG_PATH.exists():
+        sys.exit(f"{CONFIG_PATH} is missing: the cogs read settings on import. "
+                 "Any values work, nothing connects to Discord.")
+    # cogs load their data files relative to the repository root
+    os.chdir(ROOT)
+    logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(name)s: %(message)s")
+
+    args = parse_args(argv)
+    report = asyncio.run(run(args))
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
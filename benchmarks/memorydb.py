@@ -0,0 +1,771 @@
+from __future__ import annotations
+import asyncio
+import copy
+import random
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import bson
+
+from server.metrics import Histogram
+
+# In-memory async stand-in for the Motor collections the bot uses.
+#
+# It implements the slice of the MongoDB query/update/aggregation language found in cogs/
+# and server/ (filters with $expr, operator and pipeline updates, inclusion/exclusion/
+# $elemMatch projections, the $match/$project/$unwind/$facet... stages and the expressions
+# they use). Every call awaits a configurable simulated round trip (optionally behind a
+# connection pool), applies atomically per document like Mongo does, and hands back
+# BSON-decoded copies, so callers pay a realistic decode cost and cannot alias stored
+# state. Unsupported operators raise NotImplementedError instead of silently matching.
+
+COLLECTIONS = (
+    "general", "inventory", "skills", "collections", "recipes",
+    "areas", "equipment", "quests", "state", "stash",
+)
+
+# Connection-pool wait buckets (ms). An uncontended checkout takes microseconds, so the
+# buckets start well below LATENCY_BUCKETS_MS's 0-1 ms first bucket, whose interpolation
+# would report made-up waits of up to a millisecond.
+POOL_WAIT_BUCKETS_MS: Tuple[float, ...] = (
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000,
+)
+
+# on_op(op_name, simulated_seconds, reply_bytes)
+OpHook = Callable[[str, float, int], None]
+
+
+class _Missing:
+    def __repr__(self) -> str:
+        return "MISSING"
+
+
+MISSING = _Missing()
+
+
+class Result:
+    """Shape-compatible with pymongo's InsertOneResult/UpdateResult/DeleteResult."""
+
+    def __init__(self, **fields: Any) -> None:
+        self.__dict__.update(fields)
+
+
+def _roundtrip(doc: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
+    raw = bson.encode(doc)
+    return bson.decode(raw), len(raw)
+
+
+# --- value helpers ---
+_TYPE_ORDER = {type(None): 0, int: 1, float: 1, str: 2, dict: 3, list: 4, bool: 5}
+
+
+def _order_key(value: Any) -> Tuple[int, Any]:
+    """BSON-ish total order (null < numbers < strings < objects < arrays < booleans)."""
+    if value is MISSING:
+        return (0, 0)
+    rank = _TYPE_ORDER.get(type(value), 6)
+    if rank in (3, 4, 6):
+        return (rank, repr(value))
+    return (rank, value if value is not None else 0)
+
+
+def _compare(a: Any, b: Any) -> int:
+    ka, kb = _order_key(a), _order_key(b)
+    return (ka > kb) - (ka < kb)
+
+
+def _truthy(value: Any) -> bool:
+    if value is None or value is MISSING or value is False:
+        return False
+    if isinstance(value, (int, float)) and not isinstance(value, bool) and value == 0:
+        return False
+    return True
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _get_path(doc: Any, path: str) -> Any:
+    """Resolve a dotted path; through arrays a field name maps over the elements."""
+    cur = doc
+    for part in path.split("."):
+        if isinstance(cur, dict):
+            cur = cur.get(part, MISSING)
+        elif isinstance(cur, list):
+            if part.isdigit():
+                idx = int(part)
+                cur = cur[idx] if idx < len(cur) else MISSING
+            else:
+                values = [_get_path(el, part) for el in cur if isinstance(el, dict)]
+                cur = [v for v in values if v is not MISSING]
+        else:
+            return MISSING
+        if cur is MISSING:
+            return MISSING
+    return cur
+
+
+def _set_path(doc: Dict[str, Any], path: str, value: Any) -> None:
+    parts = path.split(".")
+    cur: Any = doc
+    for part in parts[:-1]:
+        if isinstance(cur, list) and part.isdigit():
+            cur = cur[int(part)]
+            continue
+        nxt = cur.get(part)
+        if not isinstance(nxt, (dict, list)):
+            nxt = cur[part] = {}
+        cur = nxt
+    last = parts[-1]
+    if isinstance(cur, list) and last.isdigit():
+        idx = int(last)
+        while len(cur) <= idx:
+            cur.append(None)
+        cur[idx] = value
+    else:
+        cur[last] = value
+
+
+def _unset_path(doc: Dict[str, Any], path: str) -> None:
+    parts = path.split(".")
+    cur: Any = doc
+    for part in parts[:-1]:
+        if isinstance(cur, dict):
+            cur = cur.get(part)
+        elif isinstance(cur, list) and part.isdigit() and int(part) < len(cur):
+            cur = cur[int(part)]
+        else:
+            return
+    if isinstance(cur, dict):
+        cur.pop(parts[-1], None)
+
+
+# --- aggregation expressions ---
+def _eval(expr: Any, doc: Any, variables: Dict[str, Any]) -> Any:
+    if isinstance(expr, str):
+        if expr.startswith("$$"):
+            name, _, path = expr[2:].partition(".")
+            value = doc if name in ("ROOT", "CURRENT") else variables.get(name, MISSING)
+            return _get_path(value, path) if path else value
+        if expr.startswith("$"):
+            return _get_path(doc, expr[1:])
+        return expr
+    if isinstance(expr, list):
+        return [_eval(e, doc, variables) for e in expr]
+    if isinstance(expr, dict):
+        if len(expr) == 1:
+            op, arg = next(iter(expr.items()))
+            if op.startswith("$"):
+                handler = _EXPRESSIONS.get(op)
+                if handler is None:
+                    raise NotImplementedError(f"expression operator {op}")
+                return handler(arg, doc, variables)
+        return {k: _eval(v, doc, variables) for k, v in expr.items()}
+    return expr
+
+
+def _args(arg: Any, doc: Any, variables: Dict[str, Any]) -> List[Any]:
+    return [_eval(a, doc, variables) for a in (arg if isinstance(arg, list) else [arg])]
+
+
+def _cmp_expr(test: Callable[[int], bool]):
+    def handler(arg, doc, variables):
+        a, b = _args(arg, doc, variables)
+        return test(_compare(a, b))
+    return handler
+
+
+def _add(arg, doc, variables):
+    values = _args(arg, doc, variables)
+    if any(v is None or v is MISSING for v in values):
+        return None
+    return sum(values)
+
+
+def _cond(arg, doc, variables):
+    if isinstance(arg, dict):
+        test, then, otherwise = arg["if"], arg["then"], arg["else"]
+    else:
+        test, then, otherwise = arg
+    return _eval(then if _truthy(_eval(test, doc, variables)) else otherwise, doc, variables)
+
+
+def _if_null(arg, doc, variables):
+    for a in arg[:-1]:
+        value = _eval(a, doc, variables)
+        if value is not None and value is not MISSING:
+            return value
+    return _eval(arg[-1], doc, variables)
+
+
+def _filter(arg, doc, variables):
+    items = _eval(arg["input"], doc, variables)
+    if not isinstance(items, list):
+        return None
+    name = arg.get("as", "this")
+    return [x for x in items if _truthy(_eval(arg["cond"], doc, {**variables, name: x}))]
+
+
+def _let(arg, doc, variables):
+    bound = {k: _eval(v, doc, variables) for k, v in arg["vars"].items()}
+    return _eval(arg["in"], doc, {**variables, **bound})
+
+
+def _index_of_array(arg, doc, variables):
+    items, value = _args(arg[:2], doc, variables)
+    if not isinstance(items, list):
+        return None
+    for i, item in enumerate(items):
+        if _compare(item, value) == 0:
+            return i
+    return -1
+
+
+def _object_to_array(arg, doc, variables):
+    value = _eval(arg, doc, variables)
+    return [{"k": k, "v": v} for k, v in value.items()] if isinstance(value, dict) else None
+
+
+def _in(arg, doc, variables):
+    value, items = _args(arg, doc, variables)
+    return any(_compare(value, item) == 0 for item in items)
+
+
+_EXPRESSIONS: Dict[str, Callable[[Any, Any, Dict[str, Any]], Any]] = {
+    "$literal": lambda arg, doc, variables: arg,
+    "$ifNull": _if_null,
+    "$cond": _cond,
+    "$and": lambda arg, doc, variables: all(_truthy(v) for v in _args(arg, doc, variables)),
+    "$or": lambda arg, doc, variables: any(_truthy(v) for v in _args(arg, doc, variables)),
+    "$not": lambda arg, doc, variables: not _truthy(_args(arg, doc, variables)[0]),
+    "$eq": _cmp_expr(lambda c: c == 0),
+    "$ne": _cmp_expr(lambda c: c != 0),
+    "$gt": _cmp_expr(lambda c: c > 0),
+    "$gte": _cmp_expr(lambda c: c >= 0),
+    "$lt": _cmp_expr(lambda c: c < 0),
+    "$lte": _cmp_expr(lambda c: c <= 0),
+    "$add": _add,
+    "$max": lambda arg, doc, variables: max(_args(arg, doc, variables), key=_order_key),
+    "$min": lambda arg, doc, variables: min(_args(arg, doc, variables), key=_order_key),
+    "$size": lambda arg, doc, variables: len(_eval(arg, doc, variables)),
+    "$isNumber": lambda arg, doc, variables: _is_number(_args(arg, doc, variables)[0]),
+    "$in": _in,
+    "$filter": _filter,
+    "$let": _let,
+    "$indexOfArray": _index_of_array,
+    "$objectToArray": _object_to_array,
+}
+
+
+# --- query filters ---
+def _match(doc: Dict[str, Any], query: Dict[str, Any]) -> bool:
+    for key, cond in query.items():
+        if key == "$and":
+            if not all(_match(doc, q) for q in cond):
+                return False
+        elif key == "$or":
+            if not any(_match(doc, q) for q in cond):
+                return False
+        elif key == "$nor":
+            if any(_match(doc, q) for q in cond):
+                return False
+        elif key == "$expr":
+            if not _truthy(_eval(cond, doc, {})):
+                return False
+        elif key.startswith("$"):
+            raise NotImplementedError(f"query operator {key}")
+        elif not _match_field(_get_path(doc, key), cond):
+            return False
+    return True
+
+
+def _equals(value: Any, target: Any) -> bool:
+    if value is MISSING:
+        return target is None
+    if _compare(value, target) == 0:
+        return True
+    return isinstance(value, list) and any(_compare(v, target) == 0 for v in value)
+
+
+def _any_value(value: Any, test: Callable[[Any], bool]) -> bool:
+    if isinstance(value, list):
+        return test(value) or any(test(v) for v in value)
+    return test(value)
+
+
+def _match_field(value: Any, cond: Any) -> bool:
+    if not (isinstance(cond, dict) and cond and all(k.startswith("$") for k in cond)):
+        return _equals(value, cond)
+    for op, arg in cond.items():
+        if op == "$eq":
+            ok = _equals(value, arg)
+        elif op == "$ne":
+            ok = not _equals(value, arg)
+        elif op in ("$gt", "$gte", "$lt", "$lte"):
+            test = {
+                "$gt": lambda c: c > 0, "$gte": lambda c: c >= 0,
+                "$lt": lambda c: c < 0, "$lte": lambda c: c <= 0,
+            }[op]
+            ok = value is not MISSING and _any_value(
+                value, lambda v: _order_key(v)[0] == _order_key(arg)[0] and test(_compare(v, arg))
+            )
+        elif op == "$in":
+            ok = any(_equals(value, a) for a in arg)
+        elif op == "$nin":
+            ok = not any(_equals(value, a) for a in arg)
+        elif op == "$exists":
+            ok = (value is not MISSING) == bool(arg)
+        elif op == "$size":
+            ok = isinstance(value, list) and len(value) == arg
+        elif op == "$elemMatch":
+            ok = isinstance(value, list) and any(
+                _match(el, arg) if isinstance(el, dict) else _match_field(el, arg) for el in value
+            )
+        else:
+            raise NotImplementedError(f"query operator {op}")
+        if not ok:
+            return False
+    return True
+
+
+# --- projections ---
+def _project(doc: Dict[str, Any], projection: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    if not projection:
+        return doc
+    include = {k: v for k, v in projection.items() if k != "_id" and (isinstance(v, dict) or v)}
+    if not include:
+        # nested exclusions edit sub-documents, which must not be the stored ones
+        out = copy.deepcopy(doc) if any("." in k for k in projection) else dict(doc)
+        for key, value in projection.items():
+            if not value:
+                _unset_path(out, key)
+        return out
+
+    out: Dict[str, Any] = {}
+    if projection.get("_id", 1) and "_id" in doc:
+        out["_id"] = doc["_id"]
+    for key, spec in include.items():
+        if isinstance(spec, dict) and "$elemMatch" in spec:
+            items = doc.get(key)
+            if isinstance(items, list):
+                hit = next((el for el in items if isinstance(el, dict) and _match(el, spec["$elemMatch"])), None)
+                if hit is not None:
+                    out[key] = [hit]
+            continue
+        if isinstance(spec, dict) and "$slice" in spec:
+            items = doc.get(key)
+            if isinstance(items, list):
+                s = spec["$slice"]
+                out[key] = items[s[0]:s[0] + s[1]] if isinstance(s, list) else (items[:s] if s >= 0 else items[s:])
+            continue
+        _copy_path(doc, out, key.split("."))
+    return out
+
+
+def _copy_path(src: Any, dst: Dict[str, Any], parts: List[str]) -> None:
+    head, rest = parts[0], parts[1:]
+    if not isinstance(src, dict) or head not in src:
+        return
+    value = src[head]
+    if not rest:
+        dst[head] = value
+    elif isinstance(value, dict):
+        _copy_path(value, dst.setdefault(head, {}), rest)
+    elif isinstance(value, list):
+        items = dst.setdefault(head, [{} for _ in value])
+        for el, out_el in zip(value, items):
+            _copy_path(el, out_el, rest)
+
+
+# --- updates ---
+def _apply_update(doc: Dict[str, Any], update: Any, inserting: bool = False) -> None:
+    if isinstance(update, list):
+        for stage in update:
+            (op, arg), = stage.items()
+            if op in ("$set", "$addFields"):
+                # every expression in a stage sees the doc as it was before the stage
+                values = {k: _eval(v, doc, {}) for k, v in arg.items()}
+                for key, value in values.items():
+                    _set_path(doc, key, copy.deepcopy(value))
+            elif op == "$unset":
+                for key in ([arg] if isinstance(arg, str) else arg):
+                    _unset_path(doc, key)
+            else:
+                raise NotImplementedError(f"pipeline update stage {op}")
+        return
+
+    for op, fields in update.items():
+        for key, arg in fields.items():
+            cur = _get_path(doc, key)
+            if op == "$set":
+                _set_path(doc, key, copy.deepcopy(arg))
+            elif op == "$setOnInsert":
+                if inserting:
+                    _set_path(doc, key, copy.deepcopy(arg))
+            elif op == "$unset":
+                _unset_path(doc, key)
+            elif op == "$inc":
+                _set_path(doc, key, (0 if cur is MISSING or cur is None else cur) + arg)
+            elif op == "$mul":
+                _set_path(doc, key, (0 if cur is MISSING or cur is None else cur) * arg)
+            elif op == "$max":
+                _set_path(doc, key, arg if cur is MISSING or _compare(arg, cur) > 0 else cur)
+            elif op == "$min":
+                _set_path(doc, key, arg if cur is MISSING or _compare(arg, cur) < 0 else cur)
+            elif op in ("$push", "$addToSet"):
+                items = cur if isinstance(cur, list) else []
+                if cur is MISSING or cur is None:
+                    _set_path(doc, key, items)
+                new = arg["$each"] if isinstance(arg, dict) and "$each" in arg else [arg]
+                for item in new:
+                    if op == "$push" or not any(_compare(item, x) == 0 for x in items):
+                        items.append(copy.deepcopy(item))
+            elif op == "$pull":
+                if isinstance(cur, list):
+                    _set_path(doc, key, [x for x in cur if not _pull_matches(x, arg)])
+            else:
+                raise NotImplementedError(f"update operator {op}")
+
+
+def _pull_matches(item: Any, cond: Any) -> bool:
+    if isinstance(cond, dict) and isinstance(item, dict) and not any(k.startswith("$") for k in cond):
+        return _match(item, cond)
+    return _match_field(item, cond)
+
+
+def _upsert_seed(query: Dict[str, Any]) -> Dict[str, Any]:
+    doc: Dict[str, Any] = {}
+    for key, value in query.items():
+        if key.startswith("$") or (isinstance(value, dict) and any(k.startswith("$") for k in value)):
+            continue
+        _set_path(doc, key, copy.deepcopy(value))
+    return doc
+
+
+# --- aggregation ---
+def _run_pipeline(docs: List[Dict[str, Any]], pipeline: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    for stage in pipeline:
+        (op, arg), = stage.items()
+        if op == "$match":
+            docs = [d for d in docs if _match(d, arg)]
+        elif op == "$limit":
+            docs = docs[:arg]
+        elif op == "$skip":
+            docs = docs[arg:]
+        elif op == "$project":
+            docs = [_project_stage(d, arg) for d in docs]
+        elif op in ("$addFields", "$set"):
+            out = []
+            for d in docs:
+                d = dict(d)
+                for key, value in {k: _eval(v, d, {}) for k, v in arg.items()}.items():
+                    _set_path(d, key, value)
+                out.append(d)
+            docs = out
+        elif op == "$unwind":
+            spec = {"path": arg} if isinstance(arg, str) else arg
+            field = spec["path"][1:]
+            out = []
+            for d in docs:
+                items = _get_path(d, field)
+                if isinstance(items, list) and items:
+                    for item in items:
+                        nd = dict(d)
+                        _set_path(nd, field, item)
+                        out.append(nd)
+                elif spec.get("preserveNullAndEmptyArrays"):
+                    out.append(d)
+            docs = out
+        elif op in ("$replaceRoot", "$replaceWith"):
+            root = arg["newRoot"] if op == "$replaceRoot" else arg
+            docs = [_eval(root, d, {}) for d in docs]
+        elif op == "$sort":
+            for key, direction in reversed(list(arg.items())):
+                docs = sorted(docs, key=lambda d: _order_key(_get_path(d, key)), reverse=direction < 0)
+        elif op == "$count":
+            docs = [{arg: len(docs)}] if docs else []
+        elif op == "$facet":
+            docs = [{name: _run_pipeline(list(docs), sub) for name, sub in arg.items()}]
+        else:
+            raise NotImplementedError(f"aggregation stage {op}")
+    return docs
+
+
+def _project_stage(doc: Dict[str, Any], spec: Dict[str, Any]) -> Dict[str, Any]:
+    if all(v in (0, False) for v in spec.values()):
+        return _project(doc, spec)
+    out: Dict[str, Any] = {}
+    if spec.get("_id", 1) not in (0, False) and "_id" in doc:
+        out["_id"] = doc["_id"] if spec.get("_id", 1) in (1, True) else _eval(spec["_id"], doc, {})
+    for key, value in spec.items():
+        if key == "_id":
+            continue
+        if value is True or value == 1:
+            _copy_path(doc, out, key.split("."))
+        else:
+            result = _eval(value, doc, {})
+            if result is not MISSING:
+                _set_path(out, key, result)
+    return out
+
+
+# --- cursor / collection / database ---
+class MemoryCursor:
+    def __init__(self, docs: List[Dict[str, Any]]) -> None:
+        self._docs = docs
+
+    async def to_list(self, length: Optional[int] = None) -> List[Dict[str, Any]]:
+        return self._docs[:length] if length else list(self._docs)
+
+    def __aiter__(self):
+        self._iter = iter(self._docs)
+        return self
+
+    async def __anext__(self) -> Dict[str, Any]:
+        try:
+            return next(self._iter)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+class MemoryCollection:
+    """One collection; docs are kept BSON-normalised and indexed by their "id" field."""
+
+    def __init__(self, name: str, database: "MemoryDatabase") -> None:
+        self.name = name
+        self._database = database
+        self._docs: List[Dict[str, Any]] = []
+        self._by_id: Dict[Any, List[Dict[str, Any]]] = {}
+
+    # bookkeeping
+    def _candidates(self, query: Dict[str, Any]) -> List[Dict[str, Any]]:
+        key = query.get("id", MISSING)
+        if key is not MISSING and not isinstance(key, dict):
+            return list(self._by_id.get(key, ()))
+        return list(self._docs)
+
+    def _find(self, query: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return [d for d in self._candidates(query) if _match(d, query)]
+
+    def _store(self, doc: Dict[str, Any]) -> Dict[str, Any]:
+        doc, _ = _roundtrip(doc)
+        doc.setdefault("_id", bson.ObjectId())
+        self._docs.append(doc)
+        self._by_id.setdefault(doc.get("id"), []).append(doc)
+        return doc
+
+    def _remove(self, doc: Dict[str, Any]) -> None:
+        self._docs.remove(doc)
+        self._by_id[doc.get("id")].remove(doc)
+
+    def _reindex(self, doc: Dict[str, Any], old_id: Any) -> None:
+        if doc.get("id") != old_id:
+            self._by_id[old_id].remove(doc)
+            self._by_id.setdefault(doc.get("id"), []).append(doc)
+
+    def _update(self, doc: Dict[str, Any], update: Any) -> bool:
+        before = bson.encode(doc)
+        old_id = doc.get("id")
+        _apply_update(doc, update)
+        self._reindex(doc, old_id)
+        return bson.encode(doc) != before
+
+    def _reply(self, doc: Optional[Dict[str, Any]], projection=None) -> Tuple[Optional[Dict[str, Any]], int]:
+        if doc is None:
+            return None, 0
+        return _roundtrip(_project(doc, projection))
+
+    async def _op(self, op: str, execute: Callable[[], Tuple[Any, int]]) -> Any:
+        return await self._database._round_trip(op, execute)
+
+    # fixtures
+    def live_doc(self, query: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """The stored doc itself, for seeding between measurements (no round trip, not counted)."""
+        hits = self._find(query)
+        return hits[0] if hits else None
+
+    # reads
+    async def find_one(self, filter: Optional[Dict[str, Any]] = None, projection=None, **kwargs) -> Optional[Dict[str, Any]]:
+        def execute():
+            hits = self._find(filter or {})
+            return self._reply(hits[0] if hits else None, projection)
+        return await self._op("find", execute)
+
+    def find(self, filter: Optional[Dict[str, Any]] = None, projection=None, **kwargs) -> "_PendingCursor":
+        return _PendingCursor(self, "find", lambda: [_project(d, projection) for d in self._find(filter or {})])
+
+    def aggregate(self, pipeline: List[Dict[str, Any]], **kwargs) -> "_PendingCursor":
+        def run():
+            stages = list(pipeline)
+            # a leading $match uses the "id" index, like it would on the server
+            if stages and "$match" in stages[0]:
+                return _run_pipeline(self._find(stages[0]["$match"]), stages[1:])
+            return _run_pipeline(list(self._docs), stages)
+        return _PendingCursor(self, "aggregate", run)
+
+    async def count_documents(self, filter: Dict[str, Any], **kwargs) -> int:
+        return await self._op("count", lambda: (len(self._find(filter)), 16))
+
+    # writes
+    async def insert_one(self, document: Dict[str, Any], **kwargs) -> Result:
+        def execute():
+            doc = self._store(document)
+            document.setdefault("_id", doc["_id"])
+            return Result(inserted_id=doc["_id"], acknowledged=True), 0
+        return await self._op("insert", execute)
+
+    async def insert_many(self, documents: Iterable[Dict[str, Any]], **kwargs) -> Result:
+        def execute():
+            ids = []
+            for document in documents:
+                doc = self._store(document)
+                document.setdefault("_id", doc["_id"])
+                ids.append(doc["_id"])
+            return Result(inserted_ids=ids, acknowledged=True), 0
+        return await self._op("insert", execute)
+
+    async def update_one(self, filter: Dict[str, Any], update: Any, upsert: bool = False, **kwargs) -> Result:
+        return await self._op("update", lambda: (self._update_docs(filter, update, upsert, many=False), 0))
+
+    async def update_many(self, filter: Dict[str, Any], update: Any, upsert: bool = False, **kwargs) -> Result:
+        return await self._op("update", lambda: (self._update_docs(filter, update, upsert, many=True), 0))
+
+    def _update_docs(self, filter, update, upsert: bool, many: bool) -> Result:
+        hits = self._find(filter)
+        if not many:
+            hits = hits[:1]
+        modified = sum(self._update(doc, update) for doc in hits)
+        upserted_id = None
+        if not hits and upsert:
+            seed = _upsert_seed(filter)
+            _apply_update(seed, update, inserting=True)
+            upserted_id = self._store(seed)["_id"]
+        return Result(matched_count=len(hits), modified_count=modified, upserted_id=upserted_id, acknowledged=True)
+
+    async def find_one_and_update(self, filter: Dict[str, Any], update: Any, projection=None,
+                                  return_document: bool = False, upsert: bool = False, **kwargs):
+        def execute():
+            hits = self._find(filter)
+            if hits:
+                doc = hits[0]
+                before = self._reply(doc, projection)
+                self._update(doc, update)
+                return self._reply(doc, projection) if return_document else before
+            if upsert:
+                seed = _upsert_seed(filter)
+                _apply_update(seed, update, inserting=True)
+                doc = self._store(seed)
+                return self._reply(doc, projection) if return_document else (None, 0)
+            return None, 0
+        return await self._op("findAndModify", execute)
+
+    async def find_one_and_delete(self, filter: Dict[str, Any], projection=None, **kwargs):
+        def execute():
+            hits = self._find(filter)
+            reply = self._reply(hits[0] if hits else None, projection)
+            if hits:
+                self._remove(hits[0])
+            return reply
+        return await self._op("findAndModify", execute)
+
+    async def delete_one(self, filter: Dict[str, Any], **kwargs) -> Result:
+        return await self._op("delete", lambda: (self._delete(self._find(filter)[:1]), 0))
+
+    async def delete_many(self, filter: Dict[str, Any], **kwargs) -> Result:
+        return await self._op("delete", lambda: (self._delete(self._find(filter)), 0))
+
+    def _delete(self, hits: List[Dict[str, Any]]) -> Result:
+        for doc in hits:
+            self._remove(doc)
+        return Result(deleted_count=len(hits), acknowledged=True)
+
+    async def create_index(self, keys, **kwargs) -> str:
+        name = "_".join(f"{k}_{d}" for k, d in keys) if isinstance(keys, list) else f"{keys}_1"
+        return await self._op("createIndexes", lambda: (name, 0))
+
+
+class _PendingCursor:
+    """Cursor whose query runs (and pays its round trip) on first use, like Motor's."""
+
+    def __init__(self, collection: MemoryCollection, op: str, run: Callable[[], List[Dict[str, Any]]]) -> None:
+        self._collection = collection
+        self._op = op
+        self._run = run
+        self._cursor: Optional[MemoryCursor] = None
+
+    def _execute(self) -> Tuple[MemoryCursor, int]:
+        docs, nbytes = [], 0
+        for doc in self._run():
+            doc, size = _roundtrip(doc)
+            docs.append(doc)
+            nbytes += size
+        return MemoryCursor(docs), nbytes
+
+    async def _load(self) -> MemoryCursor:
+        if self._cursor is None:
+            self._cursor = await self._collection._op(self._op, self._execute)
+        return self._cursor
+
+    async def to_list(self, length: Optional[int] = None) -> List[Dict[str, Any]]:
+        return await (await self._load()).to_list(length)
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for doc in await (await self._load()).to_list():
+            yield doc
+
+
+class MemoryDatabase:
+    """
+    Drop-in for the bot's Database wrapper (same collection attributes).
+    latency/jitter: simulated round trip per operation, in seconds; the operation runs
+        halfway through it, so concurrent read-modify-write code interleaves like it would
+        against a server
+    pool_size: connections, like Motor's maxPoolSize; operations beyond it wait for one
+        (the wait is recorded in `pool_wait`, in ms). None for no limit.
+    on_op: called after every operation with (op name, simulated seconds, reply bytes)
+    """
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, on_op: Optional[OpHook] = None,
+                 seed: Optional[int] = None, pool_size: Optional[int] = None) -> None:
+        self.latency = latency
+        self.jitter = jitter
+        self.on_op = on_op
+        self.ops: Counter = Counter()
+        self.pool_wait = Histogram(POOL_WAIT_BUCKETS_MS)
+        self._pool = asyncio.Semaphore(pool_size) if pool_size else None
+        self._rng = random.Random(seed)
+        for name in COLLECTIONS:
+            setattr(self, name, MemoryCollection(name, self))
+
+    async def _round_trip(self, op: str, execute: Callable[[], Tuple[Any, int]]) -> Any:
+        if self._pool is None:
+            return await self._exchange(op, execute)
+        asked = time.perf_counter()
+        async with self._pool:
+            self.pool_wait.observe((time.perf_counter() - asked) * 1000)
+            return await self._exchange(op, execute)
+
+    async def _exchange(self, op: str, execute: Callable[[], Tuple[Any, int]]) -> Any:
+        delay = self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0.0)
+        # always yield, like a real driver call would
+        await asyncio.sleep(delay / 2)
+        result, nbytes = execute()
+        await asyncio.sleep(delay / 2)
+        self.ops[op] += 1
+        if self.on_op is not None:
+            self.on_op(op, delay, nbytes)
+        return result
+
+    async def connect(self, *args, **kwargs) -> bool:
+        return True
+
+    async def ping(self) -> bool:
+        return True
+
+    def close(self) -> None:
+        pass
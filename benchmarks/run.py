@@ -0,0 +1,122 @@
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from benchmarks.memorydb import MemoryDatabase
+
+ROOT = Path(__file__).resolve().parent.parent
+CONFIG_PATH = ROOT / "data" / "config.json"
+
+logger = logging.getLogger("bench")
+
+# Offline end-to-end benchmark: registers --players players through /register, then runs
+# each scenario (see benchmarks/scenarios.py) for --rounds rounds and prints a JSON report
+# with throughput, per-call latency percentiles and DB round trips per call. Run it from a
+# checkout with `python -m benchmarks.run --output bench.json` and diff the reports of two
+# commits; keep the settings identical, since latency is simulated per round trip.
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT,
+                               capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return f"{commit}-dirty" if dirty else commit
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    from benchmarks.scenarios import SCENARIOS
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run",
+                                     description="Offline benchmark of the cogs against an in-memory Mongo.")
+    parser.add_argument("--players", type=int, default=200, help="concurrent players (default 200)")
+    parser.add_argument("--rounds", type=int, default=5, help="measured calls per player per scenario (default 5)")
+    parser.add_argument("--latency-ms", type=float, default=1.0, help="simulated Mongo round trip (default 1)")
+    parser.add_argument("--jitter-ms", type=float, default=0.5, help="random extra round-trip time, 0..N (default 0.5)")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS),
+                        help=f"comma-separated subset of: {', '.join(SCENARIOS)}")
+    parser.add_argument("--seed", type=int, default=1, help="seed for game RNG and simulated latency")
+    parser.add_argument("--output", type=Path, help="also write the JSON report to this file")
+    args = parser.parse_args(argv)
+    unknown = [s for s in args.scenarios.split(",") if s not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(unknown)}")
+    return args
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    from benchmarks.scenarios import SCENARIOS, Bench, seed_players
+    from benchmarks.stubs import build_bot, close_bot
+
+    random.seed(args.seed)
+    db = MemoryDatabase(latency=args.latency_ms / 1000, jitter=args.jitter_ms / 1000, seed=args.seed)
+    bot = await build_bot(db)
+    try:
+        started = time.perf_counter()
+        players = await seed_players(bot, db, args.players)
+        logger.info("Registered %d players in %.2fs", len(players), time.perf_counter() - started)
+
+        bench = Bench(bot, db, players)
+        bench.reset_counters()
+        results: Dict[str, Any] = {}
+        for name in args.scenarios.split(","):
+            results[name] = await bench.run(SCENARIOS[name], args.rounds)
+            logger.info("%-14s %8s calls/s", name, results[name]["per_second"])
+    finally:
+        await close_bot(bot)
+
+    snapshot = bench.metrics.snapshot()
+    for name, result in results.items():
+        result["latency"] = snapshot.get(name, {})
+        if name in bench.errors:
+            result["errors"] = bench.errors[name]
+    background = bench.metrics.background
+    return {
+        "commit": _git_commit(),
+        "timestamp": int(time.time()),
+        "python": platform.python_version(),
+        "settings": {
+            "players": args.players,
+            "rounds": args.rounds,
+            "latency_ms": args.latency_ms,
+            "jitter_ms": args.jitter_ms,
+            "seed": args.seed,
+        },
+        "scenarios": results,
+        # every simulated round trip by op, fixture work included
+        "db_ops_total": dict(sorted(db.ops.items())),
+        # event bus handlers and other work outside the measured calls
+        "background": {"db_ops": background.db_ops, "db_kb": round(background.db_bytes / 1024, 1)},
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    if not CONFIG_PATH.exists():
+        sys.exit(f"{CONFIG_PATH} is missing: the cogs read settings on import. "
+                 "Any values work, nothing connects to Discord or Mongo.")
+    # cogs load their data files relative to the repository root
+    os.chdir(ROOT)
+    logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(name)s: %(message)s")
+
+    args = parse_args(argv)
+    report = asyncio.run(run(args))
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,324 @@
+from __future__ import annotations
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import discord
+from discord.ext import commands
+
+from benchmarks.stubs import StubInteraction, StubUser
+from cogs.skills.crafting import all_recipes_data
+from server.inventoryData import INVENTORY_META_FIELDS, USED_SLOTS_FIELD
+from server.metrics import CommandMetrics
+
+logger = logging.getLogger("bench")
+
+# Benchmark scenarios: each drives one cog entry point through stub interactions.
+#
+# A round prepares every player (refill stamina/HP, hand out ingredients, reset quest
+# progress...) and then runs the measured call for all of them concurrently, one task per
+# player like real gateway traffic. Fixture work edits the stored docs directly or is
+# charged to a throwaway metrics sample, so per-command DB counts only show what the
+# command itself did.
+
+FIRST_USER_ID = 10_000_000
+# Has ore and huntable mobs, and a quest with "collect" objectives is given here
+BENCH_AREA, BENCH_SUBAREA, BENCH_SUBAREA_TYPE = "plains", "meadow", "medium"
+QUEST_ID, QUEST_OBJECTIVE = "crafting_basics_intro", ("collect", "ore")
+SETUP = "(setup)"
+# /dungeon may open on a puzzle or trap room; give up on a player after this many rerolls
+DUNGEON_START_ATTEMPTS = 5
+# A new character hits for 1, so a fight would be all refresh turns; this clears a mob in
+# a few turns and mixes in room changes
+DUNGEON_STRENGTH = 10
+
+
+@dataclass
+class Player:
+    user: StubUser
+    # dungeon_turn: the DungeonCombatView the player is fighting in
+    combat: Optional[discord.ui.View] = None
+    # instances owned right after registration (crafted/rewarded ones are trimmed back)
+    starter_instances: int = 0
+
+    @property
+    def id(self) -> int:
+        return self.user.id
+
+
+class Bench:
+    """Players plus the bot/db they play against; runs scenarios and keeps the errors."""
+
+    def __init__(self, bot: commands.Bot, db, players: List[Player]) -> None:
+        self.bot = bot
+        self.db = db
+        self.players = players
+        self.errors: Dict[str, Dict[str, Any]] = {}
+
+    @property
+    def metrics(self) -> CommandMetrics:
+        return self.bot.metrics  # type: ignore[attr-defined]
+
+    def reset_counters(self) -> None:
+        """Start measuring from zero (drops what seeding the players recorded)."""
+        self.bot.metrics = CommandMetrics(log_interval=0)  # type: ignore[attr-defined]
+        if hasattr(self.db, "on_op"):
+            self.db.on_op = self.bot.metrics.record_db  # type: ignore[attr-defined]
+            self.db.ops.clear()
+
+    async def unmeasured(self, player: Player, coro) -> None:
+        # DB ops go to a sample that is never finished, so they are neither a command's
+        # nor "background" traffic
+        self.metrics.begin(StubInteraction(self.bot, player.user, data={"name": SETUP}))
+        await coro
+
+    async def measure(self, scenario: "Scenario", player: Player) -> None:
+        interaction = scenario.interaction(self, player)
+        self.metrics.begin(interaction)
+        failed = False
+        try:
+            await scenario.run(self, player, interaction)
+        except Exception as exc:
+            failed = True
+            errors = self.errors.setdefault(scenario.name, {"count": 0, "first": None})
+            errors["count"] += 1
+            if errors["first"] is None:
+                errors["first"] = repr(exc)
+                logger.exception("%s failed for player %s", scenario.name, player.id)
+        finally:
+            self.metrics.finish(interaction, failed=failed)
+
+    async def run(self, scenario: "Scenario", rounds: int) -> Dict[str, Any]:
+        """`rounds` measured calls per player; returns throughput over the measured time."""
+        measured = 0.0
+        await scenario.setup(self)
+        try:
+            for _ in range(rounds):
+                await asyncio.gather(*(self.unmeasured(p, scenario.prepare(self, p)) for p in self.players))
+                started = time.perf_counter()
+                await asyncio.gather(*(self.measure(scenario, p) for p in self.players))
+                measured += time.perf_counter() - started
+        finally:
+            await scenario.teardown(self)
+        calls = rounds * len(self.players)
+        return {
+            "calls": calls,
+            "seconds": round(measured, 4),
+            "per_second": round(calls / measured, 1) if measured else None,
+        }
+
+
+# --- fixtures (direct edits of stored docs; MemoryDatabase only) ---
+def refresh_player(bench: Bench, player: Player) -> None:
+    """Full stamina and HP, out of any dungeon, instance list back to the starter tools."""
+    general = bench.db.general.live_doc({"id": player.id})
+    general.update({
+        "stamina": general.get("maxStamina", 200),
+        "lastStaminaUpdate": time.time(),
+        "hp": general.get("maxHP", 100),
+        "inDungeon": False,
+    })
+    equipment = bench.db.equipment.live_doc({"id": player.id})
+    del equipment["instances"][player.starter_instances:]
+
+
+def grant_items(bench: Bench, player: Player, items: Dict[str, int]) -> None:
+    """Make sure the player holds at least these counts, keeping usedSlots right."""
+    inventory = bench.db.inventory.live_doc({"id": player.id})
+    for key, count in items.items():
+        inventory[key] = max(int(inventory.get(key, 0)), count)
+    inventory[USED_SLOTS_FIELD] = sum(
+        1 for k, v in inventory.items()
+        if k not in INVENTORY_META_FIELDS and isinstance(v, (int, float)) and v > 0
+    )
+
+
+def recipe_ingredients(recipe_key: str, amount: int = 1) -> Dict[str, int]:
+    recipe = all_recipes_data[recipe_key][0]
+    return {item: int(recipe[f"r{idx}"]) * amount for idx, item in recipe.items() if not idx.startswith("r")}
+
+
+async def seed_players(bot: commands.Bot, db, count: int) -> List[Player]:
+    """Register `count` players through /register (command + "I understand" click)."""
+    register_cog = bot.get_cog("RegisterCog")
+
+    async def register(user_id: int) -> Player:
+        user = StubUser(user_id)
+        interaction = StubInteraction(bot, user, command="register")
+        await register_cog.register.callback(register_cog, interaction)
+        accept = interaction.last_view().children[0]
+        await accept.callback(StubInteraction(bot, user))
+
+        # through the DB API, so the load generator can seed a real Mongo with this too
+        await db.areas.update_one({"id": user_id}, {"$set": {
+            "currentArea": BENCH_AREA, "currentSubarea": BENCH_SUBAREA, "subareaType": BENCH_SUBAREA_TYPE,
+        }})
+        equipment = await db.equipment.find_one({"id": user_id}, {"instances": 1})
+        return Player(user, starter_instances=len(equipment["instances"]))
+
+    return list(await asyncio.gather(*(register(FIRST_USER_ID + i) for i in range(count))))
+
+
+def expect_public_reply(interaction: StubInteraction) -> None:
+    """A refused command (no stamina, wrong area...) did none of the work; count it as failed."""
+    refusal = interaction.refusal()
+    if refusal is not None:
+        raise RuntimeError(refusal)
+
+
+# --- scenarios ---
+class Scenario:
+    name = ""
+
+    def interaction(self, bench: Bench, player: Player) -> StubInteraction:
+        return StubInteraction(bench.bot, player.user, command=self.name)
+
+    async def setup(self, bench: Bench) -> None:
+        pass
+
+    async def prepare(self, bench: Bench, player: Player) -> None:
+        refresh_player(bench, player)
+
+    async def run(self, bench: Bench, player: Player, interaction: StubInteraction) -> None:
+        raise NotImplementedError
+
+    async def teardown(self, bench: Bench) -> None:
+        pass
+
+
+class MineScenario(Scenario):
+    """/mine in a subarea with ore."""
+    name = "mine"
+
+    async def run(self, bench, player, interaction):
+        cog = bench.bot.get_cog("MiningCog")
+        await cog.mine.callback(cog, interaction)
+        expect_public_reply(interaction)
+
+
+class HuntScenario(Scenario):
+    """/hunt against the subarea's mobs."""
+    name = "hunt"
+
+    async def run(self, bench, player, interaction):
+        cog = bench.bot.get_cog("CombatCog")
+        await cog.hunt.callback(cog, interaction)
+        expect_public_reply(interaction)
+
+
+class CraftScenario(Scenario):
+    """One craft with the ingredients on hand; `recipe` picks plain or instanced output."""
+
+    def __init__(self, name: str, recipe: str) -> None:
+        self.name = name
+        self.recipe = recipe
+        self.ingredients = recipe_ingredients(recipe)
+
+    async def prepare(self, bench, player):
+        refresh_player(bench, player)
+        grant_items(bench, player, self.ingredients)
+
+    async def run(self, bench, player, interaction):
+        cog = bench.bot.get_cog("CraftingCog")
+        success, message, _ = await cog._perform_craft(interaction, self.recipe, 1)
+        if not success:
+            raise RuntimeError(message)
+
+
+class QuestProgressScenario(Scenario):
+    """One objective increment; every 10th call completes the quest and grants rewards."""
+    name = "quest_progress"
+
+    async def prepare(self, bench, player):
+        refresh_player(bench, player)
+        quests = bench.db.quests.live_doc({"id": player.id})
+        active = quests.setdefault("active_quests", {})
+        if QUEST_ID not in active:
+            # the other objectives start done, so the measured one decides completion
+            template = bench.bot.get_cog("QuestCog")._file_cache[QUEST_ID]
+            active[QUEST_ID] = {
+                "objectives": {
+                    f"{o['type']}:{o['target']}": 0 if (o["type"], o["target"]) == QUEST_OBJECTIVE else o["amount"]
+                    for o in template["objectives"]
+                },
+                "status": "active",
+            }
+            quests["completed_quests"] = [q for q in quests.get("completed_quests", []) if q != QUEST_ID]
+
+    async def run(self, bench, player, interaction):
+        cog = bench.bot.get_cog("QuestCog")
+        await cog.update_progress(player.id, *QUEST_OBJECTIVE)
+
+
+class DungeonTurnScenario(Scenario):
+    """
+    One Attack click in a dungeon combat room. Runs are started (unmeasured) with
+    /dungeon and restarted when the fight ends or the next room isn't a fight.
+    """
+    name = "dungeon_turn"
+
+    @staticmethod
+    def _combat_view(bench: Bench) -> type:
+        # load_extension re-imports the module, so take the class from the loaded copy
+        return bench.bot.extensions["cogs.features.dungeons"].DungeonCombatView
+
+    def interaction(self, bench, player):
+        return StubInteraction(bench.bot, player.user, data={"name": self.name, "custom_id": "attack"})
+
+    async def setup(self, bench):
+        for player in bench.players:
+            bench.db.general.live_doc({"id": player.id})["strength"] = DUNGEON_STRENGTH
+
+    async def _abandon(self, bench: Bench, player: Player) -> None:
+        player.combat = None
+        await bench.bot.get_cog("DungeonCog").drop_run(player.id)
+        refresh_player(bench, player)
+
+    async def prepare(self, bench, player):
+        if player.combat is not None:
+            return
+        cog = bench.bot.get_cog("DungeonCog")
+        for _ in range(DUNGEON_START_ATTEMPTS):
+            await self._abandon(bench, player)
+            interaction = StubInteraction(bench.bot, player.user, command="dungeon")
+            await cog.dungeon.callback(cog, interaction)
+            view = interaction.last_view()
+            if isinstance(view, self._combat_view(bench)):
+                player.combat = view
+                return
+        raise RuntimeError(f"no combat room in {DUNGEON_START_ATTEMPTS} dungeon runs")
+
+    async def run(self, bench, player, interaction):
+        view = player.combat
+        if view is None:
+            raise RuntimeError("player has no combat room")
+        await view.attack_button.callback(interaction)
+
+        following = interaction.last_view()
+        if following is not None and following is not view:
+            # cleared the room: fight on in the next one, or start over at a puzzle/trap
+            player.combat = following if isinstance(following, self._combat_view(bench)) else None
+        elif player.id not in bench.bot.get_cog("DungeonCog").active_dungeons:
+            # defeated, or the floor is complete
+            player.combat = None
+        elif view.current_mob_index >= len(view.mobs):
+            player.combat = None
+
+    async def teardown(self, bench):
+        await asyncio.gather(*(self._abandon(bench, p) for p in bench.players))
+        for player in bench.players:
+            bench.db.general.live_doc({"id": player.id})["strength"] = 1
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    s.name: s for s in (
+        MineScenario(),
+        HuntScenario(),
+        CraftScenario("craft", "toolrod"),
+        CraftScenario("craft_armor", "wooden helmet"),
+        QuestProgressScenario(),
+        DungeonTurnScenario(),
+    )
+}
@@ -0,0 +1,176 @@
+from __future__ import annotations
+import itertools
+from types import SimpleNamespace
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Type
+
+import discord
+from discord.ext import commands
+
+from server.events import EventBus
+from server.metrics import CommandMetrics, InstrumentedTree
+from server.state import MemoryStateBackend
+
+# Just enough of discord.Interaction for the cogs' command callbacks and view handlers.
+#
+# Responses are recorded instead of sent, in `interaction.sent` as (kind, kwargs) pairs,
+# so a scenario can pick up the view a command replied with. Responding twice raises
+# InteractionResponded like the real thing, which surfaces as a failed command.
+
+# Extensions the scenarios exercise; loading all of cogs/ would work too but costs startup
+EXTENSIONS: Tuple[str, ...] = (
+    "cogs.register",
+    "cogs.skills.mining",
+    "cogs.skills.foraging",
+    "cogs.skills.scavenging",
+    "cogs.skills.hunt",
+    "cogs.skills.crafting",
+    "cogs.features.quests",
+    "cogs.features.dungeons",
+    "cogs.features.inventory",
+)
+
+_message_ids = itertools.count(1)
+
+
+class StubUser:
+    def __init__(self, user_id: int, name: Optional[str] = None) -> None:
+        self.id = user_id
+        self.name = name or f"player{user_id}"
+        self.display_name = self.name
+        self.global_name = self.name
+        self.mention = f"<@{user_id}>"
+        self.bot = False
+        self.display_avatar = SimpleNamespace(url=f"https://cdn.discordapp.com/embed/avatars/{user_id % 6}.png")
+        self.guild_permissions = discord.Permissions.all()
+
+    def __repr__(self) -> str:
+        return f"<StubUser id={self.id}>"
+
+
+class StubMessage:
+    def __init__(self, interaction: "StubInteraction", **fields: Any) -> None:
+        self.id = next(_message_ids)
+        self.interaction = interaction
+        self.content = fields.get("content")
+        self.embed = fields.get("embed")
+        self.view = fields.get("view")
+
+    async def edit(self, **fields: Any) -> "StubMessage":
+        self.interaction.sent.append(("message.edit", fields))
+        self.__dict__.update({k: v for k, v in fields.items() if k in ("content", "embed", "view")})
+        return self
+
+    async def delete(self, **kwargs: Any) -> None:
+        self.interaction.sent.append(("message.delete", kwargs))
+
+
+class StubResponse:
+    def __init__(self, interaction: "StubInteraction") -> None:
+        self._interaction = interaction
+        self._done = False
+
+    def is_done(self) -> bool:
+        return self._done
+
+    def _respond(self, kind: str, fields: Dict[str, Any]) -> StubMessage:
+        if self._done:
+            raise discord.InteractionResponded(self._interaction)  # type: ignore[arg-type]
+        self._done = True
+        self._interaction.sent.append((kind, fields))
+        message = StubMessage(self._interaction, **fields)
+        self._interaction._original = message
+        return message
+
+    async def send_message(self, content: Optional[str] = None, **fields: Any) -> StubMessage:
+        return self._respond("send_message", {"content": content, **fields})
+
+    async def edit_message(self, **fields: Any) -> StubMessage:
+        return self._respond("edit_message", fields)
+
+    async def defer(self, **fields: Any) -> None:
+        self._respond("defer", fields)
+
+    async def send_modal(self, modal: discord.ui.Modal) -> None:
+        self._respond("send_modal", {"modal": modal})
+
+
+class StubFollowup:
+    def __init__(self, interaction: "StubInteraction") -> None:
+        self._interaction = interaction
+
+    async def send(self, content: Optional[str] = None, **fields: Any) -> StubMessage:
+        fields = {"content": content, **fields}
+        self._interaction.sent.append(("followup", fields))
+        return StubMessage(self._interaction, **fields)
+
+
+class StubInteraction:
+    """
+    A slash command invocation (`command` given) or a component click on a view.
+    """
+
+    def __init__(self, client: commands.Bot, user: StubUser, command: Optional[str] = None,
+                 data: Optional[Dict[str, Any]] = None) -> None:
+        self.client = client
+        self.user = user
+        self.type = (discord.InteractionType.application_command if command
+                     else discord.InteractionType.component)
+        self.command = SimpleNamespace(qualified_name=command) if command else None
+        self.data = data or ({"name": command} if command else {})
+        self.extras: Dict[str, Any] = {}
+        self.guild = None
+        self.guild_id = None
+        self.channel = None
+        self.message = None
+        self.sent: List[Tuple[str, Dict[str, Any]]] = []
+        self.response = StubResponse(self)
+        self.followup = StubFollowup(self)
+        self._original: Optional[StubMessage] = None
+
+    async def original_response(self) -> StubMessage:
+        if self._original is None:
+            raise discord.ClientException("Interaction has not been responded to.")
+        return self._original
+
+    def refusal(self) -> Optional[str]:
+        """Commands turn players away (no stamina, missing items...) with an ephemeral reply."""
+        for kind, fields in self.sent:
+            if kind == "send_message" and fields.get("ephemeral"):
+                return fields.get("content") or ""
+        return None
+
+    def views(self, cls: Type[discord.ui.View] = discord.ui.View) -> List[discord.ui.View]:
+        """Views attached to anything this interaction sent, oldest first."""
+        return [fields["view"] for _, fields in self.sent if isinstance(fields.get("view"), cls)]
+
+    def last_view(self, cls: Type[discord.ui.View] = discord.ui.View) -> Optional[discord.ui.View]:
+        found = self.views(cls)
+        return found[-1] if found else None
+
+
+async def build_bot(db, extensions: Iterable[str] = EXTENSIONS, state=None,
+                    events: Optional[EventBus] = None, metrics: Optional[CommandMetrics] = None) -> commands.Bot:
+    """
+    A bot that never logs in, wired like index.Client.setup_hook: db, state backend, a
+    running event bus and CommandMetrics (with the given extensions loaded).
+    When `db` has an `on_op` hook (MemoryDatabase) its round trips feed the metrics; a
+    real Database needs a MongoListener on the same `metrics` instead.
+    """
+    bot = commands.Bot(command_prefix="!", intents=discord.Intents.none(), tree_cls=InstrumentedTree)
+    bot.metrics = metrics or CommandMetrics(log_interval=0)  # type: ignore[attr-defined]
+    if hasattr(db, "on_op"):
+        db.on_op = bot.metrics.record_db  # type: ignore[attr-defined]
+    bot.db = db  # type: ignore[attr-defined]
+    bot.state = state or MemoryStateBackend()  # type: ignore[attr-defined]
+    bot.events = events or EventBus()  # type: ignore[attr-defined]
+    bot.events.start()  # type: ignore[attr-defined]
+    for name in extensions:
+        await bot.load_extension(name)
+    return bot
+
+
+async def close_bot(bot: commands.Bot) -> None:
+    """Flush the event bus and unload the cogs (the bot was never logged in)."""
+    await bot.events.stop()  # type: ignore[attr-defined]
+    for name in list(bot.extensions):
+        await bot.unload_extension(name)
@@ -4,8 +4,16 @@ from discord.ext import commands
 from pathlib import Path
 import json
 import datetime
+import logging
+from collections import deque
 
-from typing import NoReturn, Optional, Tuple
+from server import events
+from server.playerData import CURRENT_SUBAREA, IN_DUNGEON, TRAVEL_STATE, find_player
+from server.trie import PrefixTrie
+
+from typing import Dict, List, NoReturn, Optional, Tuple
+
+logger = logging.getLogger("bot")
 
 # Load areas data once
 _AREAS_PATH = Path("data/areas.json")
@@ -13,23 +21,106 @@ _areas_data = {}
 if _AREAS_PATH.exists():
     _areas_data = json.loads(_AREAS_PATH.read_text(encoding="utf-8"))
 
-def find_subarea_by_key_or_name(query: str) -> Optional[Tuple[str, str]]:
+SubareaRef = Tuple[str, str]  # (area_key, sub_key)
+
+
+def _build_subarea_index() -> Dict[str, SubareaRef]:
+    """Lowercased sub-area key/display name -> (area_key, sub_key). Keys win over names."""
+    index: Dict[str, SubareaRef] = {}
+    for area_key, area in _areas_data.items():
+        for sub_key in area.get("sub_areas", {}):
+            index.setdefault(sub_key.strip().lower(), (area_key, sub_key))
+    for area_key, area in _areas_data.items():
+        for sub_key, sub in area.get("sub_areas", {}).items():
+            name = sub.get("name", "")
+            if isinstance(name, str) and name.strip():
+                index.setdefault(name.strip().lower(), (area_key, sub_key))
+    return index
+
+
+def _build_adjacency() -> Dict[SubareaRef, Tuple[SubareaRef, ...]]:
     """
-    Try to find a subarea matching a key or display name (case-insensitive).
-    Returns (area_key, sub_key) or None if not found.
+    Connections resolved to (area_key, sub_key): a connection names a sub-area of the same
+    area if one exists, otherwise the first area that has it. Dangling names are dropped.
     """
-    q = query.strip().lower()
+    first_area_of: Dict[str, str] = {}
+    for area_key, area in _areas_data.items():
+        for sub_key in area.get("sub_areas", {}):
+            first_area_of.setdefault(sub_key, area_key)
+
+    adjacency: Dict[SubareaRef, Tuple[SubareaRef, ...]] = {}
     for area_key, area in _areas_data.items():
         sub_areas = area.get("sub_areas", {})
-        # direct key match
-        if q in sub_areas:
-            return area_key, q
-        # name match
         for sub_key, sub in sub_areas.items():
-            name = sub.get("name", "")
-            if isinstance(name, str) and name.strip().lower() == q:
-                return area_key, sub_key
-    return None
+            resolved = []
+            for conn in sub.get("connections", []):
+                conn_area = area_key if conn in sub_areas else first_area_of.get(conn)
+                if conn_area is None:
+                    logger.warning("Sub-area %s/%s: unknown connection %r", area_key, sub_key, conn)
+                    continue
+                resolved.append((conn_area, conn))
+            adjacency[(area_key, sub_key)] = tuple(resolved)
+    return adjacency
+
+
+def _build_routes() -> Dict[SubareaRef, Dict[SubareaRef, Tuple[SubareaRef, ...]]]:
+    """
+    All-pairs shortest paths over the connection graph: routes[src][dst] is the hop sequence
+    from src (exclusive) to dst (inclusive). The graph is small and static, so one BFS per
+    sub-area at import beats searching on every /travel.
+    """
+    routes: Dict[SubareaRef, Dict[SubareaRef, Tuple[SubareaRef, ...]]] = {}
+    for src in subarea_adjacency:
+        parent: Dict[SubareaRef, SubareaRef] = {src: src}
+        queue = deque([src])
+        while queue:
+            node = queue.popleft()
+            for nxt in subarea_adjacency.get(node, ()):
+                if nxt not in parent:
+                    parent[nxt] = node
+                    queue.append(nxt)
+        paths: Dict[SubareaRef, Tuple[SubareaRef, ...]] = {}
+        for dst in parent:
+            if dst == src:
+                continue
+            path = [dst]
+            while parent[path[-1]] != src:
+                path.append(parent[path[-1]])
+            paths[dst] = tuple(reversed(path))
+        routes[src] = paths
+    return routes
+
+
+def find_route(src: SubareaRef, dst: SubareaRef) -> Optional[Tuple[SubareaRef, ...]]:
+    """Shortest hop sequence from src to dst (dst included), or None if unreachable."""
+    return _routes.get(src, {}).get(dst)
+
+
+def subarea_name(ref: SubareaRef) -> str:
+    area_key, sub_key = ref
+    return _areas_data.get(area_key, {}).get("sub_areas", {}).get(sub_key, {}).get("name", sub_key)
+
+
+_subarea_index = _build_subarea_index()
+subarea_adjacency = _build_adjacency()
+_routes = _build_routes()
+_destination_trie: PrefixTrie[app_commands.Choice[str]] = PrefixTrie.build(
+    (text, app_commands.Choice(
+        name=f"{subarea_name((area_key, sub_key))} ({area.get('name', area_key)})"[:100],
+        value=sub_key,
+    ))
+    for area_key, area in _areas_data.items()
+    for sub_key, sub in area.get("sub_areas", {}).items()
+    for text in (sub.get("name") or sub_key, sub_key)
+)
+
+
+def find_subarea_by_key_or_name(query: str) -> Optional[SubareaRef]:
+    """
+    Try to find a subarea matching a key or display name (case-insensitive).
+    Returns (area_key, sub_key) or None if not found.
+    """
+    return _subarea_index.get(query.strip().lower())
 
 class AreaCommands(commands.Cog):
     
@@ -46,7 +137,7 @@ class AreaCommands(commands.Cog):
         user_id = interaction.user.id
 
         # Fetch user's current location document
-        area_doc = await db.areas.find_one({"id": user_id})
+        area_doc = await find_player(db.areas, user_id, CURRENT_SUBAREA)
         if not area_doc:
             return await interaction.response.send_message(
                 "❌ Couldn't determine your current location!", ephemeral=True
@@ -123,22 +214,24 @@ class AreaCommands(commands.Cog):
 
     @app_commands.command(
         name="travel",
-        description="🚶 Travel to a connected sub-area. Provide the sub-area key or display name."
+        description="🚶 Travel to a sub-area, walking the shortest route. Provide the sub-area key or display name."
     )
     @app_commands.describe(destination="The target sub-area (key like 'pond' or name like 'Pond').")
     async def travel(self, interaction: discord.Interaction, destination: str) -> None:
         """
         Travel command with cooldown.
-        Stores lastTravel (epoch seconds) in db.areas per player.
-        Default cooldown: 3600 seconds (1 hour). Change COOLDOWN_SECONDS below to adjust.
+        Walks the shortest route to any reachable sub-area in one go; each hop costs one
+        cooldown, so the next travel waits hops * COOLDOWN_SECONDS.
+        Stores lastTravel (epoch seconds) and travelCooldown (seconds) in db.areas per player.
+        Default cooldown: 3600 seconds (1 hour) per hop. Change COOLDOWN_SECONDS below to adjust.
         """
-        COOLDOWN_SECONDS = 3600  # 1 hour; change to desired value
+        COOLDOWN_SECONDS = 3600  # 1 hour per hop; change to desired value
 
         await interaction.response.defer(thinking=True)
         db = self.bot.db
         user_id = interaction.user.id
         
-        player = await db.general.find_one({"id": user_id})
+        player = await find_player(db.general, user_id, IN_DUNGEON)
         if not player:
             return await interaction.followup.send(
                 "❌ You need to `/register` before you can travel!", 
@@ -160,7 +253,7 @@ class AreaCommands(commands.Cog):
         dest_area_key, dest_sub_key = dest
 
         # Fetch user's current location document (and lastTravel)
-        area_doc = await db.areas.find_one({"id": user_id})
+        area_doc = await find_player(db.areas, user_id, TRAVEL_STATE)
         if not area_doc:
             return await interaction.followup.send(
                 "❌ Couldn't determine your current location!", ephemeral=True
@@ -176,9 +269,10 @@ class AreaCommands(commands.Cog):
         # COOLDOWN CHECK
         now_ts = int(datetime.datetime.utcnow().timestamp())
         last_travel_ts = int(area_doc.get("lastTravel", 0) or 0)
+        cooldown = int(area_doc.get("travelCooldown", COOLDOWN_SECONDS) or COOLDOWN_SECONDS)
         elapsed = now_ts - last_travel_ts
-        if elapsed < COOLDOWN_SECONDS:
-            remaining = COOLDOWN_SECONDS - elapsed
+        if elapsed < cooldown:
+            remaining = cooldown - elapsed
             mins = remaining // 60
             secs = remaining % 60
             time_str = f"{mins}m{secs}s" if mins > 0 else f"{secs}s"
@@ -193,37 +287,24 @@ class AreaCommands(commands.Cog):
                 "ℹ️ You're already in that sub-area.", ephemeral=True
             )
 
-        # Get area & subarea data for current and destination
-        current_area_data = _areas_data.get(current_area_key, {})
-        current_sub_data = current_area_data.get("sub_areas", {}).get(current_sub_key, {})
-        if not current_sub_data:
+        # Validate current location against the static area data
+        if (current_area_key, current_sub_key) not in subarea_adjacency:
             return await interaction.followup.send(
                 "❌ Current sub-area data is invalid. Contact an admin.", ephemeral=True
             )
 
-        # Check connection: destination sub_key must be in current subarea connections
-        connections = current_sub_data.get("connections", [])
-        if dest_sub_key not in connections:
-            # Not connected directly — show available connections
-            friendly_connections = []
-            for conn in connections:
-                if conn in current_area_data.get("sub_areas", {}):
-                    friendly_connections.append(current_area_data['sub_areas'][conn].get('name', conn))
-                else:
-                    found = False
-                    for a_key, a_data in _areas_data.items():
-                        if conn in a_data.get('sub_areas', {}):
-                            friendly_connections.append(a_data['sub_areas'][conn].get('name', conn))
-                            found = True
-                            break
-                    if not found:
-                        friendly_connections.append(conn)
+        # Plan the route: shortest path over the connection graph
+        route = find_route((current_area_key, current_sub_key), dest)
+        if not route:
+            neighbours = subarea_adjacency.get((current_area_key, current_sub_key), ())
+            friendly_connections = [subarea_name(ref) for ref in neighbours]
             readable = ", ".join(friendly_connections) if friendly_connections else "none"
             return await interaction.followup.send(
-                f"❌ That destination isn't directly connected to your current sub-area.\n"
+                f"❌ There's no route from your current sub-area to that destination.\n"
                 f"Available connections from your location: {readable}",
                 ephemeral=True
             )
+        total_cooldown = COOLDOWN_SECONDS * len(route)
 
         # All checks pass — perform the DB update (match your collection format)
         dest_area = _areas_data.get(dest_area_key, {})
@@ -236,7 +317,8 @@ class AreaCommands(commands.Cog):
                 "currentArea": dest_area_key,
                 "currentSubarea": dest_sub_key,
                 "subareaType": subarea_type,
-                "lastTravel": now_ts  # record travel time for cooldown
+                "lastTravel": now_ts,  # record travel time for cooldown
+                "travelCooldown": total_cooldown,
             }}
         )
 
@@ -255,69 +337,26 @@ class AreaCommands(commands.Cog):
         if dest_sub.get("resources"):
             embed.add_field(name="🪵 Resources", value=", ".join(x.capitalize() for x in dest_sub["resources"]), inline=False)
 
+        if len(route) > 1:
+            path = " → ".join(subarea_name(ref) for ref in ((current_area_key, current_sub_key), *route))
+            embed.add_field(name="🗺️ Route", value=path, inline=False)
+
         # Helpful footer showing cooldown length (human readable)
-        cd_minutes = COOLDOWN_SECONDS // 60
-        embed.set_footer(text=f"Travel cooldown: {cd_minutes} minute(s)")
+        cd_minutes = total_cooldown // 60
+        hops = f" ({len(route)} stops)" if len(route) > 1 else ""
+        embed.set_footer(text=f"Travel cooldown: {cd_minutes} minute(s){hops}")
 
         await interaction.followup.send(embed=embed)
 
-        # --- Quest progress updates ---
-        try:
-            quest_cog: Optional[commands.Cog] = self.bot.get_cog("QuestCog")
-            if quest_cog:
-                completions = await quest_cog.update_progress(
-                    user_id,
-                    objective_type="explore",
-                    target=dest_sub_key,
-                    amount=1
-                )
-                if completions:
-                    lines = []
-                    newly_unlocked = []
-                    for comp in completions:
-                        tpl = comp["template"]
-                        title = tpl.get("title", comp["quest_id"])
-                        reward_texts = []
-
-                        rewards = tpl.get("rewards", {})
-                        # Gold
-                        if "gold" in rewards:
-                            rng = rewards["gold"]
-                            if isinstance(rng, list) and len(rng) == 2:
-                                amt = f"{rng[0]}-{rng[1]}"
-                            else:
-                                amt = str(rng)
-                            reward_texts.append(f"{amt}💰")
-                        # Items
-                        if "items" in rewards and rewards["items"]:
-                            reward_texts.append(", ".join(rewards["items"]))
-                        # Equipment
-                        if "equipment" in rewards and rewards["equipment"]:
-                            reward_texts.append("Equipment: " + ", ".join(rewards["equipment"]))
-
-                        rewards_display = f"Rewards: {', '.join(reward_texts)}" if reward_texts else ""
-                        lines.append(f"✅ Quest completed: **{title}**{rewards_display}")
-
-                        # Get the new unlocked quests
-                        try:
-                            unlocked_templates = await quest_cog.get_unlocked_next_quests(user_id, tpl)
-                            for ut in unlocked_templates:
-                                newly_unlocked.append(f"🟡 New quest unlocked: '{ut.get('title','Unknown')}'")
-                        except Exception:
-                            # fallback legacy behavior
-                            next_q = tpl.get("next_quest")
-                            if next_q:
-                                try:
-                                    unlocked_tpl = await quest_cog.get_template(next_q)
-                                    if unlocked_tpl:
-                                        newly_unlocked.append(f"🟡 New quest unlocked: '{unlocked_tpl.get('title','Unknown')}'")
-                                except Exception:
-                                    continue
-
-                    await interaction.followup.send("\n".join(lines + newly_unlocked), ephemeral=True)
-
-        except Exception as e:
-            print(f"[WARN] Failed to update travel quest progress: {e}")
+        # --- Quest progress updates (every sub-area passed through counts as visited) ---
+        for _, hop_sub_key in route:
+            events.emit(self.bot, user_id, events.TRAVEL, hop_sub_key, interaction=interaction)
+
+    @travel.autocomplete("destination")
+    async def travel_destination_autocomplete(
+        self, interaction: discord.Interaction, current: str
+    ) -> List[app_commands.Choice[str]]:
+        return _destination_trie.complete(current)
 
 
 async def setup(bot: commands.Bot) -> None:
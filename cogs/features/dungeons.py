@@ -1,4 +1,5 @@
 import json
+import logging
 import random
 import datetime
 from pathlib import Path
@@ -8,6 +9,12 @@ from discord import app_commands
 from discord.ext import commands
 from discord.ui import View, Button, Select
 
+from server import events
+from server.inventoryData import change_items
+from server.playerData import COMBAT_STATS, IN_DUNGEON, find_equipped, find_player, skill_fields
+
+logger = logging.getLogger("bot")
+
 # --- Load dungeon & mob data ---
 _FLOORS_PATH = Path("data/dungeons/dungeonFloors.json")
 _POOLS_PATH = Path("data/dungeons/dungeonPools.json")
@@ -24,6 +31,109 @@ if _POOLS_PATH.exists():
 if _DUNGEON_MOBS_PATH.exists():
     dungeon_mobs = json.loads(_DUNGEON_MOBS_PATH.read_text(encoding="utf-8"))
 
+# Fallback telegraphed attack for mobs without `special_attacks` in dungeonMobs.json
+DEFAULT_SPECIAL_ATTACK = {
+    "name": "Power Attack",
+    "telegraph_turns": 1,
+    "damage_multiplier": 2.0,
+    "description": "charges up a powerful attack!"
+}
+
+# Precompiled special attack table: mob key -> list of attack definitions
+mob_special_attacks: Dict[str, List[Dict[str, Any]]] = {}
+for _mob_key, _mob_data in dungeon_mobs.items():
+    _attacks = []
+    for _attack in _mob_data.get("special_attacks", []) or []:
+        _attacks.append({
+            "name": _attack.get("name", DEFAULT_SPECIAL_ATTACK["name"]),
+            "telegraph_turns": int(_attack.get("telegraph_turns", DEFAULT_SPECIAL_ATTACK["telegraph_turns"])),
+            "damage_multiplier": float(_attack.get("damage_multiplier", DEFAULT_SPECIAL_ATTACK["damage_multiplier"])),
+            "description": _attack.get("description", DEFAULT_SPECIAL_ATTACK["description"])
+        })
+    if _attacks:
+        mob_special_attacks[_mob_key] = _attacks
+
+
+def create_mob_instance(mob_key: str) -> Optional[Dict[str, Any]]:
+    """
+    Build a fresh combat instance of a dungeon mob template.
+    Nested `stats` is copied so combat never mutates the shared template, and the
+    instance remembers its template `key` for O(1) lookups during mob turns.
+    """
+    template = dungeon_mobs.get(mob_key)
+    if not template:
+        return None
+    mob = dict(template)
+    mob["key"] = mob_key
+    mob["stats"] = dict(template.get("stats", {}))
+    mob["current_hp"] = mob["stats"]["hp"]
+    # Initialize combat-specific properties
+    mob["is_defending"] = False
+    mob["telegraphed_attack"] = None
+    mob["telegraph_turns"] = 0
+    return mob
+
+PUZZLE_CHOICES = ["⬅️ Left", "⬆️ Middle", "➡️ Right"]
+TRAP_SUCCESS_CHANCE = 0.5
+
+
+def _compile_floor(floor_key: str, floor_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Resolve a floor's room list against its pool once at load time, dropping
+    mob keys that have no entry in dungeonMobs.json.
+    """
+    pool = dungeon_pools.get(f"floor_{floor_key}", {})
+    return {
+        "rooms": [
+            {"type": room.get("type", "combat"), "mob_count": int(room.get("mob_count", 1))}
+            for room in floor_data.get("rooms", [])
+        ],
+        "mobs": [key for key in pool.get("mobs", []) if key in dungeon_mobs],
+        "puzzles": list(pool.get("puzzles", [])),
+        "traps": list(pool.get("traps", []))
+    }
+
+
+compiled_floors: Dict[str, Dict[str, Any]] = {
+    key: _compile_floor(key, data) for key, data in dungeon_floors.items()
+}
+
+
+def generate_floor_layout(floor_key: str, seed: int) -> List[Dict[str, Any]]:
+    """
+    Build the full room sequence for a run from its seed.
+    Every random decision outside of combat (mob picks, which puzzle/trap appears,
+    the correct puzzle choice, trap outcomes and gold rolls) is drawn here, so the
+    same seed always produces the same floor.
+    """
+    compiled = compiled_floors.get(floor_key)
+    if not compiled:
+        return []
+
+    rng = random.Random(seed)
+    layout: List[Dict[str, Any]] = []
+    for room in compiled["rooms"]:
+        room_type = room["type"]
+        plan: Dict[str, Any] = {"type": room_type}
+        if room_type == "combat" and compiled["mobs"]:
+            count = min(room["mob_count"], len(compiled["mobs"]))
+            plan["mobs"] = rng.sample(compiled["mobs"], count)
+        elif room_type == "puzzle" and compiled["puzzles"]:
+            plan["event"] = rng.choice(compiled["puzzles"])
+            plan["answer"] = rng.randrange(len(PUZZLE_CHOICES))
+        elif room_type == "trap_decision" and compiled["traps"]:
+            trap = rng.choice(compiled["traps"])
+            plan["event"] = trap
+            plan["success"] = rng.random() < TRAP_SUCCESS_CHANCE
+            gold_range = trap.get("success", {}).get("gold")
+            plan["gold"] = rng.randint(gold_range[0], gold_range[1]) if gold_range else 0
+        else:
+            # Nothing in the pool for this room type
+            plan["type"] = "empty"
+            plan["original_type"] = room_type
+        layout.append(plan)
+    return layout
+
 # Focus Skills Configuration
 FOCUS_SKILLS = {
     "quick_heal": {
@@ -102,22 +212,69 @@ class DungeonCog(commands.Cog):
     
     def __init__(self, bot: commands.Bot) -> None:
         self.bot = bot
-        self.active_dungeons = {}  # Track active dungeon runs
+        self.active_dungeons = {}  # Runs hosted by this process (mirrored to bot.state)
+
+    async def cog_load(self) -> None:
+        state = getattr(self.bot, "state", None)
+        if state is None:
+            return
+        try:
+            waiting = await state.keys("dungeons")
+        except Exception:
+            logger.exception("Could not list saved dungeon runs")
+            return
+        if waiting:
+            # their views died with the process that hosted them; /dungeon picks them up again
+            logger.info("%d dungeon run(s) in shared state can be resumed with /dungeon", len(waiting))
+
+    async def save_run(self, user_id: int):
+        """Mirror a run's progress to the shared state backend (once per room)"""
+        dungeon_data = self.active_dungeons.get(user_id)
+        state = getattr(self.bot, "state", None)
+        if dungeon_data is None or state is None:
+            return
+        try:
+            await state.save("dungeons", user_id, dungeon_data)
+        except Exception:
+            # the run goes on locally; it just can't be resumed elsewhere from this room
+            logger.exception("Could not save dungeon run of user %s", user_id)
+
+    async def load_run(self, user_id: int) -> Optional[Dict[str, Any]]:
+        """A run saved by another process (or before a restart), or None"""
+        state = getattr(self.bot, "state", None)
+        if state is None:
+            return None
+        try:
+            return await state.load("dungeons", user_id)
+        except Exception:
+            logger.exception("Could not load dungeon run of user %s", user_id)
+            return None
+
+    async def drop_run(self, user_id: int) -> Optional[Dict[str, Any]]:
+        """Remove a run locally and from the shared state backend"""
+        dungeon_data = self.active_dungeons.pop(user_id, None)
+        state = getattr(self.bot, "state", None)
+        if state is not None:
+            try:
+                await state.delete("dungeons", user_id)
+            except Exception:
+                logger.exception("Could not delete dungeon run of user %s", user_id)
+        return dungeon_data
 
     async def get_player_data(self, user_id: int) -> Dict[str, Any]:
         """Fetch all player data needed for dungeon"""
         db = self.bot.db
         
         # Get base player stats
-        player = await db.general.find_one({"id": user_id})
+        player = await find_player(db.general, user_id, COMBAT_STATS)
         if not player:
             return {}
             
         # Get equipment for stat calculation
-        equipment = await db.equipment.find_one({"id": user_id}) or {}
+        equipment = await find_equipped(db, user_id) or {}
         
         # Get skills
-        skills = await db.skills.find_one({"id": user_id}) or {}
+        skills = await find_player(db.skills, user_id, skill_fields("combat", "Level")) or {}
         
         return {
             **player,
@@ -186,8 +343,21 @@ class DungeonCog(commands.Cog):
         
         # Check if player already in dungeon
         db = self.bot.db
-        player_check = await db.general.find_one({"id": user_id})
+        player_check = await find_player(db.general, user_id, IN_DUNGEON)
         if player_check and player_check.get("inDungeon", False):
+            # A run hosted here is still waiting on its room view; one only found in shared
+            # state lost its process (restart, or another shard) and continues from its room
+            if user_id not in self.active_dungeons:
+                saved_run = await self.load_run(user_id)
+                if saved_run:
+                    self.active_dungeons[user_id] = saved_run
+                    await interaction.response.send_message(
+                        f"🗝️ {interaction.user.mention} resumed **Dungeon Floor {saved_run['floor']}** "
+                        f"at room {saved_run['current_room'] + 1}!",
+                        ephemeral=False
+                    )
+                    await self.start_next_room(interaction, user_id)
+                    return
             return await interaction.response.send_message(
                 "❌ You're already in a dungeon! Complete it first.",
                 ephemeral=True
@@ -231,10 +401,12 @@ class DungeonCog(commands.Cog):
         # Set dungeon status
         await self.set_dungeon_status(user_id, True)
         
-        # Start dungeon
-        floor_data = dungeon_floors[floor_key]
+        # Start dungeon with a per-run seed so the floor layout can be reproduced
+        seed = random.getrandbits(32)
         self.active_dungeons[user_id] = {
             "floor": floor,
+            "seed": seed,
+            "layout": generate_floor_layout(floor_key, seed),
             "player_stats": player_stats.copy(),
             "current_room": 0,
             "score": 0,
@@ -253,65 +425,60 @@ class DungeonCog(commands.Cog):
         await self.start_next_room(interaction, user_id)
 
     async def start_next_room(self, interaction: discord.Interaction, user_id: int):
-        """Start the next room in the dungeon"""
-        dungeon_data = self.active_dungeons[user_id]
-        floor = dungeon_data["floor"]
-        room_index = dungeon_data["current_room"]
-        
-        floor_data = dungeon_floors[str(floor)]
-        rooms = floor_data.get("rooms", [])
-        
-        if room_index >= len(rooms):
-            # Dungeon completed
-            await self.complete_dungeon(interaction, user_id)
-            return
-        
-        room_data = rooms[room_index]
-        room_type = room_data.get("type", "combat")
-        
-        if room_type == "combat":
-            await self.start_combat_room(interaction, user_id, room_index + 1)
-        else:
-            # Skip non-combat rooms for now
+        """
+        Advance the run to its next interactive room.
+        Rooms that resolve on their own are handled in a loop rather than by
+        recursion; the method returns once a room view is waiting on the player
+        or the floor is complete.
+        """
+        while True:
+            dungeon_data = self.active_dungeons.get(user_id)
+            if not dungeon_data:
+                return
+
+            layout = dungeon_data["layout"]
+            room_index = dungeon_data["current_room"]
+            if room_index >= len(layout):
+                # Dungeon completed
+                await self.complete_dungeon(interaction, user_id)
+                return
+
+            room = layout[room_index]
+            room_type = room["type"]
+            room_number = room_index + 1
+            await self.save_run(user_id)
+
+            if room_type == "combat" and await self.start_combat_room(interaction, user_id, room, room_number):
+                return
+            if room_type == "puzzle":
+                await self.start_puzzle_room(interaction, user_id, room, room_number)
+                return
+            if room_type == "trap_decision":
+                await self.start_trap_room(interaction, user_id, room, room_number)
+                return
+
+            # Nothing playable in this room
             dungeon_data["current_room"] += 1
             await interaction.followup.send(
-                f"🏃 Skipped {room_type} room {room_index + 1}",
+                f"🏃 Skipped {room.get('original_type', room_type)} room {room_number}",
                 ephemeral=False
             )
-            await self.start_next_room(interaction, user_id)
 
-    async def start_combat_room(self, interaction: discord.Interaction, user_id: int, room_number: int):
-        """Start a combat room"""
+    async def start_combat_room(self, interaction: discord.Interaction, user_id: int, room: Dict[str, Any], room_number: int) -> bool:
+        """Start a combat room. Returns False if the room has no usable enemies."""
         dungeon_data = self.active_dungeons[user_id]
         floor = dungeon_data["floor"]
         
-        # Get mobs for this floor
-        pool_key = f"floor_{floor}"
-        available_mobs = dungeon_pools.get(pool_key, {}).get("mobs", [])
-        
-        if not available_mobs:
-            await interaction.followup.send("❌ No enemies available for this floor!")
-            return
-        
-        # Select random mobs
-        mob_count = 1  # Start with 1 mob per room
-        selected_mob_keys = random.sample(available_mobs, min(mob_count, len(available_mobs)))
-        
-        # Create mob copies with current HP
+        # Create mob instances from the keys picked when the layout was generated
         mobs = []
-        for key in selected_mob_keys:
-            if key in dungeon_mobs:
-                mob = dungeon_mobs[key].copy()
-                mob["current_hp"] = mob["stats"]["hp"]
-                # Initialize combat-specific properties
-                mob["is_defending"] = False
-                mob["telegraphed_attack"] = None
-                mob["telegraph_turns"] = 0
+        for key in room.get("mobs", []):
+            mob = create_mob_instance(key)
+            if mob:
                 mobs.append(mob)
         
         if not mobs:
             await interaction.followup.send("❌ Could not load enemy data!")
-            return
+            return False
         
         # Create combat view
         combat_view = DungeonCombatView(
@@ -324,11 +491,95 @@ class DungeonCog(commands.Cog):
         )
         
         embed = combat_view.create_combat_embed()
+        combat_view._last_rendered = embed.to_dict()
         await interaction.followup.send(embed=embed, view=combat_view)
+        return True
+
+    async def start_puzzle_room(self, interaction: discord.Interaction, user_id: int, room: Dict[str, Any], room_number: int):
+        """Start a puzzle room"""
+        dungeon_data = self.active_dungeons[user_id]
+        view = DungeonPuzzleView(user_id=user_id, room=room, cog=self)
+        embed = discord.Embed(
+            title=f"🧩 Floor {dungeon_data['floor']} - Room {room_number}",
+            description=room["event"].get("description", "A puzzle blocks the way."),
+            color=discord.Color.purple()
+        )
+        embed.set_footer(text="Choose carefully - you only get one try.")
+        await interaction.followup.send(embed=embed, view=view)
+
+    async def start_trap_room(self, interaction: discord.Interaction, user_id: int, room: Dict[str, Any], room_number: int):
+        """Start a trap decision room"""
+        dungeon_data = self.active_dungeons[user_id]
+        view = DungeonTrapView(user_id=user_id, room=room, cog=self)
+        embed = discord.Embed(
+            title=f"⚠️ Floor {dungeon_data['floor']} - Room {room_number}",
+            description=room["event"].get("description", "Something about this room feels wrong."),
+            color=discord.Color.orange()
+        )
+        await interaction.followup.send(embed=embed, view=view)
+
+    async def apply_room_effects(self, user_id: int, effects: Dict[str, Any], gold: int = 0) -> List[str]:
+        """
+        Apply a puzzle/trap outcome (score, gold, damage, stamina_loss) to the run.
+        Returns human readable lines describing what happened.
+        """
+        dungeon_data = self.active_dungeons.get(user_id)
+        if not dungeon_data:
+            return []
+
+        lines: List[str] = []
+        score = int(effects.get("score", 0))
+        if score:
+            dungeon_data["score"] = max(0, dungeon_data["score"] + score)
+            lines.append(f"🎖️ {score:+d} score")
+
+        if gold:
+            dungeon_data["gold"] += gold
+            lines.append(f"🪙 +{gold} gold")
+
+        damage = int(effects.get("damage", 0))
+        if damage:
+            player_stats = dungeon_data["player_stats"]
+            player_stats["current_hp"] = max(0, player_stats["current_hp"] - damage)
+            await self.update_player_hp(user_id, player_stats["current_hp"])
+            lines.append(f"🩸 You take **{damage}** damage!")
+
+        stamina_loss = int(effects.get("stamina_loss", 0))
+        if stamina_loss:
+            await self.bot.db.general.update_one(
+                {"id": user_id},
+                {"$inc": {"stamina": -stamina_loss}}
+            )
+            lines.append(f"⚡ -{stamina_loss} stamina")
+
+        return lines
+
+    async def finish_event_room(self, interaction: discord.Interaction, user_id: int, embed: discord.Embed):
+        """Show a puzzle/trap result, then either move on or end a run the room killed."""
+        dungeon_data = self.active_dungeons.get(user_id)
+        if not dungeon_data:
+            return await interaction.response.edit_message(embed=embed, view=None)
+
+        if dungeon_data["player_stats"]["current_hp"] <= 0:
+            embed.add_field(name="💀 Defeated", value="You succumbed to the dungeon.", inline=False)
+            await self.drop_run(user_id)
+            await self.set_dungeon_status(user_id, False)
+            return await interaction.response.edit_message(embed=embed, view=None)
+
+        dungeon_data["current_room"] += 1
+        await interaction.response.edit_message(embed=embed, view=None)
+        await self.start_next_room(interaction, user_id)
+
+    async def abandon_dungeon(self, user_id: int):
+        """Clear a run whose room view timed out (treated as fleeing)"""
+        dungeon_data = await self.drop_run(user_id)
+        if dungeon_data:
+            await self.update_player_hp(user_id, dungeon_data["player_stats"]["current_hp"])
+        await self.set_dungeon_status(user_id, False)
 
     async def complete_dungeon(self, interaction: discord.Interaction, user_id: int):
         """Handle dungeon completion"""
-        dungeon_data = self.active_dungeons.pop(user_id, None)
+        dungeon_data = await self.drop_run(user_id)
         
         # Clear dungeon status regardless
         await self.set_dungeon_status(user_id, False)
@@ -341,7 +592,8 @@ class DungeonCog(commands.Cog):
         grade = self.score_to_grade(score)
         
         # Update player rewards in database
-        await self.give_dungeon_rewards(user_id, dungeon_data)
+        loot_stored = await self.give_dungeon_rewards(user_id, dungeon_data)
+        events.emit(self.bot, user_id, events.DUNGEON_CLEAR, str(dungeon_data["floor"]), interaction=interaction)
         
         # Send completion message
         embed = discord.Embed(
@@ -367,7 +619,10 @@ class DungeonCog(commands.Cog):
                 formatted_loot.append(formatted_item)
             
             loot_text = "\n".join(f"• {item}" for item in formatted_loot)
-            embed.add_field(name="🎁 Loot Obtained", value=loot_text, inline=False)
+            if loot_stored:
+                embed.add_field(name="🎁 Loot Obtained", value=loot_text, inline=False)
+            else:
+                embed.add_field(name="🎒 Inventory Full — Loot Left Behind", value=loot_text, inline=False)
         
         user = self.bot.get_user(user_id)
         if user:
@@ -375,8 +630,8 @@ class DungeonCog(commands.Cog):
         
         await interaction.followup.send(embed=embed)
 
-    async def give_dungeon_rewards(self, user_id: int, dungeon_data: Dict[str, Any]):
-        """Update database with dungeon rewards"""
+    async def give_dungeon_rewards(self, user_id: int, dungeon_data: Dict[str, Any]) -> bool:
+        """Update database with dungeon rewards. Returns False if the loot didn't fit."""
         db = self.bot.db
         
         # Update gold
@@ -391,13 +646,11 @@ class DungeonCog(commands.Cog):
             {"$set": {"hp": dungeon_data["player_stats"]["current_hp"]}}
         )
         
-        # Update inventory with loot
+        # Update inventory with loot (all-or-nothing against the free slots)
+        loot_deltas: Dict[str, int] = {}
         for item_name in dungeon_data["loot"]:
-            await db.inventory.update_one(
-                {"id": user_id},
-                {"$inc": {item_name: 1}},
-                upsert=True
-            )
+            loot_deltas[item_name] = loot_deltas.get(item_name, 0) + 1
+        return await change_items(db, user_id, loot_deltas)
 
     def score_to_grade(self, score: int) -> str:
         """Convert score to letter grade"""
@@ -409,6 +662,90 @@ class DungeonCog(commands.Cog):
         if score >= 40: return "D"
         return "F"
 
+class DungeonPuzzleView(View):
+    """Single-choice puzzle room; the correct choice was fixed by the run seed"""
+
+    def __init__(self, user_id: int, room: Dict[str, Any], cog: DungeonCog):
+        super().__init__(timeout=180)
+        self.user_id = user_id
+        self.room = room
+        self.cog = cog
+
+        for index, label in enumerate(PUZZLE_CHOICES):
+            button = Button(label=label, style=discord.ButtonStyle.secondary)
+            button.callback = self._make_callback(index)
+            self.add_item(button)
+
+    def _make_callback(self, index: int):
+        async def callback(interaction: discord.Interaction):
+            if interaction.user.id != self.user_id:
+                return await interaction.response.send_message("This isn't your dungeon!", ephemeral=True)
+            await self.resolve(interaction, index)
+        return callback
+
+    async def resolve(self, interaction: discord.Interaction, choice: int):
+        self.stop()
+        puzzle = self.room["event"]
+        solved = choice == self.room["answer"]
+        effects = puzzle.get("success" if solved else "failure", {})
+        lines = await self.cog.apply_room_effects(self.user_id, effects)
+
+        embed = discord.Embed(
+            title="🧩 Puzzle Solved!" if solved else "🧩 Puzzle Failed",
+            description="\n".join(lines) if lines else "Nothing happens.",
+            color=discord.Color.green() if solved else discord.Color.red()
+        )
+        await self.cog.finish_event_room(interaction, self.user_id, embed)
+
+    async def on_timeout(self):
+        await self.cog.abandon_dungeon(self.user_id)
+
+
+class DungeonTrapView(View):
+    """Risk/avoid decision; whether the risk pays off was fixed by the run seed"""
+
+    def __init__(self, user_id: int, room: Dict[str, Any], cog: DungeonCog):
+        super().__init__(timeout=180)
+        self.user_id = user_id
+        self.room = room
+        self.cog = cog
+
+    @discord.ui.button(label="Take the risk", style=discord.ButtonStyle.danger, emoji="🎲")
+    async def risk_button(self, interaction: discord.Interaction, button: Button):
+        if interaction.user.id != self.user_id:
+            return await interaction.response.send_message("This isn't your dungeon!", ephemeral=True)
+        self.stop()
+
+        success = self.room["success"]
+        trap = self.room["event"]
+        effects = trap.get("success" if success else "failure", {})
+        lines = await self.cog.apply_room_effects(
+            self.user_id, effects, gold=self.room.get("gold", 0) if success else 0
+        )
+
+        embed = discord.Embed(
+            title="🎲 It paid off!" if success else "💥 It was a trap!",
+            description="\n".join(lines) if lines else "Nothing happens.",
+            color=discord.Color.green() if success else discord.Color.red()
+        )
+        await self.cog.finish_event_room(interaction, self.user_id, embed)
+
+    @discord.ui.button(label="Move on", style=discord.ButtonStyle.secondary, emoji="🚶")
+    async def avoid_button(self, interaction: discord.Interaction, button: Button):
+        if interaction.user.id != self.user_id:
+            return await interaction.response.send_message("This isn't your dungeon!", ephemeral=True)
+        self.stop()
+
+        embed = discord.Embed(
+            title="🚶 You move on",
+            description="You leave it alone and continue deeper.",
+            color=discord.Color.light_grey()
+        )
+        await self.cog.finish_event_room(interaction, self.user_id, embed)
+
+    async def on_timeout(self):
+        await self.cog.abandon_dungeon(self.user_id)
+
 class DungeonCombatView(View):
     """Combat interface for dungeon rooms"""
     
@@ -433,6 +770,10 @@ class DungeonCombatView(View):
             "focused_defense": False
         }
         
+        # Render cache: field name -> (state tuple, text), plus the last sent embed
+        self._field_cache: Dict[str, tuple] = {}
+        self._last_rendered: Optional[Dict[str, Any]] = None
+        
         # Add focus skills dropdown
         self.add_item(FocusSkillSelect(self))
 
@@ -443,18 +784,21 @@ class DungeonCombatView(View):
         await self.cog.set_dungeon_status(self.user_id, False)
         
         # Clear from active dungeons
-        self.cog.active_dungeons.pop(self.user_id, None)
+        await self.cog.drop_run(self.user_id)
 
-    def create_combat_embed(self) -> discord.Embed:
-        """Create embed showing current combat state"""
-        current_mob = self.mobs[self.current_mob_index]
-        
-        embed = discord.Embed(
-            title=f"🗝️ Floor {self.floor} - Room {self.room_number}",
-            color=discord.Color.red()
-        )
-        
-        # Player info
+    def _render_field(self, field: str, state: tuple, builder) -> str:
+        """
+        Return the cached text for an embed field, rebuilding it only when the
+        state tuple it was rendered from has changed since the last render.
+        """
+        cached = self._field_cache.get(field)
+        if cached is not None and cached[0] == state:
+            return cached[1]
+        text = builder()
+        self._field_cache[field] = (state, text)
+        return text
+
+    def _build_player_info(self) -> str:
         player_info = f"❤️ HP: {self.player_stats['current_hp']}/{self.player_stats['max_hp']}\n"
         player_info += f"💪 STR: {self.player_stats['str']}\n"
         player_info += f"🛡️ DEF: {self.player_stats['def']}\n"
@@ -469,14 +813,9 @@ class DungeonCombatView(View):
         
         if active_effects:
             player_info += "Active: " + ", ".join(active_effects)
-        
-        embed.add_field(
-            name="👤 Player",
-            value=player_info,
-            inline=True
-        )
-        
-        # Enemy info
+        return player_info
+
+    def _build_enemy_info(self, current_mob: Dict[str, Any]) -> str:
         enemy_info = f"❤️ HP: {current_mob['current_hp']}/{current_mob['stats']['hp']}\n"
         enemy_info += f"💪 STR: {current_mob['stats']['str']}\n"
         enemy_info += f"🛡️ DEF: {current_mob['stats']['def']}\n"
@@ -490,22 +829,74 @@ class DungeonCombatView(View):
             turns_left = current_mob.get('telegraph_turns', 0)
             attack_name = current_mob['telegraphed_attack']['name']
             enemy_info += f"⚡ **{attack_name}** in {turns_left} turn{'s' if turns_left > 1 else ''}!\n"
+        return enemy_info
+
+    def _build_log_text(self) -> str:
+        # Combat log - CHANGED: Show last 5 actions instead of 3
+        if self.combat_log:
+            return "\n".join(self.combat_log[-5:])  # Show last 5 actions
+        return "Combat started! Choose an action."
+
+    def create_combat_embed(self) -> discord.Embed:
+        """Create embed showing current combat state, reusing unchanged field text"""
+        current_mob = self.mobs[self.current_mob_index]
+        
+        embed = discord.Embed(
+            title=f"🗝️ Floor {self.floor} - Room {self.room_number}",
+            color=discord.Color.red()
+        )
         
+        # Player info
+        player_state = (
+            self.player_stats['current_hp'],
+            self.player_stats['max_hp'],
+            self.player_stats['str'],
+            self.player_stats['def'],
+            self.player_focus,
+            tuple(self.active_effects.values())
+        )
+        player_info = self._render_field("player", player_state, self._build_player_info)
+        embed.add_field(
+            name="👤 Player",
+            value=player_info,
+            inline=True
+        )
+        
+        # Enemy info
+        telegraphed = current_mob.get('telegraphed_attack')
+        enemy_state = (
+            self.current_mob_index,
+            current_mob['current_hp'],
+            bool(current_mob.get('is_defending')),
+            telegraphed['name'] if telegraphed else None,
+            current_mob.get('telegraph_turns', 0)
+        )
+        enemy_info = self._render_field("enemy", enemy_state, lambda: self._build_enemy_info(current_mob))
         embed.add_field(
             name=f"👹 {current_mob['name']}",
             value=enemy_info,
             inline=True
         )
         
-        # Combat log - CHANGED: Show last 5 actions instead of 3
-        if self.combat_log:
-            log_text = "\n".join(self.combat_log[-5:])  # Show last 5 actions
-            embed.add_field(name="📜 Combat Log", value=log_text, inline=False)
-        else:
-            embed.add_field(name="📜 Combat Log", value="Combat started! Choose an action.", inline=False)
+        # The log is append-only, so its length identifies its content
+        log_text = self._render_field("log", (len(self.combat_log),), self._build_log_text)
+        embed.add_field(name="📜 Combat Log", value=log_text, inline=False)
         
         return embed
 
+    async def refresh_combat_message(self, interaction: discord.Interaction):
+        """
+        Re-render the combat embed and edit the message, or just acknowledge the
+        interaction when the rendered embed is identical to what is already shown.
+        """
+        embed = self.create_combat_embed()
+        rendered = embed.to_dict()
+        if rendered == self._last_rendered:
+            await interaction.response.defer()
+            return
+        self._last_rendered = rendered
+        await interaction.response.edit_message(embed=embed, view=self)
+
     async def process_focus_skill(self, interaction: discord.Interaction, skill_id: str, skill_data: Dict[str, Any]):
         """Process focus skill usage"""
         # Deduct focus cost
@@ -545,8 +936,7 @@ class DungeonCombatView(View):
                 return
         
         # Update the combat display
-        embed = self.create_combat_embed()
-        await interaction.response.edit_message(embed=embed, view=self)
+        await self.refresh_combat_message(interaction)
 
     @discord.ui.button(label="Attack", style=discord.ButtonStyle.danger, emoji="⚔️")
     async def attack_button(self, interaction: discord.Interaction, button: Button):
@@ -736,43 +1126,11 @@ class DungeonCombatView(View):
 
     async def start_mob_special_attack(self, interaction: discord.Interaction, mob: Dict[str, Any]):
         """Start a telegraphed special attack for the mob"""
-        # Define possible special attacks based on mob type
-        special_attacks = {
-            'skeleton_grunt': {
-                'name': 'Bone Crusher',
-                'telegraph_turns': 2,
-                'damage_multiplier': 2.5,
-                'description': 'winds up for a powerful bone-crushing strike!'
-            },
-            'skeleton_archer': {
-                'name': 'Precise Shot', 
-                'telegraph_turns': 1,
-                'damage_multiplier': 2.0,
-                'description': 'takes careful aim for a precise shot!'
-            }
-        }
-        
-        mob_key = None
-        for key, data in dungeon_mobs.items():
-            if data['name'] == mob['name']:
-                mob_key = key
-                break
-        
-        if mob_key and mob_key in special_attacks:
-            special_attack = special_attacks[mob_key]
-            mob['telegraphed_attack'] = special_attack
-            mob['telegraph_turns'] = special_attack['telegraph_turns']
-            self.combat_log.append(f"⚡ {mob['name']} {special_attack['description']}")
-        else:
-            # Default special attack
-            mob['telegraphed_attack'] = {
-                'name': 'Power Attack',
-                'telegraph_turns': 1,
-                'damage_multiplier': 2.0,
-                'description': 'charges up a powerful attack!'
-            }
-            mob['telegraph_turns'] = 1
-            self.combat_log.append(f"⚡ {mob['name']} charges up a powerful attack!")
+        attacks = mob_special_attacks.get(mob.get("key"))
+        special_attack = random.choice(attacks) if attacks else DEFAULT_SPECIAL_ATTACK
+        mob['telegraphed_attack'] = special_attack
+        mob['telegraph_turns'] = special_attack['telegraph_turns']
+        self.combat_log.append(f"⚡ {mob['name']} {special_attack['description']}")
         
         await self.check_combat_status(interaction)
 
@@ -921,6 +1279,7 @@ class DungeonCombatView(View):
         dungeon_data["gold"] += gold_gain
         
         self.combat_log.append(f"✅ {mob['name']} defeated! +10 score, +{gold_gain} gold")
+        events.emit(self.cog.bot, self.user_id, events.KILL, mob.get("key", mob["name"]), interaction=interaction)
         
         # Check for loot
         for loot_entry in mob.get("loot_table", []):
@@ -934,8 +1293,7 @@ class DungeonCombatView(View):
         if self.current_mob_index >= len(self.mobs):
             await self.end_combat(interaction, victory=True)
         else:
-            embed = self.create_combat_embed()
-            await interaction.response.edit_message(embed=embed, view=self)
+            await self.refresh_combat_message(interaction)
 
     async def check_combat_status(self, interaction: discord.Interaction):
         """Check if combat should continue or end"""
@@ -943,8 +1301,7 @@ class DungeonCombatView(View):
             self.combat_log.append("💀 You have been defeated!")
             await self.end_combat(interaction, victory=False)
         else:
-            embed = self.create_combat_embed()
-            await interaction.response.edit_message(embed=embed, view=self)
+            await self.refresh_combat_message(interaction)
 
     async def end_combat(self, interaction: discord.Interaction, victory: bool, fled: bool = False):
         """End the current combat"""
@@ -989,7 +1346,7 @@ class DungeonCombatView(View):
                 )
             
             # Clear dungeon data
-            self.cog.active_dungeons.pop(self.user_id, None)
+            await self.cog.drop_run(self.user_id)
             await interaction.response.edit_message(embed=embed, view=None)
 
 async def setup(bot: commands.Bot) -> None:
@@ -1,16 +1,20 @@
 # cogs/features/equipment.py
 from __future__ import annotations
 import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any
 import json
 from pathlib import Path
 
 import discord
 from discord import app_commands
 from discord.ext import commands
-from discord.ui import View, Button, Select
 
-from settings import GUILD_ID
+from server.playerData import EQUIPMENT_INSTANCES, HP, INVENTORY_CAPACITY, find_equipped, find_player
+from server import autocomplete
+from server.inventoryData import find_inventory_page, slot_capacity
+from server.instances import find_stashed, find_stashed_instances, stash_instance, unstash_instance
+from settings import GUILD_ID, INSTANCE_STASH
+from utils.pagination import LazyPager, PagedView, instance_pager, inventory_pager
 
 PAGE_SIZE = 10
 INVENTORY_PAGE_SIZE = 10
@@ -33,113 +37,37 @@ if _ARMOR_TEMPLATES_PATH.exists():
     armor_templates = json.loads(_ARMOR_TEMPLATES_PATH.read_text(encoding="utf-8"))
     all_templates.update(armor_templates)
 
+# Items manifest for inventory page names & emojis
+_ITEMS_PATH = Path("data/items.json")
+_items_data: Dict[str, Any] = {}
+if _ITEMS_PATH.exists():
+    _items_data = json.loads(_ITEMS_PATH.read_text(encoding="utf-8")).get("items", {})
+
 # Load set bonuses
 set_bonuses_config: Dict[str, Any] = {}
 if _SET_BONUSES_PATH.exists():
     set_bonuses_config = json.loads(_SET_BONUSES_PATH.read_text(encoding="utf-8"))
 
-class PaginationView(View):
+class PaginationView(PagedView):
+    """Equipment instances and inventory behind Prev/Next + a list switcher; pages render on demand."""
+
     def __init__(
         self,
         owner_id: int,
-        instances_pages: List[str],
-        inventory_pages: List[str],
+        instances_pager: LazyPager,
+        inventory_pager: LazyPager,
         timeout: float = 180.0
     ):
-        super().__init__(timeout=timeout)
-        self.owner_id = owner_id
-
-        # store both page lists
-        self._instances_pages = instances_pages or ["*(no instances)*"]
-        self._inventory_pages = inventory_pages or ["*(no inventory)*"]
-
         # start showing instances by default
-        self.mode = "instances"
-        self.pages = list(self._instances_pages)
-        self.page = 0
-        self.message: Optional[discord.Message] = None
-        self.total_pages = max(1, len(self.pages))
-
-        # Prev / Next buttons (row 0)
-        self.prev_button = Button(emoji="⬅️", style=discord.ButtonStyle.gray, row=0)
-        self.next_button = Button(emoji="➡️", style=discord.ButtonStyle.gray, row=0)
-        self.prev_button.callback = self.on_prev
-        self.next_button.callback = self.on_next
-
-        # Initially disable prev if on first page
-        if self.page == 0:
-            self.prev_button.disabled = True
-        if self.total_pages <= 1:
-            self.next_button.disabled = True
-
-        self.add_item(self.prev_button)
-        self.add_item(self.next_button)
-
-        # Selector to switch between Instances and Inventory (row 1 -> appears below buttons)
-        self.selector = Select(
-            placeholder="Choose view...",
-            options=[
-                discord.SelectOption(label="Equipment", description="Your equipment instances", value="instances"),
-                discord.SelectOption(label="Inventory", description="Your inventory items", value="inventory"),
+        super().__init__(
+            owner_id,
+            [
+                (discord.SelectOption(label="Equipment", description="Your equipment instances", value="instances"), instances_pager),
+                (discord.SelectOption(label="Inventory", description="Your inventory items", value="inventory"), inventory_pager),
             ],
-            min_values=1,
-            max_values=1,
-            row=1
+            placeholder="Choose view...",
+            timeout=timeout,
         )
-        self.selector.callback = self.on_select
-        self.add_item(self.selector)
-
-    def _update_pages_for_mode(self) -> None:
-        if self.mode == "instances":
-            self.pages = list(self._instances_pages)
-        else:
-            self.pages = list(self._inventory_pages)
-        self.total_pages = max(1, len(self.pages))
-        # clamp page and button states
-        if self.page >= self.total_pages:
-            self.page = self.total_pages - 1
-        self.prev_button.disabled = (self.page == 0)
-        self.next_button.disabled = (self.page >= self.total_pages - 1)
-
-    def _current_content(self) -> str:
-        if not self.pages:
-            return "*(no items)*"
-        # header already included in pages entries
-        return self.pages[self.page]
-
-    async def on_select(self, interaction: discord.Interaction) -> None:
-        if interaction.user.id != self.owner_id:
-            return await interaction.response.send_message("Only the command user may switch lists.", ephemeral=True)
-
-        selected = interaction.data["values"][0]
-        self.mode = selected
-        # reset to first page when switching
-        self.page = 0
-        self._update_pages_for_mode()
-        await interaction.response.edit_message(content=self._current_content(), view=self)
-
-    async def on_prev(self, interaction: discord.Interaction) -> None:
-        if interaction.user.id != self.owner_id:
-            return await interaction.response.send_message("Only the command user may use these buttons.", ephemeral=True)
-        if self.page <= 0:
-            return await interaction.response.defer()
-        self.page -= 1
-        self._update_pages_for_mode()
-        await interaction.response.edit_message(content=self._current_content(), view=self)
-
-    async def on_next(self, interaction: discord.Interaction) -> None:
-        if interaction.user.id != self.owner_id:
-            return await interaction.response.send_message("Only the command user may use these buttons.", ephemeral=True)
-        if self.page >= self.total_pages - 1:
-            return await interaction.response.defer()
-        self.page += 1
-        self._update_pages_for_mode()
-        await interaction.response.edit_message(content=self._current_content(), view=self)
-
-    async def on_timeout(self) -> None:
-        # disable all controls
-        for item in self.children:
-            item.disabled = True
 
 
 class EquipmentCog(commands.Cog):
@@ -184,6 +112,10 @@ class EquipmentCog(commands.Cog):
 
     def __init__(self, bot: commands.Bot) -> None:
         self.bot = bot
+        # /unequip accepts slot labels as well as instance ids
+        self._slot_trie = autocomplete.build_choice_trie([
+            ((label, slot), autocomplete.choice(label, label)) for slot, label in self.SLOT_LABELS.items()
+        ])
 
     async def _calculate_total_hp_bonus(self, user_id: int) -> int:
         """Calculate total HP bonus from armor pieces and set bonuses."""
@@ -191,7 +123,7 @@ class EquipmentCog(commands.Cog):
         if not db:
             return 0
             
-        equip_doc = await db.equipment.find_one({"id": user_id})
+        equip_doc = await find_equipped(db, user_id, self.ARMOR_SLOTS)
         if not equip_doc:
             return 0
         
@@ -236,7 +168,7 @@ class EquipmentCog(commands.Cog):
         hp_bonus = await self._calculate_total_hp_bonus(user_id)
         
         # Get current player data
-        player_data = await db.general.find_one({"id": user_id})
+        player_data = await find_player(db.general, user_id, HP)
         if not player_data:
             return
             
@@ -282,7 +214,7 @@ class EquipmentCog(commands.Cog):
         if not db:
             return {}
             
-        equip_doc = await db.equipment.find_one({"id": user_id})
+        equip_doc = await find_equipped(db, user_id, self.ARMOR_SLOTS)
         if not equip_doc:
             return {}
         
@@ -313,8 +245,8 @@ class EquipmentCog(commands.Cog):
 
         user_id = interaction.user.id
 
-        # Fetch player's equipment document
-        equip_doc = await db.equipment.find_one({"id": user_id})
+        # Fetch player's equipment document (instances are listed below)
+        equip_doc = await find_player(db.equipment, user_id, EQUIPMENT_INSTANCES)
         if not equip_doc:
             return await interaction.response.send_message(
                 "❌ No equipment profile found — you probably need to `/register`.", ephemeral=True
@@ -380,26 +312,20 @@ class EquipmentCog(commands.Cog):
 
         await interaction.response.send_message(embed=embed)
 
-        # Prepare paginated pages with the helper
-        from utils.pagination import build_instance_pages, build_inventory_pages
-        instances = equip_doc.get("instances", []) or []
-        instance_pages = build_instance_pages(instances, page_size=PAGE_SIZE, title="Instances")
-
-        # inventory pages: fetch inv doc and build pages
-        inv_doc = await db.inventory.find_one({"id": user_id})
-
-        import json
-        from pathlib import Path
-        _ITEMS_PATH = Path("data/items.json")
-        _items_data = {}
-        if _ITEMS_PATH.exists():
-            _items_data = json.loads(_ITEMS_PATH.read_text(encoding="utf-8")).get("items", {})
+        # Prepare lazy pagers with the helpers
+        stashed = await find_stashed_instances(db, user_id, use_stash=INSTANCE_STASH)
+        instances = (equip_doc.get("instances", []) or []) + stashed
+        instance_pages = instance_pager(instances, page_size=PAGE_SIZE, title="Instances")
 
-        max_slots = (await db.general.find_one({"id": user_id})).get("maxInventory", 200)
-        inventory_pages = build_inventory_pages(inv_doc=inv_doc, items_manifest=_items_data, max_slots=max_slots, items_per_page=INVENTORY_PAGE_SIZE)
+        # inventory pager: each page is its own server-side slice of the inventory doc
+        max_slots = slot_capacity(await find_player(db.inventory, user_id, INVENTORY_CAPACITY))
+        inventory_pages = await inventory_pager(
+            lambda skip, limit: find_inventory_page(db, user_id, skip, limit),
+            items_manifest=_items_data, max_slots=max_slots, items_per_page=INVENTORY_PAGE_SIZE
+        )
 
-        view = PaginationView(owner_id=user_id, instances_pages=instance_pages, inventory_pages=inventory_pages, timeout=180.0)
-        first_page_content = view._current_content()
+        view = PaginationView(owner_id=user_id, instances_pager=instance_pages, inventory_pager=inventory_pages, timeout=180.0)
+        first_page_content = await view.current_content()
 
         # Send the paginated plaintext as a followup and store the message on the view
         page_msg = await interaction.followup.send(content=first_page_content, view=view, ephemeral=False)
@@ -417,12 +343,14 @@ class EquipmentCog(commands.Cog):
             return await interaction.response.send_message("❌ Database not available.", ephemeral=True)
 
         user_id = interaction.user.id
-        equip_doc = await db.equipment.find_one({"id": user_id})
+        equip_doc = await find_equipped(db, user_id, extra_ids=(instance_id,))
         if not equip_doc:
             return await interaction.response.send_message("❌ No equipment profile found. Try `/register`.", ephemeral=True)
 
-        # Find instance
+        # Find instance (unequipped ones may live in the stash)
         inst = next((it for it in equip_doc.get("instances", []) if it.get("instance_id") == instance_id), None)
+        if not inst:
+            inst = await find_stashed(db, user_id, instance_id, use_stash=INSTANCE_STASH)
         if not inst:
             return await interaction.response.send_message(
                 f"❌ No item with ID `{instance_id}` found in your inventory.", ephemeral=True
@@ -455,7 +383,9 @@ class EquipmentCog(commands.Cog):
             # Only one empty slot, equip automatically
             slot_to_use = empty_slots[0]
             equip_doc[slot_to_use] = instance_id
+            await unstash_instance(db, user_id, instance_id, use_stash=INSTANCE_STASH)
             await db.equipment.update_one({"id": user_id}, {"$set": {slot_to_use: instance_id}})
+            autocomplete.invalidate_instances(user_id)
             
             # Update HP if this is an armor piece
             if slot_to_use in self.ARMOR_SLOTS:
@@ -487,7 +417,9 @@ class EquipmentCog(commands.Cog):
                 async def callback(self, interaction: discord.Interaction):
                     chosen_slot = self.values[0]
                     equip_doc[chosen_slot] = instance_id
+                    await unstash_instance(db, user_id, instance_id, use_stash=INSTANCE_STASH)
                     await db.equipment.update_one({"id": user_id}, {"$set": {chosen_slot: instance_id}})
+                    autocomplete.invalidate_instances(user_id)
                     
                     # Update HP if this is an armor piece
                     if chosen_slot in self.cog.ARMOR_SLOTS:
@@ -522,7 +454,7 @@ class EquipmentCog(commands.Cog):
             return await interaction.response.send_message("❌ Database not available.", ephemeral=True)
 
         user_id = interaction.user.id
-        equip_doc = await db.equipment.find_one({"id": user_id})
+        equip_doc = await find_equipped(db, user_id)
         if not equip_doc:
             return await interaction.response.send_message("❌ No equipment profile found. Try `/register`.", ephemeral=True)
 
@@ -543,6 +475,9 @@ class EquipmentCog(commands.Cog):
             
             equip_doc[slot] = None
             await db.equipment.update_one({"id": user_id}, {"$set": {slot: None}})
+            if INSTANCE_STASH:
+                await stash_instance(db, user_id, instance_id)
+            autocomplete.invalidate_instances(user_id)
             
             # Update HP if this was an armor piece
             if slot in self.ARMOR_SLOTS:
@@ -566,6 +501,9 @@ class EquipmentCog(commands.Cog):
         item_name = found_instance.get("template", "Unknown") if found_instance else "Unknown"
         equip_doc[found_slot] = None
         await db.equipment.update_one({"id": user_id}, {"$set": {found_slot: None}})
+        if INSTANCE_STASH:
+            await stash_instance(db, user_id, identifier)
+        autocomplete.invalidate_instances(user_id)
         
         # Update HP if this was an armor piece
         if found_slot in self.ARMOR_SLOTS:
@@ -574,5 +512,19 @@ class EquipmentCog(commands.Cog):
         slot_label = self.SLOT_LABELS.get(found_slot, found_slot)
         await interaction.response.send_message(f"✅ Unequipped **{item_name}** (`{identifier}`) from **{slot_label}**.", ephemeral=True)
 
+    @equip.autocomplete("instance_id")
+    async def equip_instance_autocomplete(
+        self, interaction: discord.Interaction, current: str
+    ) -> List[app_commands.Choice[str]]:
+        owned = await autocomplete.player_instances(self.bot.db, interaction.user.id, use_stash=INSTANCE_STASH)
+        return owned.unequipped.complete(current)
+
+    @unequip.autocomplete("identifier")
+    async def unequip_identifier_autocomplete(
+        self, interaction: discord.Interaction, current: str
+    ) -> List[app_commands.Choice[str]]:
+        owned = await autocomplete.player_instances(self.bot.db, interaction.user.id, use_stash=INSTANCE_STASH)
+        return autocomplete.merge_choices(owned.equipped.complete(current), self._slot_trie.complete(current))
+
 async def setup(bot: commands.Bot) -> None:
     await bot.add_cog(EquipmentCog(bot), guilds=[discord.Object(id=GUILD_ID)])
\ No newline at end of file
@@ -6,6 +6,11 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 
+from server import autocomplete
+from server.instances import find_stashed_instances
+from server.playerData import EQUIPMENT_INSTANCES, find_player, item_counts
+from settings import INSTANCE_STASH
+
 # Load items manifest
 _ITEMS_PATH = Path("data/items.json")
 _items_data: Dict[str, Any] = {}
@@ -32,23 +37,33 @@ if _ARMOR_TEMPLATES_PATH.exists():
     armor_templates = json.loads(_ARMOR_TEMPLATES_PATH.read_text(encoding="utf-8"))
     all_templates.update(armor_templates)
 
+# Autocomplete index over item keys and display names
+_item_trie = autocomplete.build_choice_trie([
+    ((key, info.get("name", key)), autocomplete.choice(str(info.get("name", key)).title(), key))
+    for key, info in _items_data.items()
+])
+
 class InspectCog(commands.Cog):
     """Allows players to inspect items in their inventory or equipped tools/weapons."""
 
     def __init__(self, bot: commands.Bot) -> None:
         self.bot = bot
 
-    async def get_inventory(self, user_id: int) -> Dict[str, int]:
-        """Fetch the user's inventory as a dictionary {item_name: quantity}."""
+    async def get_item_count(self, user_id: int, item_key: str) -> int:
+        """How many of one item the user holds."""
         db = self.bot.db
-        inv_doc = await db.inventory.find_one({"id": user_id})
-        return inv_doc if inv_doc else {}
+        inv_doc = await find_player(db.inventory, user_id, item_counts(item_key))
+        return int(inv_doc.get(item_key, 0)) if inv_doc else 0
 
     async def get_equipment(self, user_id: int) -> Dict[str, Any]:
         """Fetch user's equipment instances."""
         db = self.bot.db
-        equip_doc = await db.equipment.find_one({"id": user_id})
-        return equip_doc if equip_doc else {}
+        equip_doc = await find_player(db.equipment, user_id, EQUIPMENT_INSTANCES)
+        if not equip_doc:
+            return {}
+        stashed = await find_stashed_instances(db, user_id, use_stash=INSTANCE_STASH)
+        equip_doc["instances"] = (equip_doc.get("instances") or []) + stashed
+        return equip_doc
 
     def _get_equipped_slots(self, equipment: Dict[str, Any], instance_id: str) -> List[str]:
         """Find which slots an instance is equipped in."""
@@ -67,7 +82,6 @@ class InspectCog(commands.Cog):
         db = self.bot.db
         user_id = interaction.user.id
 
-        inventory = await self.get_inventory(user_id)
         equipment = await self.get_equipment(user_id)
         instances = equipment.get("instances", [])
 
@@ -75,7 +89,7 @@ class InspectCog(commands.Cog):
 
         # First, check if the item exists in inventory
         if item_key in _items_data:
-            quantity = inventory.get(item_key, 0)
+            quantity = await self.get_item_count(user_id, item_key)
             if quantity <= 0:
                 return await interaction.response.send_message(
                     f"❌ You do not have any **{_items_data[item_key]['name'].title()}** in your inventory.", ephemeral=True
@@ -173,6 +187,13 @@ class InspectCog(commands.Cog):
             f"❌ Item or instance '{item_name}' does not exist.", ephemeral=True
         )
 
+    @inspect.autocomplete("item_name")
+    async def inspect_item_autocomplete(
+        self, interaction: discord.Interaction, current: str
+    ) -> List[app_commands.Choice[str]]:
+        owned = await autocomplete.player_instances(self.bot.db, interaction.user.id, use_stash=INSTANCE_STASH)
+        return autocomplete.merge_choices(owned.owned.complete(current), _item_trie.complete(current))
+
 async def setup(bot: commands.Bot) -> None:
     from settings import GUILD_ID
     await bot.add_cog(InspectCog(bot), guilds=[discord.Object(id=GUILD_ID)])
\ No newline at end of file
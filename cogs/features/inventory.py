@@ -2,14 +2,22 @@
 
 import math
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Optional
 
 import discord
 from discord import app_commands
 from discord.ext import commands
-from discord.ui import Button, View, Select
 
 import json
+
+from server.instances import find_all_instances
+from server.inventoryData import (
+    SORT_MODES, facet_keys, find_inventory_page, keys_by_rarity, keys_by_type, slot_capacity,
+)
+from server.playerData import INVENTORY_CAPACITY, find_player
+from settings import INSTANCE_STASH
+from utils.pagination import LazyPager, PagedView, instance_pager, inventory_pager
+
 # Load items manifest for names & emojis
 _ITEMS_PATH = Path("data/items.json")
 _items_data: Dict[str, Any] = {}
@@ -18,102 +26,28 @@ if _ITEMS_PATH.exists():
 
 ITEMS_PER_PAGE = 10
 
+# Filter/sort choices come from the item facets built at load
+_TYPE_CHOICES = [app_commands.Choice(name=t.title(), value=t) for t in keys_by_type][:25]
+_RARITY_CHOICES = [app_commands.Choice(name=r.title(), value=r) for r in keys_by_rarity][:25]
+_SORT_CHOICES = [app_commands.Choice(name=m.title(), value=m) for m in SORT_MODES]
+
 
-class InventoryView(View):
+class InventoryView(PagedView):
     """
     View that shows Prev/Next buttons (row 0) and a dropdown to switch between
-    Inventory and Equipment pages (row 1).
+    Inventory and Equipment pages (row 1). Pages render when first shown.
     """
 
-    def __init__(self, owner_id: int, inventory_pages: List[str], equipment_pages: List[str], timeout: float = 120.0):
-        super().__init__(timeout=timeout)
-        self.owner_id = owner_id
-        # store both sets of pages
-        self._inventory_pages = inventory_pages or ["*(no inventory)*"]
-        self._equipment_pages = equipment_pages or ["*(no equipment)*"]
-
-        # start showing inventory
-        self.mode = "inventory"
-        self.pages = list(self._inventory_pages)
-        self.current = 0
-        self.total_pages = max(1, len(self.pages))
-
-        # Prev / Next buttons row=0
-        self.prev_button = Button(emoji="⬅️", style=discord.ButtonStyle.gray, row=0)
-        self.next_button = Button(emoji="➡️", style=discord.ButtonStyle.gray, row=0)
-        self.prev_button.callback = self._on_prev
-        self.next_button.callback = self._on_next
-
-        # initial disabled states
-        self.prev_button.disabled = True
-        self.next_button.disabled = (self.total_pages == 1)
-
-        self.add_item(self.prev_button)
-        self.add_item(self.next_button)
-
-        # Selector row=1 (appears below buttons)
-        self.selector = Select(
-            placeholder="Switch view...",
-            options=[
-                discord.SelectOption(label="Inventory", description="Your collectible items", value="inventory"),
-                discord.SelectOption(label="Equipment", description="Your item instances / tools", value="equipment"),
+    def __init__(self, owner_id: int, inventory_pager: LazyPager, equipment_pager: LazyPager, timeout: float = 120.0):
+        super().__init__(
+            owner_id,
+            [
+                (discord.SelectOption(label="Inventory", description="Your collectible items", value="inventory"), inventory_pager),
+                (discord.SelectOption(label="Equipment", description="Your item instances / tools", value="equipment"), equipment_pager),
             ],
-            min_values=1,
-            max_values=1,
-            row=1
+            placeholder="Switch view...",
+            timeout=timeout,
         )
-        self.selector.callback = self._on_select
-        self.add_item(self.selector)
-
-    def _update_pages(self) -> None:
-        """Set self.pages to the currently selected mode's pages and adjust controls."""
-        if self.mode == "inventory":
-            self.pages = list(self._inventory_pages)
-        else:
-            self.pages = list(self._equipment_pages)
-        self.total_pages = max(1, len(self.pages))
-        if self.current >= self.total_pages:
-            self.current = self.total_pages - 1
-        self.prev_button.disabled = (self.current == 0)
-        self.next_button.disabled = (self.current >= self.total_pages - 1)
-
-    def _current_content(self) -> str:
-        if not self.pages:
-            return "*(no items)*"
-        return self.pages[self.current]
-
-    async def _on_prev(self, interaction: discord.Interaction) -> None:
-        if interaction.user.id != self.owner_id:
-            return await interaction.response.send_message("Only the command user may use these buttons.", ephemeral=True)
-        if self.current <= 0:
-            return await interaction.response.defer()
-        self.current -= 1
-        self._update_pages()
-        await interaction.response.edit_message(content=self._current_content(), view=self)
-
-    async def _on_next(self, interaction: discord.Interaction) -> None:
-        if interaction.user.id != self.owner_id:
-            return await interaction.response.send_message("Only the command user may use these buttons.", ephemeral=True)
-        if self.current >= self.total_pages - 1:
-            return await interaction.response.defer()
-        self.current += 1
-        self._update_pages()
-        await interaction.response.edit_message(content=self._current_content(), view=self)
-
-    async def _on_select(self, interaction: discord.Interaction) -> None:
-        if interaction.user.id != self.owner_id:
-            return await interaction.response.send_message("Only the command user may switch views.", ephemeral=True)
-        selected = interaction.data["values"][0]
-        self.mode = selected
-        # reset to first page when switching
-        self.current = 0
-        self._update_pages()
-        await interaction.response.edit_message(content=self._current_content(), view=self)
-
-    async def on_timeout(self) -> None:
-        # disable all controls when the view times out
-        for item in self.children:
-            item.disabled = True
 
 
 class InventoryCog(commands.Cog):
@@ -126,33 +60,51 @@ class InventoryCog(commands.Cog):
         name="inventory",
         description="View your inventory."
     )
-    async def inventory(self, interaction: discord.Interaction) -> None:
+    @app_commands.describe(
+        item_type="Only show items of this type",
+        rarity="Only show items of this rarity",
+        sort="Order by name (default), quantity (most first) or rarity (rarest first)",
+    )
+    @app_commands.choices(item_type=_TYPE_CHOICES, rarity=_RARITY_CHOICES, sort=_SORT_CHOICES)
+    async def inventory(
+        self,
+        interaction: discord.Interaction,
+        item_type: Optional[str] = None,
+        rarity: Optional[str] = None,
+        sort: Optional[str] = None,
+    ) -> None:
         db = self.bot.db  # type: ignore[attr-defined]
         user_id = interaction.user.id
 
         # Fetch user data
-        gen = await db.general.find_one({"id": user_id})
-        inv = await db.inventory.find_one({"id": user_id})
-        if not gen or not inv:
+        inv = await find_player(db.inventory, user_id, INVENTORY_CAPACITY)
+        if not inv:
             return await interaction.response.send_message(
                 "❌ You need to `/register` first.", ephemeral=True
             )
 
-        max_slots = gen.get("maxInventory", 200)
-
-        # Build inventory pages using shared helper
-        from utils.pagination import build_inventory_pages, build_instance_pages
-
-        inventory_pages = build_inventory_pages(inv_doc=inv, items_manifest=_items_data, max_slots=max_slots, items_per_page=ITEMS_PER_PAGE)
+        max_slots = slot_capacity(inv)
+
+        # Inventory pager using shared helper (each page is its own server-side slice)
+        keys = facet_keys(item_type, rarity)
+        sort_mode = sort or "name"
+        title = "Inventory"
+        labels = [label.title() for label in (item_type, rarity) if label]
+        if labels:
+            title += f" ({', '.join(labels)})"
+        inventory_pages = await inventory_pager(
+            lambda skip, limit: find_inventory_page(db, user_id, skip, limit, keys=keys, sort=sort_mode),
+            items_manifest=_items_data, max_slots=max_slots, items_per_page=ITEMS_PER_PAGE,
+            title=title, filtered=keys is not None
+        )
 
-        # Build equipment/instance pages for the dropdown (so Inventory view can switch to Equipment)
-        equip_doc = await db.equipment.find_one({"id": user_id})
-        instances = equip_doc.get("instances", []) if equip_doc else []
-        equipment_pages = build_instance_pages(instances, page_size=15, title="Instances")
+        # Equipment/instance pager for the dropdown (so Inventory view can switch to Equipment)
+        instances = await find_all_instances(db, user_id, use_stash=INSTANCE_STASH)
+        equipment_pages = instance_pager(instances, page_size=15, title="Instances")
 
-        # Create the view with both sets of pages
-        view = InventoryView(owner_id=user_id, inventory_pages=inventory_pages, equipment_pages=equipment_pages, timeout=120.0)
-        first_page = view._current_content()
+        # Create the view with both pagers
+        view = InventoryView(owner_id=user_id, inventory_pager=inventory_pages, equipment_pager=equipment_pages, timeout=120.0)
+        first_page = await view.current_content()
 
         # Send the initial inventory page and attach view
         page_msg = await interaction.response.send_message(content=first_page, view=view, ephemeral=False)
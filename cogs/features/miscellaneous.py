@@ -3,6 +3,7 @@ from discord import app_commands, Interaction
 from discord.ext import commands
 import discord
 
+from server.playerData import STAMINA, find_player
 from server.userMethods import regenerate_stamina
 from settings import GUILD_ID
 
@@ -14,7 +15,7 @@ class MiscCommandCog(commands.Cog):
 
     async def get_regen_user(self, user_id: int) -> dict | None:
         db = self.bot.db
-        user = await db.general.find_one({"id": user_id})
+        user = await find_player(db.general, user_id, STAMINA)
         if user is None:
             return None
 
@@ -1,6 +1,7 @@
 # cogs/features/npcs.py
 from __future__ import annotations
 import json
+import logging
 from pathlib import Path
 from typing import Dict, Any, Optional, Set, List
 
@@ -9,7 +10,11 @@ from discord import app_commands
 from discord.ext import commands
 from discord.ui import View, Select, Button
 
+from server import events
+from server.playerData import CURRENT_SUBAREA, IN_DUNGEON, find_player
+
 _NPCS_PATH = Path("data/quests/npcs.json")
+_QUESTS_PATH = Path("data/quests/quests.json")
 _npcs_data: Dict[str, Dict[str, Any]] = {}
 if _NPCS_PATH.exists():
     try:
@@ -17,11 +22,120 @@ if _NPCS_PATH.exists():
     except Exception:
         _npcs_data = {}
 
+_quest_ids: Set[str] = set()
+if _QUESTS_PATH.exists():
+    try:
+        _quest_ids = {q["quest_id"] for q in json.loads(_QUESTS_PATH.read_text(encoding="utf-8")).get("quests", [])}
+    except Exception:
+        _quest_ids = set()
+
+logger = logging.getLogger("bot")
+
+
+def _node_description(node: Dict[str, Any]) -> str:
+    description = node.get("text", "")
+    lore = node.get("lore")
+    if lore:
+        description += f"\n\n{lore}"
+    return description
+
+
+def compile_npc(npc_id: str, npc_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Turn an NPC's raw dialogue into ready-to-render nodes:
+      {"name", "sub_area", "start", "nodes": {key: {"description", "buttons", "quest_ids"}}}
+    Each button spec is {"kind": "quest"|"next"|"end", "label", ...} so the view never
+    has to re-read options. Broken references are logged and dropped.
+    """
+    dialogue = npc_data.get("dialogue", {})
+    start = "start" if "start" in dialogue else next(iter(dialogue), None)
+    if start is None:
+        logger.warning("NPC %s has no dialogue nodes; skipping", npc_id)
+        return None
+
+    name = npc_data.get("name", "NPC")
+    nodes: Dict[str, Dict[str, Any]] = {}
+    edges: Dict[str, List[str]] = {}
+    for node_key, node in dialogue.items():
+        buttons: List[Dict[str, Any]] = []
+        edges[node_key] = []
+        for opt in node.get("options", []):
+            label = opt.get("label", "…")
+            next_node = opt.get("next")
+
+            if opt.get("action") == "give_quest" and "quest_id" in opt:
+                if opt["quest_id"] not in _quest_ids:
+                    logger.warning("NPC %s node %s offers unknown quest %s", npc_id, node_key, opt["quest_id"])
+                    continue
+                buttons.append({"kind": "quest", "label": label, "quest_id": opt["quest_id"]})
+                # quest options don't navigate, but their "next" marks the node as authored/reachable
+                if next_node in dialogue:
+                    edges[node_key].append(next_node)
+                continue
+
+            if not next_node or next_node.lower() == "end":
+                end_node = dialogue.get(next_node or "end", {})
+                buttons.append({
+                    "kind": "end",
+                    "label": label,
+                    "description": _node_description(end_node) or "Farewell, traveler.",
+                })
+                continue
+
+            if next_node not in dialogue:
+                logger.warning("NPC %s node %s points at missing node %s", npc_id, node_key, next_node)
+                continue
+            buttons.append({"kind": "next", "label": label, "next": next_node})
+            edges[node_key].append(next_node)
+
+        nodes[node_key] = {
+            "description": _node_description(node),
+            "buttons": buttons,
+            "quest_ids": [b["quest_id"] for b in buttons if b["kind"] == "quest"],
+        }
+
+    seen = {start}
+    stack = [start]
+    while stack:
+        for nxt in edges[stack.pop()]:
+            if nxt not in seen:
+                seen.add(nxt)
+                stack.append(nxt)
+    unreachable = [k for k in dialogue if k not in seen and k != "end"]
+    if unreachable:
+        logger.warning("NPC %s has unreachable dialogue nodes: %s", npc_id, ", ".join(unreachable))
+
+    return {"id": npc_id, "name": name, "sub_area": npc_data.get("sub_area"), "start": start, "nodes": nodes}
+
+
+# Compiled NPCs and a subarea -> {npc_id: npc} index used by /talk
+compiled_npcs: Dict[str, Dict[str, Any]] = {}
+npcs_by_subarea: Dict[str, Dict[str, Dict[str, Any]]] = {}
+for _nid, _ndata in _npcs_data.items():
+    _compiled = compile_npc(_nid, _ndata)
+    if _compiled is None:
+        continue
+    compiled_npcs[_nid] = _compiled
+    if _compiled["sub_area"]:
+        npcs_by_subarea.setdefault(_compiled["sub_area"], {})[_nid] = _compiled
+
+
+class DialogueButton(Button):
+    """Button for one prebuilt option spec; the view decides what it does."""
+
+    def __init__(self, spec: Dict[str, Any], **kwargs: Any):
+        super().__init__(**kwargs)
+        self.spec = spec
+
+    async def callback(self, interaction: discord.Interaction) -> None:
+        await self.view.on_option(interaction, self.spec)
+
+
 class NPCDialogueView(View):
     def __init__(
         self,
         npc_id: str,
-        npc_data: Dict[str, Any],
+        npc: Dict[str, Any],
         user_id: int,
         ready_turnins: Optional[Set[str]] = None,
         active_quests: Optional[Set[str]] = None,
@@ -30,14 +144,12 @@ class NPCDialogueView(View):
     ):
         super().__init__(timeout=timeout)
         self.npc_id = npc_id
-        self.npc_data = npc_data
+        self.npc = npc
         self.user_id = user_id
         self.ready_turnins = ready_turnins or set()
         self.active_quests = active_quests or set()
         self.completed_quests = completed_quests or set()
-        self.current_node: str = "start" if "start" in npc_data.get("dialogue", {}) else next(iter(npc_data.get("dialogue", {})), None)
-        if self.current_node is None:
-            raise ValueError("NPC has no dialogue nodes")
+        self.current_node: str = npc["start"]
         self._rebuild_buttons_for_node(self.current_node)
 
     def _clear_buttons(self):
@@ -76,139 +188,113 @@ class NPCDialogueView(View):
 
     def _rebuild_buttons_for_node(self, node_key: str) -> None:
         self._clear_buttons()
-        node = self.npc_data.get("dialogue", {}).get(node_key, {})
-        options = node.get("options", [])
-
-        for opt in options:
-            label = opt.get("label", "…")
-
-            # --- Quest Button --- (now supports accept OR turn-in)
-            if opt.get("action") == "give_quest" and "quest_id" in opt:
-                quest_id = opt["quest_id"]
+        for spec in self.npc["nodes"][node_key]["buttons"]:
+            kind = spec["kind"]
 
+            # --- Quest Button --- (accept OR turn-in)
+            if kind == "quest":
+                quest_id = spec["quest_id"]
                 # If player already completed this quest -> DO NOT SHOW the button
                 if quest_id in self.completed_quests:
                     continue
-
                 # If player already has it active -> show but disabled
                 is_active = quest_id in self.active_quests
                 is_ready = quest_id in self.ready_turnins
-                btn_label = label
-                style = discord.ButtonStyle.success
                 if is_ready:
-                    btn_label = f"Turn in: {label}"
-                    style = discord.ButtonStyle.primary
-
+                    label, style = f"Turn in: {spec['label']}", discord.ButtonStyle.primary
+                else:
+                    label, style = spec["label"], discord.ButtonStyle.success
                 # set custom_id so we can identify duplicates later
-                btn = Button(label=btn_label, style=style, disabled=is_active and (not is_ready), custom_id=f"quest:{quest_id}")
+                self.add_item(DialogueButton(
+                    spec, label=label, style=style,
+                    disabled=is_active and (not is_ready), custom_id=f"quest:{quest_id}"
+                ))
+            elif kind == "end":
+                self.add_item(DialogueButton(spec, label=spec["label"], style=discord.ButtonStyle.secondary))
+            else:
+                self.add_item(DialogueButton(spec, label=spec["label"], style=discord.ButtonStyle.primary))
+
+    async def on_option(self, inter: discord.Interaction, spec: Dict[str, Any]) -> None:
+        kind = spec["kind"]
+        if kind == "quest":
+            await self._on_quest(inter, spec["quest_id"])
+        elif kind == "end":
+            embed = discord.Embed(
+                title=self.npc["name"],
+                description=spec["description"],
+                color=discord.Color.dark_gold()
+            )
+            await inter.response.edit_message(embed=embed, view=None)
+            self.stop()
+        else:
+            self.current_node = spec["next"]
+            self._rebuild_buttons_for_node(self.current_node)
+            embed = discord.Embed(
+                title=self.npc["name"],
+                description=self.npc["nodes"][self.current_node]["description"],
+                color=discord.Color.gold()
+            )
+            await inter.response.edit_message(embed=embed, view=self)
 
-                async def quest_cb(inter: discord.Interaction, qid=quest_id, _btn=btn, _opt=opt):
-                    quest_cog = inter.client.get_cog("QuestCog")
-                    if not quest_cog:
-                        return await inter.response.send_message("❌ Quest system unavailable.", ephemeral=True)
+    async def _on_quest(self, inter: discord.Interaction, qid: str) -> None:
+        quest_cog = inter.client.get_cog("QuestCog")
+        if not quest_cog:
+            return await inter.response.send_message("❌ Quest system unavailable.", ephemeral=True)
 
-                    # fresh check for turn-in
+        # fresh check for turn-in
+        try:
+            can_turn, _ = await quest_cog.can_turn_in(inter.user.id, qid)
+            if can_turn:
+                ok, msg, unlocked, rewards = await quest_cog.attempt_turnin(inter.user.id, qid, npc_id=self.npc_id)
+                if ok:
+                    # disable/remove all buttons for this quest in the view
+                    self._disable_quest_buttons(qid, completed=True)
+                    # update the message view
                     try:
-                        can_turn, _ = await quest_cog.can_turn_in(inter.user.id, qid)
-                        if can_turn:
-                            ok, msg, unlocked, rewards = await quest_cog.attempt_turnin(inter.user.id, qid, npc_id=self.npc_id)
-                            if ok:
-                                # disable/remove all buttons for this quest in the view
-                                self._disable_quest_buttons(qid, completed=True)
-                                # update the message view
-                                try:
-                                    await inter.response.edit_message(view=self)
-                                except Exception:
-                                    # if edit_message already used, fallback to followup
-                                    pass
-
-                                # build messages (rewards + unlocked)
-                                unlocked_lines = [f"🟡 New quest unlocked: '{u.get('title','Unknown')}'" for u in unlocked]
-                                reward_lines = []
-                                if rewards:
-                                    if rewards.get("gold"):
-                                        reward_lines.append(f"+{rewards['gold']} gold")
-                                    for it in rewards.get("items", []):
-                                        reward_lines.append(f"+{it['qty']}x {it['id']}")
-                                    for eq in rewards.get("equipment", []):
-                                        reward_lines.append(f"+{eq}")
-                                lines = [msg]
-                                if reward_lines:
-                                    lines.append("Rewards: " + ", ".join(reward_lines))
-                                if unlocked_lines:
-                                    lines += unlocked_lines
-                                await inter.followup.send("\n".join(lines), ephemeral=True)
-                                return
-                            else:
-                                await inter.response.send_message(msg, ephemeral=True)
-                                return
+                        await inter.response.edit_message(view=self)
                     except Exception:
-                        # if any helper fails, continue to accept flow
+                        # if edit_message already used, fallback to followup
                         pass
 
-                    # Otherwise try to accept the quest (legacy behaviour)
-                    tpl = await quest_cog.get_template(qid)
-                    quest_title = tpl.get("title", qid) if tpl else qid
-
-                    success = await quest_cog.accept_for_player(inter.user.id, qid)
-                    if success:
-                        # mark it active in view and disable all duplicate buttons immediately
-                        self._disable_quest_buttons(qid, completed=False)
-                        try:
-                            await inter.response.edit_message(view=self)
-                        except Exception:
-                            pass
-                        await inter.followup.send(f"🟢 Quest accepted: **{quest_title}**", ephemeral=True)
-                    else:
-                        await inter.response.send_message(f"⚠️ You already have or completed the quest **{quest_title}**.", ephemeral=True)
-
-                btn.callback = quest_cb
-                self.add_item(btn)
-                continue
-
-            next_node = opt.get("next")
-            if not next_node or next_node.lower() == "end":
-                btn = Button(label=label, style=discord.ButtonStyle.secondary)
-
-                async def end_cb(inter: discord.Interaction, _opt=opt, _npc_data=self.npc_data):
-                    end_node = _npc_data.get("dialogue", {}).get(_opt.get("next") or "end", {})
-                    final_text = end_node.get("text", "Farewell, traveler.")
-                    lore_text = end_node.get("lore")
-                    if lore_text:
-                        final_text += f"\n\n{lore_text}"
-
-                    embed = discord.Embed(
-                        title=_npc_data.get("name", "NPC"),
-                        description=final_text,
-                        color=discord.Color.dark_gold()
-                    )
-                    await inter.response.edit_message(embed=embed, view=None)
-                    self.stop()
-
-                btn.callback = end_cb
-                self.add_item(btn)
+                    # build messages (rewards + unlocked)
+                    unlocked_lines = [f"🟡 New quest unlocked: '{u.get('title','Unknown')}'" for u in unlocked]
+                    reward_lines = []
+                    if rewards:
+                        if rewards.get("gold"):
+                            reward_lines.append(f"+{rewards['gold']} gold")
+                        for it in rewards.get("items", []):
+                            reward_lines.append(f"+{it['qty']}x {it['id']}")
+                        for eq in rewards.get("equipment", []):
+                            reward_lines.append(f"+{eq}")
+                    lines = [msg]
+                    if reward_lines:
+                        lines.append("Rewards: " + ", ".join(reward_lines))
+                    if unlocked_lines:
+                        lines += unlocked_lines
+                    await inter.followup.send("\n".join(lines), ephemeral=True)
+                    return
+                else:
+                    await inter.response.send_message(msg, ephemeral=True)
+                    return
+        except Exception:
+            # if any helper fails, continue to accept flow
+            pass
 
-            else:
-                btn = Button(label=label, style=discord.ButtonStyle.primary)
-                async def next_cb(inter: discord.Interaction, _next=next_node):
-                    node_dict = self.npc_data.get("dialogue", {}).get(_next)
-                    if not node_dict:
-                        await inter.response.send_message("⚠️ Dialogue node missing.", ephemeral=True)
-                        return
-                    self.current_node = _next
-                    self._rebuild_buttons_for_node(_next)
-                    description = node_dict.get("text", "")
-                    lore = node_dict.get("lore")
-                    if lore:
-                        description += f"\n\n{lore}"
-                    embed = discord.Embed(
-                        title=self.npc_data.get("name", "NPC"),
-                        description=description,
-                        color=discord.Color.gold()
-                    )
-                    await inter.response.edit_message(embed=embed, view=self)
-                btn.callback = next_cb
-                self.add_item(btn)
+        # Otherwise try to accept the quest (legacy behaviour)
+        tpl = await quest_cog.get_template(qid)
+        quest_title = tpl.get("title", qid) if tpl else qid
+
+        success = await quest_cog.accept_for_player(inter.user.id, qid)
+        if success:
+            # mark it active in view and disable all duplicate buttons immediately
+            self._disable_quest_buttons(qid, completed=False)
+            try:
+                await inter.response.edit_message(view=self)
+            except Exception:
+                pass
+            await inter.followup.send(f"🟢 Quest accepted: **{quest_title}**", ephemeral=True)
+        else:
+            await inter.response.send_message(f"⚠️ You already have or completed the quest **{quest_title}**.", ephemeral=True)
 
     async def interaction_check(self, interaction: discord.Interaction) -> bool:
         return interaction.user.id == self.user_id
@@ -218,26 +304,21 @@ class NPCDialogueView(View):
 
 class TalkSelect(Select):
     def __init__(self, npcs_here: Dict[str, Dict[str, Any]], user_id: int):
-        options = [discord.SelectOption(label=data.get("name", nid), value=nid) for nid, data in npcs_here.items()]
+        options = [discord.SelectOption(label=npc["name"], value=nid) for nid, npc in npcs_here.items()]
         super().__init__(placeholder="So many options...", min_values=1, max_values=1, options=options)
         self.npcs_here = npcs_here
         self.user_id = user_id
 
     async def callback(self, interaction: discord.Interaction) -> None:
         npc_id = self.values[0]
-        npc_data = self.npcs_here.get(npc_id)
-        if not npc_data:
+        npc = self.npcs_here.get(npc_id)
+        if not npc:
             return await interaction.response.send_message("❌ NPC data missing.", ephemeral=True)
 
-        start_node_key = "start" if "start" in npc_data.get("dialogue", {}) else next(iter(npc_data.get("dialogue", {})), None)
-        node = npc_data.get("dialogue", {}).get(start_node_key, {})
-        description = node.get("text", "")
-        lore = node.get("lore")
-        if lore:
-            description += f"\n\n{lore}"
+        node = npc["nodes"][npc["start"]]
         embed = discord.Embed(
-            title=npc_data.get("name", "NPC"),
-            description=description,
+            title=npc["name"],
+            description=node["description"],
             color=discord.Color.gold()
         )
 
@@ -252,67 +333,20 @@ class TalkSelect(Select):
                 active_quests = set(pdoc.get("active_quests", {}).keys())
                 completed_quests = set(pdoc.get("completed_quests", []))
 
-                options = node.get("options", [])
-                for opt in options:
-                    if opt.get("action") == "give_quest" and "quest_id" in opt:
-                        qid = opt["quest_id"]
-                        # only check turn-in readiness for quests not yet completed
-                        if qid not in completed_quests:
-                            can_turn, _ = await quest_cog.can_turn_in(self.user_id, qid)
-                            if can_turn:
-                                ready_turnins.add(qid)
+                # only check turn-in readiness for quests not yet completed
+                pending = [qid for qid in node["quest_ids"] if qid not in completed_quests]
+                turnins = await quest_cog.can_turn_in_many(self.user_id, pending)
+                ready_turnins = {qid for qid, (can_turn, _) in turnins.items() if can_turn}
         except Exception:
             ready_turnins = set()
             active_quests = set()
             completed_quests = set()
 
-        view = NPCDialogueView(npc_id, npc_data, self.user_id, ready_turnins, active_quests, completed_quests)
+        view = NPCDialogueView(npc_id, npc, self.user_id, ready_turnins, active_quests, completed_quests)
         await interaction.response.edit_message(embed=embed, view=view)
 
-        # Quest Integration: propagate 'talk' progress & show completion/unlocked messages
-        try:
-            quest_cog = interaction.client.get_cog("QuestCog")
-            if quest_cog:
-                completed = await quest_cog.update_progress(self.user_id, "talk", npc_id, amount=1)
-
-                if completed:
-                    msg_lines = []
-                    newly_unlocked = []
-                    for comp in completed:
-                        tpl = comp.get("template", {}) or {}
-                        title = tpl.get("title", "Unknown Quest")
-                        rewards = comp.get("rewards", {}) or {}
-                        reward_lines = []
-                        if rewards:
-                            if rewards.get("gold"):
-                                reward_lines.append(f"+{rewards['gold']} gold")
-                            for it in rewards.get("items", []):
-                                reward_lines.append(f"+{it['qty']}x {it['id']}")
-                            for eq in rewards.get("equipment", []):
-                                reward_lines.append(f"+{eq}")
-                        msg_lines.append(f"✅ Quest '{title}' completed!")
-                        if reward_lines:
-                            msg_lines.append("Rewards: " + ", ".join(reward_lines))
-
-                        try:
-                            unlocked_templates = await quest_cog.get_unlocked_next_quests(self.user_id, tpl)
-                            for ut in unlocked_templates:
-                                newly_unlocked.append(f"🟡 New quest unlocked: '{ut.get('title','Unknown')}'")
-                        except Exception:
-                            next_q = tpl.get("next_quest")
-                            if next_q:
-                                try:
-                                    unlocked_tpl = await quest_cog.get_template(next_q)
-                                    if unlocked_tpl:
-                                        newly_unlocked.append(f"🟡 New quest unlocked: '{unlocked_tpl.get('title','Unknown')}'")
-                                except Exception:
-                                    continue
-
-                    if msg_lines or newly_unlocked:
-                        await interaction.followup.send("\n".join(msg_lines + newly_unlocked), ephemeral=True)
-
-        except Exception:
-            pass
+        # Quest Integration: 'talk' progress is applied by the quest cog off the event bus
+        events.emit(interaction.client, self.user_id, events.TALK, npc_id, interaction=interaction)
 
 class TalkDropdownView(View):
     def __init__(self, npcs_here: Dict[str, Dict[str, Any]], user_id: int):
@@ -328,7 +362,7 @@ class NPCCog(commands.Cog):
         db = self.bot.db
         user_id = interaction.user.id
 
-        player = await db.general.find_one({"id": user_id})
+        player = await find_player(db.general, user_id, IN_DUNGEON)
         if not player:
             return await interaction.response.send_message(
                 "❌ You need to `/register` before you can talk to NPCs!", 
@@ -341,7 +375,7 @@ class NPCCog(commands.Cog):
                 ephemeral=True
             )
 
-        area_doc = await db.areas.find_one({"id": user_id})
+        area_doc = await find_player(db.areas, user_id, CURRENT_SUBAREA)
         if not area_doc:
             return await interaction.response.send_message("❌ Can't determine your location.", ephemeral=True)
 
@@ -349,7 +383,7 @@ class NPCCog(commands.Cog):
         if not current_sub:
             return await interaction.response.send_message("❌ You are not in a valid subarea.", ephemeral=True)
 
-        npcs_here = {nid: n for nid, n in _npcs_data.items() if n.get("sub_area") == current_sub}
+        npcs_here = npcs_by_subarea.get(current_sub)
         if not npcs_here:
             return await interaction.response.send_message("ℹ️ There are no NPCs here to talk to.", ephemeral=True)
 
@@ -7,6 +7,8 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 
+from server.inventoryData import slot_capacity
+from server.playerData import ARMOR_SLOTS, INVENTORY_CAPACITY, PROFILE_CARD, SKILL_LEVELS, find_equipped, find_player
 from server.userMethods import regenerate_stamina, calculate_power_rating
 
 class ProfileCog(commands.Cog):
@@ -17,7 +19,7 @@ class ProfileCog(commands.Cog):
 
     async def get_regen_user(self, user_id: int) -> Dict | None:
         db = self.bot.db
-        user = await db.general.find_one({"id": user_id})
+        user = await find_player(db.general, user_id, PROFILE_CARD)
         if not user:
             return None
 
@@ -27,7 +29,7 @@ class ProfileCog(commands.Cog):
     async def _get_weapon_stats(self, user_id: int) -> Dict[str, float]:
         """Returns equipped weapon STR/EVA/CRITPER/SKILL bonuses."""
         db = self.bot.db
-        equip_doc = await db.equipment.find_one({"id": user_id}) or {}
+        equip_doc = await find_equipped(db, user_id, ("mainHand",)) or {}
         mainhand_iid = equip_doc.get("mainHand") or equip_doc.get("mainhand")
         weapon_stats = {}
         if mainhand_iid:
@@ -40,7 +42,7 @@ class ProfileCog(commands.Cog):
     async def _get_armor_bonuses(self, user_id: int) -> Dict[str, int]:
         """Returns total bonuses from all equipped armor pieces."""
         db = self.bot.db
-        equip_doc = await db.equipment.find_one({"id": user_id}) or {}
+        equip_doc = await find_equipped(db, user_id, ARMOR_SLOTS) or {}
         
         armor_bonuses = {
             "HP": 0,
@@ -66,7 +68,7 @@ class ProfileCog(commands.Cog):
     async def _get_set_bonuses(self, user_id: int) -> Dict[str, int]:
         """Returns set bonuses from equipped armor sets."""
         db = self.bot.db
-        equip_doc = await db.equipment.find_one({"id": user_id}) or {}
+        equip_doc = await find_equipped(db, user_id, ARMOR_SLOTS) or {}
         
         # Load set bonuses configuration
         _SET_BONUSES_PATH = Path("data/setBonuses.json")
@@ -120,7 +122,7 @@ class ProfileCog(commands.Cog):
 
         # Fetch data
         gen = await self.get_regen_user(user_id)
-        skl = await db.skills.find_one({"id": user_id})
+        skl = await find_player(db.skills, user_id, SKILL_LEVELS)
         if not gen or not skl:
             return await interaction.response.send_message(
                 "❌ You need to `/register` first.", ephemeral=True
@@ -151,7 +153,7 @@ class ProfileCog(commands.Cog):
 
         wallet = gen.get("wallet", 0)
         stamina = gen.get("stamina", 0)
-        max_inv = gen.get("maxInventory", 200)
+        max_inv = slot_capacity(await find_player(db.inventory, user_id, INVENTORY_CAPACITY))
 
         # Combat Stats
         hp = gen.get("hp", 100)
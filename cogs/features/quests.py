@@ -2,15 +2,37 @@
 import json
 import random
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 
 import discord
 from discord import app_commands
 from discord.ext import commands
 
+from server import autocomplete, events
+from server.inventoryData import change_items
+from server.playerData import CURRENT_SUBAREA, REGISTERED, find_player
+
 _QUESTS_PATH = Path("data/quests/quests.json")
 _AREAS_PATH = Path("data/areas.json")
 
+# Event bus kinds -> the quest objective types they progress
+EVENT_OBJECTIVE_TYPES: Dict[str, Tuple[str, ...]] = {
+    events.GATHER: ("collect",),
+    events.CRAFT: ("craft",),
+    events.KILL: ("defeat", "kill"),
+    events.TRAVEL: ("explore",),
+    events.TALK: ("talk",),
+    events.DUNGEON_CLEAR: ("dungeon",),
+}
+
+
+def _reward_item_deltas(rewards: Dict[str, Any]) -> Dict[str, int]:
+    """Inventory changes for a quest's item rewards (one of each listed item)."""
+    deltas: Dict[str, int] = {}
+    for it in (rewards or {}).get("items", []):
+        deltas[it] = deltas.get(it, 0) + 1
+    return deltas
+
 
 def _titleize_key(key: str) -> str:
     return key.replace("_", " ").title()
@@ -42,6 +64,124 @@ def _humanize_objective(obj: Dict[str, Any], cur: int, amount: int) -> str:
     return f"• {text} — {cur}/{amount}"
 
 
+def _objective_key(obj: Dict[str, Any]) -> str:
+    return f"{obj['type']}:{obj['target']}"
+
+
+def _needs_sub_area(tpl: Dict[str, Any], obj: Dict[str, Any]) -> bool:
+    """
+    Objectives of a quest tied to a sub-area only count while the player stands there.
+    Explore is the exception: its target is the place itself, and /travel emits it for
+    every sub-area on the route, not only the destination the player ends up in.
+    """
+    return bool(tpl.get("sub_area")) and obj["type"] != "explore"
+
+
+def _as_list(value: Any) -> List[str]:
+    if not value:
+        return []
+    return list(value) if isinstance(value, list) else [value]
+
+
+class QuestGraph:
+    """
+    Quest templates compiled into a prerequisite DAG.
+
+    Each quest gets a bit; a player's completed quests become one int mask, so
+    "are the prereqs met" is a single AND. Reverse edges (quest -> quests it helps
+    unlock) let /quests look up candidates instead of scanning every template.
+    """
+
+    def __init__(self, templates: Dict[str, Dict[str, Any]], areas: Dict[str, Any]) -> None:
+        self.templates = templates
+        self.bit: Dict[str, int] = {qid: 1 << i for i, qid in enumerate(templates)}
+        # position in the quests file, so lookups can hand results back in file order
+        self.order: Dict[str, int] = {qid: i for i, qid in enumerate(templates)}
+        self.prereqs: Dict[str, List[str]] = {}
+        self.next_quests: Dict[str, List[str]] = {}
+        self.prereq_mask: Dict[str, int] = {}
+        self.unlocks: Dict[str, List[str]] = {qid: [] for qid in templates}
+        self.roots: List[str] = []
+        self.sub_area_names: Dict[str, str] = {}
+
+        for area_val in areas.values():
+            for sub_key, sub in area_val.get("sub_areas", {}).items():
+                self.sub_area_names.setdefault(sub_key, sub.get("name") or _titleize_key(sub_key))
+
+        for qid, tpl in templates.items():
+            prereqs = _as_list(tpl.get("prereqs"))
+            next_ids = _as_list(tpl.get("next_quests")) or _as_list(tpl.get("next_quest"))
+            for ref in prereqs + next_ids:
+                if ref not in templates:
+                    raise ValueError(f"Quest {qid!r} references unknown quest {ref!r}")
+            self.prereqs[qid] = prereqs
+            self.next_quests[qid] = next_ids
+            mask = 0
+            for p in prereqs:
+                mask |= self.bit[p]
+                self.unlocks[p].append(qid)
+            self.prereq_mask[qid] = mask
+            if not prereqs:
+                self.roots.append(qid)
+
+        self._check_acyclic()
+
+    def _check_acyclic(self) -> None:
+        # iterative DFS over prereq edges; a grey node seen again closes a cycle
+        state: Dict[str, int] = {}
+        for start in self.templates:
+            if start in state:
+                continue
+            stack = [(start, iter(self.prereqs[start]))]
+            path = [start]
+            state[start] = 1
+            while stack:
+                node, it = stack[-1]
+                nxt = next(it, None)
+                if nxt is None:
+                    state[node] = 2
+                    stack.pop()
+                    path.pop()
+                elif state.get(nxt) == 1:
+                    cycle = path[path.index(nxt):] + [nxt]
+                    raise ValueError("Quest prerequisite cycle: " + " -> ".join(cycle))
+                elif nxt not in state:
+                    state[nxt] = 1
+                    stack.append((nxt, iter(self.prereqs[nxt])))
+                    path.append(nxt)
+
+    def mask_of(self, quest_ids: Any) -> int:
+        mask = 0
+        for qid in quest_ids:
+            mask |= self.bit.get(qid, 0)
+        return mask
+
+    def prereqs_met(self, quest_id: str, completed_mask: int) -> bool:
+        need = self.prereq_mask.get(quest_id, 0)
+        return need & completed_mask == need
+
+    def available(self, completed: Any, active: Any) -> List[str]:
+        """Quests a player could pick up now, in file order."""
+        done = self.mask_of(completed)
+        taken = done | self.mask_of(active)
+        # only roots and quests unlocked by something completed can possibly be available
+        candidates = set(self.roots)
+        for qid in completed:
+            candidates.update(self.unlocks.get(qid, ()))
+        available = [
+            qid for qid in candidates
+            if not self.bit[qid] & taken
+            and not self.templates[qid].get("npc_given", False)
+            and self.prereqs_met(qid, done)
+        ]
+        return sorted(available, key=self.order.__getitem__)
+
+    def sub_area_name(self, sub_key: Optional[str]) -> str:
+        if not sub_key:
+            return "Various"
+        return self.sub_area_names.get(sub_key) or _titleize_key(sub_key)
+
+
 class QuestCog(commands.Cog):
     """Quest templates (from JSON) + per-player quest storage in db.quests + update API."""
 
@@ -56,6 +196,18 @@ class QuestCog(commands.Cog):
         else:
             self._file_cache = {}
 
+        # (type, target) -> [(quest_id, objective)] for every progressable objective,
+        # so a progress event only looks at quests that can actually match it.
+        self._objective_index: Dict[Tuple[str, str], List[Tuple[str, Dict[str, Any]]]] = {}
+        # quest_id -> fetch objectives, checked against inventory at turn-in
+        self._fetch_objectives: Dict[str, List[Dict[str, Any]]] = {}
+        for qid, tpl in self._file_cache.items():
+            for o in tpl.get("objectives", []):
+                if o["type"] == "fetch":
+                    self._fetch_objectives.setdefault(qid, []).append(o)
+                    continue
+                self._objective_index.setdefault((o["type"], o["target"]), []).append((qid, o))
+
         self._areas_cache: Dict[str, Any] = {}
         if _AREAS_PATH.exists():
             try:
@@ -64,6 +216,12 @@ class QuestCog(commands.Cog):
             except Exception:
                 self._areas_cache = {}
 
+        self.graph = QuestGraph(self._file_cache, self._areas_cache)
+        self._quest_trie = autocomplete.build_choice_trie([
+            ((qid, tpl.get("title", "")), autocomplete.choice(tpl.get("title") or qid, qid))
+            for qid, tpl in self._file_cache.items()
+        ])
+
     async def get_template(self, quest_id: str) -> Optional[Dict[str, Any]]:
         return self._file_cache.get(quest_id)
 
@@ -88,43 +246,16 @@ class QuestCog(commands.Cog):
         return list(completed)
 
     async def get_unlocked_next_quests(self, user_id: int, tpl_or_id: Any) -> List[Dict[str, Any]]:
-        tpl: Optional[Dict[str, Any]] = None
-        if isinstance(tpl_or_id, str):
-            tpl = await self.get_template(tpl_or_id)
-        elif isinstance(tpl_or_id, dict):
-            tpl = tpl_or_id
-        if not tpl:
-            return []
-
-        next_ids: List[str] = []
-        if tpl.get("next_quests"):
-            if isinstance(tpl.get("next_quests"), list):
-                next_ids = tpl.get("next_quests")
-            else:
-                next_ids = [tpl.get("next_quests")]
-        elif tpl.get("next_quest"):
-            next_ids = [tpl.get("next_quest")]
-
+        if isinstance(tpl_or_id, dict):
+            qid = tpl_or_id.get("quest_id")
+        else:
+            qid = tpl_or_id
+        next_ids = self.graph.next_quests.get(qid, [])
         if not next_ids:
             return []
 
-        completed = set(await self.get_completed_quest_ids(user_id))
-
-        unlocked: List[Dict[str, Any]] = []
-        for nid in next_ids:
-            try:
-                cand = await self.get_template(nid)
-                if not cand:
-                    continue
-                prereqs = cand.get("prereqs", []) or []
-                if not isinstance(prereqs, list):
-                    prereqs = [prereqs]
-                if all(p in completed for p in prereqs):
-                    unlocked.append(cand)
-            except Exception:
-                continue
-
-        return unlocked
+        done = self.graph.mask_of(await self.get_completed_quest_ids(user_id))
+        return [self._file_cache[nid] for nid in next_ids if self.graph.prereqs_met(nid, done)]
 
     @app_commands.command(name="quests", description="Show available & active quests.")
     async def quests(self, interaction: discord.Interaction) -> None:
@@ -138,7 +269,7 @@ class QuestCog(commands.Cog):
         embed = discord.Embed(title="📜 Quests", color=discord.Color.blurple())
 
         db = self.bot.db
-        player = await db.general.find_one({"id": user_id})
+        player = await find_player(db.general, user_id, REGISTERED)
         if not player:
             return await interaction.response.send_message(
                 "❌ You need to `/register` before you can do this.", 
@@ -146,6 +277,7 @@ class QuestCog(commands.Cog):
             )
 
         if active:
+            turnins = await self.can_turn_in_many(user_id, active.keys())
             for qid, pdata in active.items():
                 tpl = await self.get_template(qid)
                 if not tpl:
@@ -154,14 +286,19 @@ class QuestCog(commands.Cog):
 
                 objs = tpl.get("objectives", [])
                 prog = pdata.get("objectives", {})
+                ready, fetch_details = turnins[qid]
+                have = {d["target"]: d["have"] for d in fetch_details}
                 lines: List[str] = []
                 for o in objs:
-                    key = f"{o['type']}:{o['target']}"
-                    cur = prog.get(key, 0)
+                    if o["type"] == "fetch":
+                        cur = min(have.get(o["target"], 0), o["amount"])
+                    else:
+                        cur = min(prog.get(_objective_key(o), 0), o["amount"])
                     lines.append(_humanize_objective(o, cur, o["amount"]))
 
                 value_text = "\n".join(lines) if lines else "No objectives listed."
-                embed.add_field(name=f"🟢 {tpl.get('title')}", value=value_text, inline=False)
+                name = f"🟢 {tpl.get('title')}" + (" — ready to turn in" if ready else "")
+                embed.add_field(name=name, value=value_text, inline=False)
         else:
             embed.add_field(name="🟢 Active", value="None", inline=False)
 
@@ -176,28 +313,10 @@ class QuestCog(commands.Cog):
         else:
             embed.add_field(name="✅ Completed Quests", value="None", inline=False)
 
-        templates = await self.list_templates()
         avail_lines: List[str] = []
-        for tpl in templates:
-            qid = tpl["quest_id"]
-            if qid in completed or qid in active:
-                continue
-            if tpl.get("npc_given", False):
-                continue
-            prereqs = set(tpl.get("prereqs", []))
-            if prereqs - completed:
-                continue
-            sub = tpl.get("sub_area")
-            if sub:
-                found_name = None
-                for area_key, area_val in self._areas_cache.items():
-                    sa = area_val.get("sub_areas", {})
-                    if sub in sa:
-                        found_name = sa[sub].get("name") or _titleize_key(sub)
-                        break
-                display_sub = found_name or _titleize_key(sub)
-            else:
-                display_sub = "Various"
+        for qid in self.graph.available(completed, active):
+            tpl = self._file_cache[qid]
+            display_sub = self.graph.sub_area_name(tpl.get("sub_area"))
             avail_lines.append(f"**{tpl['title']}** — Subarea: {display_sub} (id: `{qid}`)")
 
         embed.add_field(name="🟡 Available Quests", value="\n".join(avail_lines) if avail_lines else "None", inline=False)
@@ -211,7 +330,7 @@ class QuestCog(commands.Cog):
         user_id = interaction.user.id
 
         db = self.bot.db
-        player = await db.general.find_one({"id": user_id})
+        player = await find_player(db.general, user_id, REGISTERED)
         if not player:
             return await interaction.response.send_message(
                 "❌ You need to `/register` before you can do this.", 
@@ -226,18 +345,23 @@ class QuestCog(commands.Cog):
         if quest_id in pdoc.get("active_quests", {}) or quest_id in pdoc.get("completed_quests", []):
             return await interaction.followup.send("ℹ️ You already have or completed this quest.", ephemeral=True)
 
-        prereqs = set(tpl.get("prereqs", []))
-        if prereqs - set(pdoc.get("completed_quests", [])):
+        if not self.graph.prereqs_met(quest_id, self.graph.mask_of(pdoc.get("completed_quests", []))):
             return await interaction.followup.send("⚠️ You don't meet quest prerequisites.", ephemeral=True)
 
         prog_map: Dict[str, int] = {}
         for o in tpl.get("objectives", []):
-            prog_map[f"{o['type']}:{o['target']}"] = 0
+            prog_map[_objective_key(o)] = 0
 
         pdoc["active_quests"][quest_id] = {"objectives": prog_map, "status": "active"}
         await self.save_player_doc(pdoc)
         await interaction.followup.send(f"✅ Quest **'{tpl['title']}'** accepted.", ephemeral=True)
 
+    @quest_accept.autocomplete("quest_id")
+    async def quest_accept_autocomplete(
+        self, interaction: discord.Interaction, current: str
+    ) -> List[app_commands.Choice[str]]:
+        return self._quest_trie.complete(current)
+
     async def accept_for_player(self, user_id: int, quest_id: str) -> bool:
         tpl = await self.get_template(quest_id)
         if not tpl:
@@ -245,90 +369,164 @@ class QuestCog(commands.Cog):
         pdoc = await self.get_player_doc(user_id)
         if quest_id in pdoc.get("active_quests", {}) or quest_id in pdoc.get("completed_quests", []):
             return False
-        prereqs = set(tpl.get("prereqs", []))
-        if prereqs - set(pdoc.get("completed_quests", [])):
+        if not self.graph.prereqs_met(quest_id, self.graph.mask_of(pdoc.get("completed_quests", []))):
             return False
         prog_map: Dict[str, int] = {}
         for o in tpl.get("objectives", []):
-            prog_map[f"{o['type']}:{o['target']}"] = 0
+            prog_map[_objective_key(o)] = 0
         pdoc["active_quests"][quest_id] = {"objectives": prog_map, "status": "active"}
         await self.save_player_doc(pdoc)
         return True
 
     async def update_progress(self, user_id: int, objective_type: str, target: str, amount: int = 1) -> List[Dict[str, Any]]:
+        return await self.update_progress_many(user_id, {(objective_type, target): amount})
+
+    async def update_progress_many(self, user_id: int, progress: Dict[Tuple[str, str], int]) -> List[Dict[str, Any]]:
+        """Apply several {(objective_type, target): amount} increments; one atomic $inc per touched quest."""
+        candidates: List[Tuple[str, Dict[str, Any], int]] = []
+        for obj_key, amount in progress.items():
+            for qid, o in self._objective_index.get(obj_key, ()):
+                candidates.append((qid, o, amount))
+        if not candidates:
+            return []
+
         db = self.bot.db
-        pdoc = await self.get_player_doc(user_id)
-        active = pdoc.get("active_quests", {})
-        if not active:
+        candidate_ids = {qid for qid, _, _ in candidates}
+        projection = {f"active_quests.{qid}": 1 for qid in candidate_ids}
+        pdoc = await db.quests.find_one({"id": user_id}, projection)
+        active = (pdoc or {}).get("active_quests", {})
+        matches = [(qid, o, amount) for qid, o, amount in candidates if qid in active]
+        if not matches:
             return []
 
-        area_doc = await db.areas.find_one({"id": user_id}) or {}
-        current_sub = area_doc.get("currentSubarea")
+        current_sub = None
+        if any(_needs_sub_area(self._file_cache[qid], o) for qid, o, _ in matches):
+            area_doc = await find_player(db.areas, user_id, CURRENT_SUBAREA) or {}
+            current_sub = area_doc.get("currentSubarea")
+
+        # {qid: {objective key: increment}}; a counter the earlier read already shows as done is skipped
+        increments: Dict[str, Dict[str, int]] = {}
+        for qid, o, amount in matches:
+            if _needs_sub_area(self._file_cache[qid], o) and current_sub != self._file_cache[qid]["sub_area"]:
+                continue
+            key = _objective_key(o)
+            if active[qid].get("objectives", {}).get(key, 0) >= o["amount"]:
+                continue
+            quest_incs = increments.setdefault(qid, {})
+            quest_incs[key] = quest_incs.get(key, 0) + amount
 
         completions: List[Dict[str, Any]] = []
-        changed = False
+        for qid, quest_incs in increments.items():
+            # $inc so concurrent batches add up; counters may overshoot and are capped when shown.
+            # The filter keeps a quest completed or abandoned meanwhile from being recreated.
+            active_filter = {"id": user_id, f"active_quests.{qid}": {"$exists": True}}
+            doc = await db.quests.find_one_and_update(
+                active_filter,
+                {"$inc": {f"active_quests.{qid}.objectives.{key}": n for key, n in quest_incs.items()}},
+                projection={f"active_quests.{qid}.objectives": 1},
+                return_document=True
+            )
+            if not doc:
+                continue
+            tpl = self._file_cache[qid]
+            progress = doc.get("active_quests", {}).get(qid, {}).get("objectives", {})
+            if not all(progress.get(_objective_key(o2), 0) >= o2["amount"] for o2 in tpl.get("objectives", [])):
+                continue
 
-        for qid, qstate in list(active.items()):
-            tpl = await self.get_template(qid)
-            if not tpl:
+            # only the write that actually moves the quest to completed_quests grants its rewards
+            result = await db.quests.update_one(active_filter, {
+                "$unset": {f"active_quests.{qid}": ""},
+                "$push": {"completed_quests": qid}
+            })
+            if result.modified_count != 1:
                 continue
-            required_sub = tpl.get("sub_area")
-            if required_sub:
-                if current_sub != required_sub:
-                    continue
+            rewards_given = await self._grant_rewards(user_id, tpl.get("rewards", {}))
+            completions.append({"quest_id": qid, "template": tpl, "rewards": rewards_given})
 
-            for o in tpl.get("objectives", []):
-                if o["type"] == "fetch":
-                    continue
-                if o["type"] != objective_type:
-                    continue
-                if o["target"] != target:
-                    continue
-                key = f"{o['type']}:{o['target']}"
-                cur = qstate["objectives"].get(key, 0)
-                new = min(o["amount"], cur + amount)
-                if new != cur:
-                    qstate["objectives"][key] = new
-                    changed = True
-
-            all_done = True
-            for o2 in tpl.get("objectives", []):
-                k2 = f"{o2['type']}:{o2['target']}"
-                if qstate["objectives"].get(k2, 0) < o2["amount"]:
-                    all_done = False
-                    break
-            if all_done:
-                pdoc.setdefault("completed_quests", []).append(qid)
-                pdoc["active_quests"].pop(qid, None)
-                changed = True
-                rewards_given = await self._grant_rewards(user_id, tpl.get("rewards", {}))
-                completions.append({"quest_id": qid, "template": tpl, "rewards": rewards_given})
-
-        if changed:
-            await self.save_player_doc(pdoc)
         return completions
 
+    async def format_completions(self, user_id: int, completions: List[Dict[str, Any]]) -> str:
+        """Player-facing summary of completed quests, their rewards and the quests they unlock."""
+        msg_lines: List[str] = []
+        newly_unlocked: List[str] = []
+        for comp in completions:
+            tpl = comp.get("template", {}) or {}
+            title = tpl.get("title", comp.get("quest_id", "Unknown Quest"))
+            rewards = comp.get("rewards", {}) or {}
+            reward_lines = []
+            if rewards.get("gold"):
+                reward_lines.append(f"+{rewards['gold']} gold")
+            for it in rewards.get("items", []):
+                reward_lines.append(f"+{it['qty']}x {it['id']}")
+            for eq in rewards.get("equipment", []):
+                reward_lines.append(f"+{eq}")
+            msg_lines.append(f"✅ Quest '{title}' completed!")
+            if reward_lines:
+                msg_lines.append("Rewards: " + ", ".join(reward_lines))
+            if rewards.get("inventory_full"):
+                msg_lines.append("🎒 Your inventory was full, so the item rewards couldn't be added.")
+
+            for ut in await self.get_unlocked_next_quests(user_id, tpl):
+                newly_unlocked.append(f"🟡 New quest unlocked: '{ut.get('title', 'Unknown')}'")
+        return "\n".join(msg_lines + newly_unlocked)
+
+    # --- Event bus subscriber ---
+    async def cog_load(self) -> None:
+        bus = getattr(self.bot, "events", None)
+        if bus is not None:
+            bus.subscribe(self.on_game_events)
+
+    async def cog_unload(self) -> None:
+        bus = getattr(self.bot, "events", None)
+        if bus is not None:
+            bus.unsubscribe(self.on_game_events)
+
+    async def on_game_events(self, user_id: int, counts: Dict[Tuple[str, str], int], interaction: Optional[discord.Interaction]) -> None:
+        progress: Dict[Tuple[str, str], int] = {}
+        for (kind, target), amount in counts.items():
+            for obj_type in EVENT_OBJECTIVE_TYPES.get(kind, ()):
+                key = (obj_type, target)
+                progress[key] = progress.get(key, 0) + amount
+
+        completions = await self.update_progress_many(user_id, progress)
+        if completions and interaction is not None:
+            text = await self.format_completions(user_id, completions)
+            try:
+                await interaction.followup.send(text, ephemeral=True)
+            except discord.HTTPException:
+                # interaction token expired; rewards are already granted
+                pass
+
     async def can_turn_in(self, user_id: int, quest_id: str) -> Tuple[bool, List[Dict[str, Any]]]:
-        db = self.bot.db
-        tpl = await self.get_template(quest_id)
-        if not tpl:
-            return False, []
-
-        fetch_objs = [o for o in tpl.get("objectives", []) if o.get("type") == "fetch"]
-        if not fetch_objs:
-            return False, []
-
-        inv_doc = await db.inventory.find_one({"id": user_id}) or {}
-        details: List[Dict[str, Any]] = []
-        can = True
-        for o in fetch_objs:
-            item = o["target"]
-            need = int(o["amount"])
-            have = int(inv_doc.get(item, 0) or 0)
-            details.append({"target": item, "need": need, "have": have})
-            if have < need:
-                can = False
-        return can, details
+        return (await self.can_turn_in_many(user_id, [quest_id]))[quest_id]
+
+    async def can_turn_in_many(self, user_id: int, quest_ids: Iterable[str]) -> Dict[str, Tuple[bool, List[Dict[str, Any]]]]:
+        """Turn-in readiness for several quests from a single projected inventory read."""
+        results: Dict[str, Tuple[bool, List[Dict[str, Any]]]] = {}
+        needed: Set[str] = set()
+        for qid in quest_ids:
+            results[qid] = (False, [])
+            for o in self._fetch_objectives.get(qid, ()):
+                needed.add(o["target"])
+        if not needed:
+            return results
+
+        inv_doc = await self.bot.db.inventory.find_one({"id": user_id}, {item: 1 for item in needed}) or {}
+        for qid in results:
+            fetch_objs = self._fetch_objectives.get(qid)
+            if not fetch_objs:
+                continue
+            details: List[Dict[str, Any]] = []
+            can = True
+            for o in fetch_objs:
+                item = o["target"]
+                need = int(o["amount"])
+                have = int(inv_doc.get(item, 0) or 0)
+                details.append({"target": item, "need": need, "have": have})
+                if have < need:
+                    can = False
+            results[qid] = (can, details)
+        return results
 
     async def attempt_turnin(self, user_id: int, quest_id: str, npc_id: Optional[str] = None) -> Tuple[bool, str, List[Dict[str, Any]], Dict[str, Any]]:
         db = self.bot.db
@@ -345,19 +543,20 @@ class QuestCog(commands.Cog):
             missing = [f"{d['target']} (need {d['need']}, have {d['have']})" for d in details if d['have'] < d['need']]
             return False, "You are missing: " + ", ".join(missing), [], {}
 
-        inv_updates: Dict[str, int] = {}
+        # turn-in items out and reward items in, as one slot-checked write
+        inv_updates: Dict[str, int] = _reward_item_deltas(tpl.get("rewards", {}))
         for d in details:
             item = d["target"]
             need = d["need"]
             inv_updates[item] = inv_updates.get(item, 0) - need
 
-        for item, delta in inv_updates.items():
-            await db.inventory.update_one({"id": user_id}, {"$inc": {item: delta}}, upsert=True)
+        if not await change_items(db, user_id, inv_updates):
+            return False, "🎒 Your inventory is full. Free up a slot to receive this quest's rewards.", [], {}
 
         pdoc.setdefault("completed_quests", []).append(quest_id)
         pdoc["active_quests"].pop(quest_id, None)
 
-        rewards_given = await self._grant_rewards(user_id, tpl.get("rewards", {}))
+        rewards_given = await self._grant_rewards(user_id, tpl.get("rewards", {}), items_applied=True)
         await self.save_player_doc(pdoc)
 
         unlocked_templates = await self.get_unlocked_next_quests(user_id, tpl)
@@ -366,7 +565,8 @@ class QuestCog(commands.Cog):
         msg = f"✅ Quest **'{title}'** turned in."
         return True, msg, unlocked_templates, rewards_given
 
-    async def _grant_rewards(self, user_id: int, rewards: Dict[str, Any]) -> Dict[str, Any]:
+    async def _grant_rewards(self, user_id: int, rewards: Dict[str, Any], items_applied: bool = False) -> Dict[str, Any]:
+        """Grant gold/items; `items_applied` means the caller already wrote the item counts."""
         db = self.bot.db
         result: Dict[str, Any] = {"gold": 0, "items": [], "equipment": []}
         if not rewards:
@@ -382,9 +582,10 @@ class QuestCog(commands.Cog):
             result["gold"] = amt
 
         if "items" in rewards:
-            for it in rewards["items"]:
-                await db.inventory.update_one({"id": user_id}, {"$inc": {it: 1}}, upsert=True)
-                result["items"].append({"id": it, "qty": 1})
+            if items_applied or await change_items(db, user_id, _reward_item_deltas(rewards)):
+                result["items"] = [{"id": it, "qty": 1} for it in rewards["items"]]
+            else:
+                result["inventory_full"] = True
 
         if "equipment" in rewards:
             for eq in rewards["equipment"]:
@@ -4,6 +4,8 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 
+from server import autocomplete
+
 class Remove(commands.Cog):
     """Command to delete all data for a specific user across all collections."""
 
@@ -22,6 +24,7 @@ class Remove(commands.Cog):
             self.db.recipes,
             self.db.areas,
             self.db.equipment,
+            self.db.stash,
             self.db.quests
         ]
 
@@ -43,6 +46,7 @@ class Remove(commands.Cog):
         for coll in self.collections_to_clear:
             result = await coll.delete_many({"id": int(user_id)})
             deleted_counts[coll.name] = result.deleted_count  # Motor collections have a .name attribute
+        autocomplete.invalidate_player(int(user_id))
 
         summary = "\n".join(f"**{name}**: {count} document(s) deleted"
                             for name, count in deleted_counts.items())
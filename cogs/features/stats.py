@@ -0,0 +1,114 @@
+# stats.py
+from __future__ import annotations
+import datetime
+from pathlib import Path
+from typing import Optional
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+from server.profiler import StackSampler
+from settings import PROFILE_DIR
+
+# Embeds hold at most 25 fields; one is kept for background DB traffic
+MAX_COMMAND_FIELDS = 24
+
+MAX_PROFILE_SECONDS = 300
+TOP_PROFILE_TAGS = 10
+
+
+class StatsCog(commands.Cog):
+    """Admin diagnostics: per-command latency and Mongo usage, and the sampling profiler."""
+
+    def __init__(self, bot: commands.Bot) -> None:
+        self.bot = bot
+        self.sampler: Optional[StackSampler] = None
+
+    @app_commands.command(
+        name="stats",
+        description="Show per-command latency percentiles and database usage since startup."
+    )
+    async def stats(self, interaction: discord.Interaction) -> None:
+        if not interaction.user.guild_permissions.administrator:
+            await interaction.response.send_message(
+                "❌ You must be an administrator to use this command.", ephemeral=True
+            )
+            return
+
+        metrics = self.bot.metrics  # type: ignore[attr-defined]
+        snapshot = metrics.snapshot()
+        busiest = sorted(snapshot.items(), key=lambda kv: kv[1]["count"], reverse=True)[:MAX_COMMAND_FIELDS]
+
+        embed = discord.Embed(
+            title="📊 Command Stats",
+            description=None if busiest else "*No commands recorded yet.*",
+            color=discord.Color.blurple(),
+            timestamp=datetime.datetime.utcnow()
+        )
+        for name, s in busiest:
+            errors = f" • {s['errors']} failed" if s["errors"] else ""
+            embed.add_field(
+                name=f"/{name} — {s['count']:,} run(s){errors}",
+                value=(
+                    f"p50 `{s['p50_ms']} ms` • p95 `{s['p95_ms']} ms` • p99 `{s['p99_ms']} ms`\n"
+                    f"per run: `{s['db_ops']}` DB ops, `{s['db_kb']} KB`, "
+                    f"DB `{s['db_ms']} ms` / other `{s['other_ms']} ms`"
+                ),
+                inline=False
+            )
+
+        background = metrics.background
+        embed.add_field(
+            name="Outside commands",
+            value=f"`{background.db_ops:,}` DB ops, `{background.db_bytes / 1024:,.1f} KB`, "
+                  f"`{background.db_seconds * 1000:,.0f} ms` in DB",
+            inline=False
+        )
+        embed.set_footer(text="Starfall RPG • stats • other = Python + Discord API time")
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    @app_commands.command(
+        name="profile_bot",
+        description="Sample the bot's stacks for a while and upload collapsed stacks for a flame graph."
+    )
+    @app_commands.describe(seconds=f"How long to sample (1-{MAX_PROFILE_SECONDS}, default 30)")
+    async def profile_bot(
+        self,
+        interaction: discord.Interaction,
+        seconds: app_commands.Range[int, 1, MAX_PROFILE_SECONDS] = 30
+    ) -> None:
+        if not interaction.user.guild_permissions.administrator:
+            await interaction.response.send_message(
+                "❌ You must be an administrator to use this command.", ephemeral=True
+            )
+            return
+        if self.sampler is not None:
+            await interaction.response.send_message("⏳ A profile is already being taken.", ephemeral=True)
+            return
+
+        await interaction.response.defer(thinking=True, ephemeral=True)
+        self.sampler = StackSampler(metrics=self.bot.metrics)  # type: ignore[attr-defined]
+        try:
+            await self.sampler.run_for(seconds)
+            path = self.sampler.write(Path(PROFILE_DIR))
+            by_tag = self.sampler.by_tag()
+            mode = self.sampler.mode
+        finally:
+            self.sampler = None
+
+        total = sum(by_tag.values())
+        lines = [f"`{count:>6,}` {count / total:6.1%}  {tag}" for tag, count in by_tag.most_common(TOP_PROFILE_TAGS)]
+        if not lines:
+            await interaction.followup.send(f"🔥 Profiled {seconds}s: no samples (the bot was idle).", ephemeral=True)
+            return
+        await interaction.followup.send(
+            f"🔥 Profiled {seconds}s ({mode} sampling, {total:,} samples) → `{path}`\n" + "\n".join(lines),
+            file=discord.File(path),
+            ephemeral=True
+        )
+
+
+async def setup(bot: commands.Bot) -> None:
+    from settings import GUILD_ID
+    await bot.add_cog(StatsCog(bot), guilds=[discord.Object(id=GUILD_ID)])
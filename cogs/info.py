@@ -9,6 +9,8 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 
+from server.playerData import REGISTERED, find_player
+
 START_TIME = datetime.datetime.utcnow()
 
 def count_lines(directory: Path) -> int:
@@ -37,7 +39,7 @@ class InfoCog(commands.Cog):
         # Only allow registered users
         db = self.bot.db  # type: ignore[attr-defined]
         user_id = interaction.user.id
-        profile = await db.general.find_one({"id": user_id})
+        profile = await find_player(db.general, user_id, REGISTERED)
         if not profile:
             return await interaction.response.send_message(
                 "❌ Please `/register` before using this command.",
@@ -3,10 +3,9 @@ import time
 from typing import Optional, Dict, Any
 import json
 
-import string
 import datetime
 
-import discord, random
+import discord
 from discord import app_commands
 from discord.ext import commands
 from discord.ui import Button, Modal, TextInput, View
@@ -14,22 +13,13 @@ from discord.ui import Button, Modal, TextInput, View
 from pathlib import Path
 
 from database import Database
+from server import autocomplete
+from server.instances import INSTANCE_SEQ_FIELD, encode_instance_id
+from server.inventoryData import DEFAULT_MAX_SLOTS, MAX_SLOTS_FIELD, USED_SLOTS_FIELD
+from server.playerData import REGISTERED, find_player
 from settings import GUILD_ID
 
 
-_CHARSET = string.ascii_uppercase + string.digits  # A-Z + 0-9
-_ID_LENGTH = 5
-
-def _make_instance_id(existing_ids: set[str] | None = None) -> str:
-    """
-    Generate a 5-character ID from A-Z0-9 that does not collide with existing_ids (if provided).
-    """
-    existing = existing_ids or set()
-    while True:
-        candidate = ''.join(random.choices(_CHARSET, k=_ID_LENGTH))
-        if candidate not in existing:
-            return candidate
-
 ## Starter Equipment Templates
 _starters = {
     "fishingTool": "Wooden Fishing Rod",
@@ -121,7 +111,7 @@ class RegisterCog(commands.Cog):
         db = self.bot.db
 
         # Step 1: refuse if already registered
-        existing = await db.general.find_one({"id": user_id})
+        existing = await find_player(db.general, user_id, REGISTERED)
         if existing:
             return await interaction.response.send_message(
                 "You already have an account! If this is an error, contact the dev.",
@@ -148,12 +138,11 @@ class RegisterCog(commands.Cog):
 
             # Step 3: seed all collections
             now = time.time()
-            await db.inventory.insert_one({"id": user_id})
+            await db.inventory.insert_one({"id": user_id, USED_SLOTS_FIELD: 0, MAX_SLOTS_FIELD: DEFAULT_MAX_SLOTS})
             await db.general.insert_one({
                 "id": user_id,
                 "name": interaction.user.display_name,
                 "bio": "",
-                "maxInventory": 200,
                 "maxStamina": 200,
                 "lastStaminaUpdate": now,
                 "maxHP": 100,
@@ -208,12 +197,10 @@ class RegisterCog(commands.Cog):
             ## SETUP THE EQUIPPED TOOLS AND INSTANCES
             instances = []
             slot_refs = {}
-            used_ids = set()
 
-            # generate unique 5-char ids per-player (check within this player's created instances)
-            for slot, template_name in _starters.items():
-                iid = _make_instance_id(existing_ids=used_ids)
-                used_ids.add(iid)
+            # ids come from the per-player instance counter (seq 0..n-1); the doc starts it at n
+            for seq, (slot, template_name) in enumerate(_starters.items()):
+                iid = encode_instance_id(seq)
 
                 tmpl = item_templates.get(template_name, {})
 
@@ -232,9 +219,6 @@ class RegisterCog(commands.Cog):
                 instances.append(inst_doc)
                 slot_refs[slot] = iid
 
-            # convert used_ids to list for storage
-            used_ids_list = list(used_ids)
-
             await db.equipment.insert_one({
                 "id": user_id,
                 "head": None,
@@ -260,9 +244,10 @@ class RegisterCog(commands.Cog):
                 "scavengingTool": slot_refs["scavengingTool"],
                 # all item instances owned by this player (including the equipped ones)
                 "instances": instances,
-                # store used short ids for quick uniqueness checks later
-                "used_ids": used_ids_list,
+                # next instance id to hand out (see server/instances.py)
+                INSTANCE_SEQ_FIELD: len(_starters),
             })
+            autocomplete.invalidate_player(user_id)
 
             # ----------------------------
             # NEW: Initialize player_quests with the first quest active
@@ -7,11 +7,14 @@ from discord import app_commands
 from discord.ext import commands
 from discord.ui import Select, View
 
-import random
-import string
 import time
 
+from server import autocomplete, events
+from server.instances import add_instances, allocate_instance_ids
+from server.inventoryData import INVENTORY_FULL_MESSAGE, change_items
+from server.playerData import REGISTERED, STAMINA, find_player, item_counts, skill_fields
 from server.userMethods import regenerate_stamina, calculate_power_rating
+from settings import INSTANCE_STASH
 
 # Load manifests once at import time
 _ITEMS_PATH = Path("data/items.json")
@@ -52,11 +55,10 @@ if _ARMOR_TEMPLATES_PATH.exists():
     armor_templates = json.loads(_ARMOR_TEMPLATES_PATH.read_text(encoding="utf-8"))
     all_templates.update(armor_templates)
 
-#! basically a duplicate of the one in register.py
-def make_short_id() -> str:
-    """Generate a 5-character alphanumeric ID (A-Z, 0-9)."""
-    alphabet = string.ascii_uppercase + string.digits
-    return "".join(random.choice(alphabet) for _ in range(5))
+# Case-insensitive template lookup for recipe keys
+_templates_by_lower: Dict[str, str] = {}
+for _tname in all_templates:
+    _templates_by_lower.setdefault(_tname.lower(), _tname)
 
 class CraftingCog(commands.Cog):
     """Handles `/craft` via arguments or a dropdown menu, with full DB integration."""
@@ -66,7 +68,7 @@ class CraftingCog(commands.Cog):
 
     async def get_regen_user(self, user_id: int) -> Dict | None:
         db = self.bot.db
-        user = await db.general.find_one({"id": user_id})
+        user = await find_player(db.general, user_id, STAMINA)
         if user is None:
             return None
 
@@ -124,7 +126,7 @@ class CraftingCog(commands.Cog):
             if name == "anyFish":
                 async def finder():
                     fish_keys = [k for k, i in _items_data.items() if i.get("type") == "fishing"]
-                    inv = await db.inventory.find_one({"id": user_id})
+                    inv = await find_player(db.inventory, user_id, item_counts(*fish_keys))
                     for fk in fish_keys:
                         if inv.get(fk, 0) > 0:
                             return fk
@@ -144,7 +146,7 @@ class CraftingCog(commands.Cog):
                 if not ing:
                     return False, f"❌ You have no fish to use for `{recipe_key}`.", 0
             col = getattr(db, loc)
-            doc = await col.find_one({"id": user_id})
+            doc = await find_player(col, user_id, item_counts(ing))
             have = doc.get(ing, 0)
             if have < req:
                 missing_items.append((ing, req - have))
@@ -153,50 +155,41 @@ class CraftingCog(commands.Cog):
             missing_text = "\n".join([f"• **{amt} × {name.title()}**" for name, amt in missing_items])
             return False, f"❌ You're missing the following items:\n{missing_text}", 0
 
-        # If we got here, consume the ingredients safely
+        # Try to find a matching template in ALL templates (case-insensitive)
+        template_name = _templates_by_lower.get(recipe_key.lower())
+        template_data = all_templates.get(template_name) if template_name else None
+        instanced = bool(template_name and template_data)
+
+        # If we got here, consume the ingredients safely. Inventory ingredients and a
+        # plain (non-instanced) product share one slot-checked write.
+        inv_deltas: Dict[str, int] = {}
+        general_deltas: Dict[str, int] = {}
         for ing, req in needs:
             loc, resolver = resolve_ingredient(ing)
             if callable(resolver):
                 ing = await resolver()
-            col = getattr(db, loc)
-            await col.update_one({"id": user_id}, {"$inc": {ing: -req}})
+            deltas = inv_deltas if loc == "inventory" else general_deltas
+            deltas[ing] = deltas.get(ing, 0) - req
+        if not instanced:
+            inv_deltas[recipe_key] = inv_deltas.get(recipe_key, 0) + amount
+        if not await change_items(db, user_id, inv_deltas):
+            return False, INVENTORY_FULL_MESSAGE, 0
+        if general_deltas:
+            await db.general.update_one({"id": user_id}, {"$inc": general_deltas})
 
         # 4) Give the crafted item OR create instances if it's a templated item
-        # Try to find a matching template in ALL templates (case-insensitive)
-        template_name = None
-        template_data = None
-        
-        for tname, tdata in all_templates.items():
-            if tname.lower() == recipe_key.lower():
-                template_name = tname
-                template_data = tdata
-                break
-
         created_instance_ids: List[str] = []
-        if template_name and template_data:
+        if instanced:
             # We're crafting an equippable/instanced item. Create `amount` instances.
             now = int(time.time())
-            # Fetch player's equipment doc to check used_ids and instances
-            equip_doc = await db.equipment.find_one({"id": user_id})
-            if not equip_doc:
+            # Reserve ids from the player's instance counter (no equipment doc read needed)
+            new_ids = await allocate_instance_ids(db, user_id, amount, use_stash=INSTANCE_STASH)
+            if not new_ids:
                 return False, "❌ You don't have equipment data yet, please /register.", 0
 
-            used_ids = set(equip_doc.get("used_ids", []) or [])
-            # also ensure we don't duplicate against existing instances' ids
-            existing_ids = {inst.get("instance_id") for inst in (equip_doc.get("instances") or []) if inst.get("instance_id")}
-            used_ids.update(existing_ids)
-
-            # create amount instances, storing each in equipment.instances and used_ids
-            for _i in range(amount):
-                # generate unique short id
-                for _attempt in range(2000):
-                    iid = make_short_id()
-                    if iid not in used_ids:
-                        break
-                else:
-                    # fallback to longer id if we couldn't find a short unique id
-                    iid = f"I{int(time.time()*1000)}"
-
+            # create amount instances, stored together once built
+            new_instances: List[Dict[str, Any]] = []
+            for iid in new_ids:
                 # Build the instance document based on item type
                 item_type = template_data.get("type", "")
                 
@@ -244,21 +237,17 @@ class CraftingCog(commands.Cog):
                         "type": item_type if item_type else "misc"
                     }
 
-                # push the instance into equipment doc
-                await db.equipment.update_one(
-                    {"id": user_id},
-                    {"$push": {"instances": inst_doc, "used_ids": iid}}
-                )
-                used_ids.add(iid)
+                new_instances.append(inst_doc)
                 created_instance_ids.append(iid)
 
+            # equipment doc, or the stash when unequipped instances live there
+            await add_instances(db, user_id, new_instances, use_stash=INSTANCE_STASH)
+            autocomplete.invalidate_instances(user_id)
+
             # reduce stamina once per craft action (as before)
             await db.general.update_one({"id": user_id}, {"$inc": {"stamina": -1}})
         else:
-            # not a templated item — keep previous behavior: add to inventory
-            await db.inventory.update_one(
-                {"id": user_id}, {"$inc": {recipe_key: amount}}
-            )
+            # not a templated item — already added to inventory with the ingredients above
             # reduce stamina
             await db.general.update_one({"id": user_id}, {"$inc": {"stamina": -1}})
 
@@ -272,7 +261,7 @@ class CraftingCog(commands.Cog):
             xp_gain = item_info.get("xp", 0) * amount
 
         # 6) Update crafting skill
-        sk = await db.skills.find_one({"id": user_id})
+        sk = await find_player(db.skills, user_id, skill_fields("crafting", "XP", "Level"))
         old_xp, old_lvl = sk["craftingXP"], sk["craftingLevel"]
         new_xp = old_xp + xp_gain
         lvl_thr = 50 * old_lvl + 10
@@ -291,6 +280,8 @@ class CraftingCog(commands.Cog):
                 {"id": user_id}, {"$set": {"craftingXP": new_xp}}
             )
 
+        events.emit(self.bot, user_id, events.CRAFT, recipe_key.lower(), amount, interaction=interaction)
+
         # 7) Build response
         msg_lines = []
         if created_instance_ids:
@@ -321,7 +312,7 @@ class CraftingCog(commands.Cog):
         db = self.bot.db  # type: ignore[attr-defined]
         user_id = interaction.user.id
 
-        prof = await db.general.find_one({"id": user_id})
+        prof = await find_player(db.general, user_id, REGISTERED)
         if not prof:
             return await interaction.response.send_message(
                 "❌ Please `/register` first.", ephemeral=True
@@ -346,6 +337,13 @@ class CraftingCog(commands.Cog):
                 "Select a recipe to craft:", view=view, ephemeral=True
             )
 
+    @craft.autocomplete("item")
+    async def craft_item_autocomplete(
+        self, interaction: discord.Interaction, current: str
+    ) -> List[app_commands.Choice[str]]:
+        recipes = await autocomplete.known_recipes(self.bot.db, interaction.user.id)
+        return recipes.complete(current)
+
 class RecipeSelect(Select):
     def __init__(self, options: List[discord.SelectOption], cog: CraftingCog):
         super().__init__(
@@ -7,6 +7,9 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 
+from server import events
+from server.playerData import CURRENT_SUBAREA, STAMINA, find_player, skill_fields
+from server.inventoryData import INVENTORY_FULL_MESSAGE
 from server.skillMethods import get_equipped_tool, calculate_final_qty, apply_gather_results, get_skill_set_bonuses
 from server.userMethods import regenerate_stamina, calculate_power_rating, has_skill_resources
 
@@ -31,7 +34,7 @@ class FarmingCog(commands.Cog):
 
     async def get_regen_user(self, user_id: int) -> Dict | None:
         db = self.bot.db
-        user = await db.general.find_one({"id": user_id})
+        user = await find_player(db.general, user_id, STAMINA)
         if not user:
             return None
         user = regenerate_stamina(user)
@@ -76,7 +79,7 @@ class FarmingCog(commands.Cog):
         set_bonuses = await get_skill_set_bonuses(db, user_id, "farming")
 
         # --- 2) Current location & available resources ---
-        area_doc = await db.areas.find_one({"id": user_id})
+        area_doc = await find_player(db.areas, user_id, CURRENT_SUBAREA)
         if not area_doc:
             return await interaction.response.send_message("❌ Couldn't determine your current location!", ephemeral=True)
 
@@ -103,7 +106,7 @@ class FarmingCog(commands.Cog):
 
         # --- 3) Determine quantity & XP with tool & skill bonuses & set bonuses ---
         base_qty = random.randint(1, 3)
-        skill_doc = await db.skills.find_one({"id": user_id})
+        skill_doc = await find_player(db.skills, user_id, skill_fields("farming", "Bonus"))
         farming_bonus = int(skill_doc.get("farmingBonus", 0)) if skill_doc else 0
 
         final_qty, bonus_gained, float_qty = calculate_final_qty(base_qty, tool_inst, template, farming_bonus, set_bonuses)
@@ -124,6 +127,9 @@ class FarmingCog(commands.Cog):
             collection_key="crop",
             set_bonuses=set_bonuses
         )
+        if summary is None:
+            return await interaction.response.send_message(INVENTORY_FULL_MESSAGE, ephemeral=True)
+        events.emit_gather(self.bot, user_id, picked_key, "crop", final_qty, interaction=interaction)
 
         # --- 5) Build embed ---
         embed = discord.Embed(title="🌾 Farming Results", color=discord.Color.green(), timestamp=datetime.datetime.now())
@@ -8,6 +8,9 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 
+from server import events
+from server.playerData import CURRENT_SUBAREA, FISHING_PROFILE, find_player, skill_fields
+from server.inventoryData import INVENTORY_FULL_MESSAGE
 from server.skillMethods import get_equipped_tool, calculate_final_qty, apply_gather_results, get_skill_set_bonuses
 from server.userMethods import regenerate_stamina, calculate_power_rating, has_skill_resources
 
@@ -32,7 +35,7 @@ class FishingCog(commands.Cog):
 
     async def get_regen_user(self, user_id: int) -> Dict | None:
         db = self.bot.db
-        user = await db.general.find_one({"id": user_id})
+        user = await find_player(db.general, user_id, FISHING_PROFILE)
         if not user:
             return None
         user = regenerate_stamina(user)
@@ -88,7 +91,7 @@ class FishingCog(commands.Cog):
         set_bonuses = await get_skill_set_bonuses(db, user_id, "fishing")
 
         # 2) Fetch current subarea
-        area_doc = await db.areas.find_one({"id": user_id})
+        area_doc = await find_player(db.areas, user_id, CURRENT_SUBAREA)
         if not area_doc:
             return await interaction.response.send_message(
                 "❌ Couldn't determine your current location!", ephemeral=True
@@ -142,7 +145,7 @@ class FishingCog(commands.Cog):
         effective_treasure_chance = base_treasure_chance * tool_rare_mult
         
         # 5) Load fishing skill bonus
-        skill_doc = await db.skills.find_one({"id": user_id})
+        skill_doc = await find_player(db.skills, user_id, skill_fields("fishing", "Bonus"))
         fishing_bonus = int(skill_doc.get("fishingBonus", 0)) if skill_doc else 0
 
         # 6) Determine catch type with modified treasure chance
@@ -274,6 +277,9 @@ class FishingCog(commands.Cog):
                 collection_key=collection_key,
                 set_bonuses=set_bonuses
             )
+            if summary is None:
+                return await interaction.response.send_message(INVENTORY_FULL_MESSAGE, ephemeral=True)
+            events.emit_gather(self.bot, user_id, key, collection_key, final_qty, interaction=interaction)
 
             # Also update accuracy for fishing level ups
             if summary["skill_leveled"]:
@@ -308,7 +314,7 @@ class FishingCog(commands.Cog):
 
     async def _update_fishing_skill(self, db, user_id: int, xp_gain: int, essence_gain: float) -> Dict[str, Any]:
         """Helper to update fishing skill for coin/crate outcomes"""
-        skill_doc = await db.skills.find_one({"id": user_id})
+        skill_doc = await find_player(db.skills, user_id, skill_fields("fishing", "XP", "Level"))
         old_xp = int(skill_doc.get("fishingXP", 0))
         old_lvl = int(skill_doc.get("fishingLevel", 0))
 
@@ -1,5 +1,6 @@
 import random
 import datetime
+from collections import deque
 import json
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
@@ -8,6 +9,11 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 
+from server import events
+from server.playerData import (
+    ARMOR_SLOTS, COMBAT_LEVELS, COMBAT_STATS, CURRENT_SUBAREA, HUNT_PROFILE, find_equipped, find_player,
+)
+from server.inventoryData import change_items
 from server.userMethods import regenerate_stamina, calculate_power_rating
 
 from settings import GUILD_ID
@@ -46,7 +52,7 @@ class CombatCog(commands.Cog):
 
     async def get_regen_user(self, user_id: int) -> Dict | None:
         db = self.bot.db
-        user = await db.general.find_one({"id": user_id})
+        user = await find_player(db.general, user_id, HUNT_PROFILE)
         if user is None:
             return None
 
@@ -91,7 +97,7 @@ class CombatCog(commands.Cog):
     async def _get_armor_and_set_bonuses(self, user_id: int) -> Dict[str, int]:
         """Calculate total bonuses from equipped armor and set bonuses."""
         db = self.bot.db
-        equip_doc = await db.equipment.find_one({"id": user_id}) or {}
+        equip_doc = await find_equipped(db, user_id, ARMOR_SLOTS) or {}
         
         bonuses = {
             "HP": 0,
@@ -138,8 +144,8 @@ class CombatCog(commands.Cog):
     async def _calculate_stats(self, user_id: int) -> Dict[str, int]:
         """Calculate player's combat stats with proper HP handling."""
         db = self.bot.db
-        general = await db.general.find_one({"id": user_id})
-        skills = await db.skills.find_one({"id": user_id})
+        general = await find_player(db.general, user_id, COMBAT_STATS)
+        skills = await find_player(db.skills, user_id, COMBAT_LEVELS)
         
         # Get armor and set bonuses
         equipment_bonuses = await self._get_armor_and_set_bonuses(user_id)
@@ -222,6 +228,69 @@ class CombatCog(commands.Cog):
             return random.choice(eligible)
         return random.choice(mobs) if mobs else None
 
+    def _resolve_combat(
+        self,
+        player_stats: Dict[str, int],
+        mob_stats: Dict[str, Any],
+        player_hp: int,
+        mob_hp: int,
+        crit_chance: float,
+        log_size: int = 3
+    ) -> Tuple[int, int, List[Tuple[str, int]]]:
+        """
+        Fast-forward an auto-combat to its end.
+        Hit chances and damage never change mid-fight, so they are computed once and
+        the loop only rolls dice. Instead of formatting a log line per turn, only the
+        last `log_size` events are kept as (kind, damage) tuples for display.
+        Returns (player_hp, mob_hp, events).
+        """
+        roll = random.random
+        hit_chance = player_stats["acc"] / (player_stats["acc"] + mob_stats["eva"])
+        mob_hit_chance = mob_stats["acc"] / (mob_stats["acc"] + player_stats["eva"])
+        damage = max(1, player_stats["str"] - mob_stats["def"] // 2)
+        crit_damage = int(max(1, damage * 2))  # crit doubles damage
+        mob_damage = max(1, mob_stats["str"] - player_stats["def"] // 2)
+
+        events: deque = deque(maxlen=log_size)
+        push = events.append
+        while player_hp > 0 and mob_hp > 0:
+            # Player attack (only weapon provides crit in this design)
+            if roll() <= hit_chance:
+                if crit_chance > 0 and roll() < crit_chance:
+                    mob_hp -= crit_damage
+                    push(("crit", crit_damage))
+                else:
+                    mob_hp -= damage
+                    push(("hit", damage))
+            else:
+                push(("miss", 0))
+
+            # Mob attack
+            if mob_hp > 0:
+                if roll() <= mob_hit_chance:
+                    player_hp = max(0, player_hp - mob_damage)
+                    push(("mob_hit", mob_damage))
+                else:
+                    push(("mob_miss", 0))
+
+        return player_hp, mob_hp, list(events)
+
+    def _format_combat_events(self, events: List[Tuple[str, int]], mob_name: str) -> List[str]:
+        """Render the (kind, damage) events kept by `_resolve_combat` as combat log lines."""
+        lines = []
+        for kind, amount in events:
+            if kind == "crit":
+                lines.append(f"💥 CRITICAL HIT! You dealt **{amount}** damage to {mob_name}!")
+            elif kind == "hit":
+                lines.append(f"🗡️ You hit {mob_name} for **{amount}** damage!")
+            elif kind == "miss":
+                lines.append(f"✖️ You missed {mob_name}.")
+            elif kind == "mob_hit":
+                lines.append(f"🩸 {mob_name} hits you for **{amount}** damage!")
+            else:
+                lines.append(f"🛡️ {mob_name} missed you.")
+        return lines
+
     @app_commands.command(
         name="hunt",
         description="⚔️ Seek out dangerous creatures to battle and loot!"
@@ -251,7 +320,7 @@ class CombatCog(commands.Cog):
             )
 
         # --- 2) Get available mobs ---
-        area_data = await db.areas.find_one({"id": user_id})
+        area_data = await find_player(db.areas, user_id, CURRENT_SUBAREA)
         if not area_data:
             return await interaction.response.send_message(
                 "⚠️ Your location data could not be found.",
@@ -283,7 +352,7 @@ class CombatCog(commands.Cog):
         player_hp = player_stats["current_hp"]
 
         # --- read weapon stats from equipped main hand (if present) and apply on-the-fly ---
-        equip_doc = await db.equipment.find_one({"id": user_id}) or {}
+        equip_doc = await find_equipped(db, user_id, ("mainHand",)) or {}
         # try a few slot name variants to be safe
         mainhand_iid = equip_doc.get("mainHand") or equip_doc.get("mainhand") or equip_doc.get("mainhand_id") or equip_doc.get("main_hand")
         weapon_stats = {}
@@ -311,38 +380,9 @@ class CombatCog(commands.Cog):
         player_stats["eva"] = int(player_stats["eva"] + round(w_eva))
         player_stats["def"] = int(player_stats["def"])  # DEF already includes armor bonuses
 
-        combat_log = []
-        # keep track of whether we got crits for log messages
-        while player_hp > 0 and mob_hp > 0:
-            # Player attack
-            hit_chance = player_stats["acc"] / (player_stats["acc"] + mob["stats"]["eva"])
-            if random.random() <= hit_chance:
-                # base damage calculation (as before)
-                damage = max(1, player_stats["str"] - mob["stats"]["def"] // 2)
-
-                # roll crit using weapon crit% (only weapon provides crit in this design)
-                is_crit = random.random() < w_crit if w_crit > 0 else False
-                if is_crit:
-                    damage = int(max(1, damage * 2))  # crit doubles damage
-                    combat_log.append(f"💥 CRITICAL HIT! You dealt **{damage}** damage to {mob['name']}!")
-
-                else:
-                    combat_log.append(f"🗡️ You hit {mob['name']} for **{damage}** damage!")
-
-                mob_hp -= damage
-            else:
-                combat_log.append(f"✖️ You missed {mob['name']}.")
-
-            # Mob attack
-            if mob_hp > 0:
-                mob_hit_chance = mob["stats"]["acc"] / (mob["stats"]["acc"] + player_stats["eva"])
-                if random.random() <= mob_hit_chance:
-                    mob_damage = max(1, mob["stats"]["str"] - player_stats["def"] // 2)
-                    player_hp = max(0, player_hp - mob_damage)
-                    combat_log.append(f"🩸 {mob['name']} hits you for **{mob_damage}** damage!")
-                else:
-                    combat_log.append(f"🛡️ {mob['name']} missed you.")
-
+        player_hp, mob_hp, combat_events = self._resolve_combat(
+            player_stats, mob["stats"], player_hp, mob_hp, w_crit
+        )
         victory = player_hp > 0
 
         # --- 4) Process results ---
@@ -365,6 +405,7 @@ class CombatCog(commands.Cog):
         }
         
         loot = []
+        loot_lost = False
         gold_gain = 0
         gold_loss = 0
         if victory:
@@ -372,13 +413,15 @@ class CombatCog(commands.Cog):
             updates["$inc"]["wallet"] = gold_gain
             
             # Process loot
+            loot_deltas: Dict[str, int] = {}
             for entry in mob["loot_table"]:
                 if random.random() <= entry["chance"]:
                     qty = random.randint(*entry.get("quantity", [1, 1]))
                     loot.append((entry["item"], qty))
-                    await db.inventory.update_one(
-                        {"id": user_id}, {"$inc": {entry["item"]: qty}}
-                    )
+                    loot_deltas[entry["item"]] = loot_deltas.get(entry["item"], 0) + qty
+            # all-or-nothing: no loot if it doesn't fit the free slots
+            if loot_deltas and not await change_items(db, user_id, loot_deltas):
+                loot_lost = True
         else:
             gold_loss = min(profile["wallet"], random.randint(10, 25))
             stamina_loss = random.randint(10, 25)
@@ -390,6 +433,8 @@ class CombatCog(commands.Cog):
             })
 
         await db.general.update_one({"id": user_id}, updates)
+        if victory:
+            events.emit(self.bot, user_id, events.KILL, mob_id, interaction=interaction)
 
         # --- 5) Build embed ---
         result_lines = [
@@ -408,7 +453,13 @@ class CombatCog(commands.Cog):
         )
 
         # Add loot display if victorious
-        if victory and loot:
+        if victory and loot_lost:
+            embed.add_field(
+                name="🎒 Inventory Full",
+                value="You had no room for the loot and had to leave it behind.",
+                inline=False
+            )
+        elif victory and loot:
             loot_text = "\n".join(
                 f"• {item.replace('_', ' ').title()} ×{qty}"
                 for item, qty in loot
@@ -431,11 +482,11 @@ class CombatCog(commands.Cog):
                 inline=False
             )
 
-        if combat_log:
+        if combat_events:
             # show only last 3 actions
             embed.add_field(
                 name="Combat Log (Last 3 Actions)",
-                value="\n".join(combat_log[-3:]),
+                value="\n".join(self._format_combat_events(combat_events, mob["name"])),
                 inline=False
             )
 
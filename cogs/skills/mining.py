@@ -7,6 +7,9 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 
+from server import events
+from server.playerData import CURRENT_SUBAREA, STAMINA, find_player, skill_fields
+from server.inventoryData import INVENTORY_FULL_MESSAGE
 from server.skillMethods import get_equipped_tool, calculate_final_qty, apply_gather_results, get_skill_set_bonuses
 from server.userMethods import regenerate_stamina, calculate_power_rating, has_skill_resources
 
@@ -31,7 +34,7 @@ class MiningCog(commands.Cog):
 
     async def get_regen_user(self, user_id: int) -> Dict | None:
         db = self.bot.db
-        user = await db.general.find_one({"id": user_id})
+        user = await find_player(db.general, user_id, STAMINA)
         if user is None:
             return None
 
@@ -78,7 +81,7 @@ class MiningCog(commands.Cog):
         set_bonuses = await get_skill_set_bonuses(db, user_id, "mining")
 
         # 3) location & resources
-        area_doc = await db.areas.find_one({"id": user_id})
+        area_doc = await find_player(db.areas, user_id, CURRENT_SUBAREA)
         if not area_doc:
             return await interaction.response.send_message("❌ Couldn't determine your current location!", ephemeral=True)
 
@@ -109,7 +112,7 @@ class MiningCog(commands.Cog):
 
         # --- compute final qty using helper with set bonuses ---
         base_qty = random.randint(1, 3)
-        sk = await db.skills.find_one({"id": user_id})
+        sk = await find_player(db.skills, user_id, skill_fields("mining", "Bonus"))
         mining_bonus = int(sk.get("miningBonus", 0)) if sk else 0
 
         final_qty, bonus_gained, _float_qty = calculate_final_qty(base_qty, tool_inst, template, mining_bonus, set_bonuses)
@@ -127,6 +130,9 @@ class MiningCog(commands.Cog):
             collection_key="ore",
             set_bonuses=set_bonuses
         )
+        if summary is None:
+            return await interaction.response.send_message(INVENTORY_FULL_MESSAGE, ephemeral=True)
+        events.emit_gather(self.bot, user_id, picked_key, "ore", final_qty, interaction=interaction)
 
         # --- embed (back to original format) ---
         embed = discord.Embed(title="⛏️ Mining Results", color=discord.Color.blue(), timestamp=datetime.datetime.now())
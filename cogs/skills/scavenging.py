@@ -7,6 +7,9 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 
+from server import events
+from server.playerData import CURRENT_SUBAREA, STAMINA, find_player, skill_fields
+from server.inventoryData import INVENTORY_FULL_MESSAGE
 from server.skillMethods import get_equipped_tool, calculate_final_qty, apply_gather_results, get_skill_set_bonuses
 from server.userMethods import regenerate_stamina, calculate_power_rating, has_skill_resources
 
@@ -30,7 +33,7 @@ class ScavengingCog(commands.Cog):
 
     async def get_regen_user(self, user_id: int) -> Dict | None:
         db = self.bot.db
-        user = await db.general.find_one({"id": user_id})
+        user = await find_player(db.general, user_id, STAMINA)
         if not user:
             return None
         user = regenerate_stamina(user)
@@ -75,7 +78,7 @@ class ScavengingCog(commands.Cog):
         set_bonuses = await get_skill_set_bonuses(db, user_id, "scavenging")
 
         # --- location & resources ---
-        area_doc = await db.areas.find_one({"id": user_id})
+        area_doc = await find_player(db.areas, user_id, CURRENT_SUBAREA)
         if not area_doc:
             return await interaction.response.send_message("❌ Couldn't determine your current location!", ephemeral=True)
 
@@ -106,7 +109,7 @@ class ScavengingCog(commands.Cog):
 
         # --- quantity calc using helpers with set bonuses ---
         base_qty = random.randint(1, 3)
-        sk = await db.skills.find_one({"id": user_id})
+        sk = await find_player(db.skills, user_id, skill_fields("scavenging", "Bonus"))
         scav_bonus = int(sk.get("scavengingBonus", 0)) if sk else 0
 
         final_qty, bonus_gained, _float_qty = calculate_final_qty(base_qty, tool_inst, template, scav_bonus, set_bonuses)
@@ -124,6 +127,9 @@ class ScavengingCog(commands.Cog):
             collection_key="herb",
             set_bonuses=set_bonuses
         )
+        if summary is None:
+            return await interaction.response.send_message(INVENTORY_FULL_MESSAGE, ephemeral=True)
+        events.emit_gather(self.bot, user_id, picked_key, "herb", final_qty, interaction=interaction)
 
         # --- embed ---
         embed = discord.Embed(title="🪴 Scavenging Results", color=discord.Color.gold(), timestamp=datetime.datetime.now())
@@ -2,7 +2,7 @@
 from __future__ import annotations
 import asyncio
 import logging
-from typing import Optional
+from typing import Optional, Sequence
 
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorCollection, AsyncIOMotorDatabase
 
@@ -16,10 +16,13 @@ class Database:
     After connect(), `self.db` is usable and collections are available.
     """
 
-    def __init__(self, uri: str, db_name: str = "alphaworks", server_selection_timeout_ms: int = 5000) -> None:
+    def __init__(self, uri: str, db_name: str = "alphaworks", server_selection_timeout_ms: int = 5000,
+                 event_listeners: Optional[Sequence] = None) -> None:
         self._uri = uri
         self._db_name = db_name
         self._sstms = server_selection_timeout_ms
+        # pymongo monitoring listeners (e.g. per-command DB metrics)
+        self._listeners = list(event_listeners or [])
 
         # Create client lazily; we'll create it in connect() so we can control retries.
         self.client: Optional[AsyncIOMotorClient] = None
@@ -34,6 +37,8 @@ class Database:
         self.areas: Optional[AsyncIOMotorCollection] = None
         self.equipment: Optional[AsyncIOMotorCollection] = None
         self.quests: Optional[AsyncIOMotorCollection] = None
+        self.state: Optional[AsyncIOMotorCollection] = None
+        self.stash: Optional[AsyncIOMotorCollection] = None
 
     async def connect(self, max_retries: int = 3, backoff_seconds: float = 0.5) -> bool:
         """
@@ -43,7 +48,9 @@ class Database:
         last_exc: Exception | None = None
         for attempt in range(1, max_retries + 1):
             try:
-                self.client = AsyncIOMotorClient(self._uri, serverSelectionTimeoutMS=self._sstms)
+                self.client = AsyncIOMotorClient(
+                    self._uri, serverSelectionTimeoutMS=self._sstms, event_listeners=self._listeners
+                )
                 # Resolve DB (use provided name)
                 self.db = self.client[self._db_name]
                 # Force a network round-trip to confirm connectivity
@@ -57,6 +64,8 @@ class Database:
                 self.areas = self.db["areas"]
                 self.equipment = self.db["equipment"]
                 self.quests = self.db["quests"]
+                self.state = self.db["state"]
+                self.stash = self.db["stash"]
                 logger.info("Connected to MongoDB (database=%s)", self._db_name)
                 return True
             except Exception as exc:
@@ -9,6 +9,13 @@ from discord import Intents
 from discord.ext import commands
 
 from database import Database
+from server.events import EventBus
+from server.instances import migrate_equipment_docs
+from server.exporter import MetricsExporter
+from server.inventoryData import migrate_inventory_docs
+from server.loopMonitor import LoopLagMonitor
+from server.metrics import CommandMetrics, InstrumentedTree, MongoListener
+from server.state import StateBackend, create_state_backend
 
 # ——— Configuration —————————————————————————————————————————————————————————————
 CONFIG_PATH = Path("data/config.json")
@@ -27,7 +34,11 @@ def load_config(path: Path) -> dict:
     text = path.read_text(encoding="utf-8")
     return json.loads(text)
 
-from settings import DISCORD_TOKEN, APPLICATION_ID, COMMAND_PREFIX, GUILD_ID, DATABASE_URI
+from settings import (
+    DISCORD_TOKEN, APPLICATION_ID, COMMAND_PREFIX, GUILD_ID, DATABASE_URI,
+    SHARD_COUNT, SHARD_IDS, STATE_BACKEND, INSTANCE_STASH, METRICS_LOG_INTERVAL,
+    METRICS_REPLY_BYTES, METRICS_PORT, METRICS_HOST, LOOP_SLOW_THRESHOLD, LOOP_ASYNCIO_DEBUG,
+)
 
 # ——— Logging Setup —————————————————————————————————————————————————————————————
 logging.basicConfig(
@@ -39,13 +50,21 @@ logger = logging.getLogger("bot")
 
 
 # ——— Bot Client ————————————————————————————————————————————————————————————————
-class Client(commands.Bot):
+class Client(commands.AutoShardedBot):
     """
     The main bot client class.
 
+    Runs sharded: discord.py picks the shard count unless SHARD_COUNT / SHARD_IDS
+    are set in config, which lets several processes each run a slice of the shards.
+
     Attributes:
         session: HTTP session for external requests.
         db: Database wrapper for Mongo operations.
+        state: Backend for transient state shared between shard processes.
+        events: In-process bus carrying game events (gathers, kills...) to progress handlers.
+        metrics: Per-command latency and Mongo round-trip statistics (see /stats).
+        loop_monitor: Measures event-loop lag and logs stack samples of blocking code.
+        exporter: Prometheus /metrics endpoint, when METRICS_PORT is set.
     """
 
     def __init__(self) -> None:
@@ -55,29 +74,70 @@ class Client(commands.Bot):
             command_prefix=COMMAND_PREFIX,
             intents=intents,
             application_id=APPLICATION_ID,
+            shard_count=SHARD_COUNT,
+            shard_ids=SHARD_IDS,
+            tree_cls=InstrumentedTree,
         )
         self.session: Optional[aiohttp.ClientSession] = None
         self.db: Optional[Database] = None
+        self.state: Optional[StateBackend] = None
+        self.events: Optional[EventBus] = None
+        self.metrics = CommandMetrics(log_interval=METRICS_LOG_INTERVAL)
+        self.loop_monitor = LoopLagMonitor(
+            slow_threshold=LOOP_SLOW_THRESHOLD, metrics=self.metrics, asyncio_debug=LOOP_ASYNCIO_DEBUG
+        )
+        self.exporter: Optional[MetricsExporter] = None
 
     async def setup_hook(self) -> None:
         """
         Called by discord.py when the bot starts up.
         - Opens an aiohttp session.
-        - Initializes the async Database.
+        - Starts the periodic command-stats log line, the loop-lag monitor and (optionally)
+          the Prometheus exporter.
+        - Initializes the async Database (migrating equipment docs) and the shared state backend.
+        - Starts the game event bus (before cogs load so they can subscribe).
         - Dynamically loads all cog extensions.
-        - Syncs the command tree to the development guild.
+        - Syncs the command tree to the development guild (from the process owning shard 0).
         """
         # HTTP session
         logger.info("Creating HTTP session…")
         self.session = aiohttp.ClientSession()
 
+        # Command metrics (the Mongo listener charges DB round trips to the running command)
+        self.metrics.start()
+        self.loop_monitor.start()
+        if METRICS_PORT:
+            self.exporter = MetricsExporter(self, host=METRICS_HOST, port=METRICS_PORT)
+            try:
+                await self.exporter.start()
+            except OSError as exc:
+                logger.error("❌ Could not serve metrics on %s:%s: %s", METRICS_HOST, METRICS_PORT, exc)
+                self.exporter = None
+
         # Database
         logger.info("Connecting to MongoDB…")
-        self.db = Database(DATABASE_URI, db_name="alphaworks")
+        self.db = Database(DATABASE_URI, db_name="alphaworks", event_listeners=[MongoListener(self.metrics, reply_bytes=METRICS_REPLY_BYTES)])
         connected = await self.db.connect(max_retries=3, backoff_seconds=0.5)
         if not connected:
             logger.error("❌ Could not connect to MongoDB. DB-backed features may fail.")
-
+        else:
+            # drop legacy used_ids arrays / move unequipped instances to the stash
+            await migrate_equipment_docs(self.db, use_stash=INSTANCE_STASH)
+            # backfill occupied-slot counters on inventory docs
+            await migrate_inventory_docs(self.db)
+
+        # Shared state (in-memory for a single process, Mongo-backed across processes)
+        logger.info("Using %s state backend", STATE_BACKEND)
+        try:
+            self.state = create_state_backend(STATE_BACKEND, self.db if connected else None)
+        except ValueError as exc:
+            logger.error("❌ %s Falling back to in-memory state.", exc)
+            self.state = create_state_backend("memory")
+        await self.state.ensure_indexes()
+
+        # Game event bus
+        self.events = EventBus()
+        self.events.start()
 
         # Load all top-level cogs
         for cog_path in Path("cogs").glob("*.py"):
@@ -97,15 +157,23 @@ class Client(commands.Bot):
             logger.debug("Loading extension %s", name)
             await self.load_extension(name)
 
-        # Sync slash commands to a specific guild for faster updates during development
-        logger.info("Syncing application commands to GUILD_ID=%d", GUILD_ID)
-        await self.tree.sync(guild=discord.Object(id=GUILD_ID))
+        # Sync slash commands to a specific guild for faster updates during development.
+        # With explicit shard ranges only one process needs to do this.
+        if SHARD_IDS is None or 0 in SHARD_IDS:
+            logger.info("Syncing application commands to GUILD_ID=%d", GUILD_ID)
+            await self.tree.sync(guild=discord.Object(id=GUILD_ID))
 
     async def close(self) -> NoReturn:
         """
         Clean up resources on shutdown.
         """
         logger.info("Shutting down…")
+        if self.exporter:
+            await self.exporter.stop()
+        await self.loop_monitor.stop()
+        await self.metrics.stop()
+        if self.events:
+            await self.events.stop()
         if self.session:
             await self.session.close()
         if self.db:
@@ -117,6 +185,14 @@ class Client(commands.Bot):
         Called when the bot is fully operational.
         """
         logger.info("Bot is online as %s (ID: %d)", self.user, self.user.id)
+        logger.info("Running shards %s of %s", sorted(self.shards), self.shard_count)
+
+
+    async def on_app_command_completion(self, interaction: discord.Interaction, command) -> None:
+        """
+        Close the metrics sample opened by the command tree (failures close it in on_error).
+        """
+        self.metrics.finish(interaction)
 
 
 def main() -> None:
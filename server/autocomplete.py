@@ -0,0 +1,153 @@
+from __future__ import annotations
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, Generic, Hashable, List, Tuple, TypeVar
+
+from discord import app_commands
+
+from server.instances import find_stashed_instances
+from server.playerData import EQUIPMENT_INSTANCES, EQUIPMENT_SLOTS, find_player
+from server.trie import MAX_CHOICES, PrefixTrie
+
+# Autocomplete fires on every keystroke and Discord drops the response after 3s, so
+# providers answer from prefix tries: static ones built from game data at import, and
+# per-player ones (owned instances, known recipes) kept in a short TTL cache. Commands that
+# change that player state call the matching invalidate_*() so the next keystroke reloads.
+
+V = TypeVar("V")
+Choice = app_commands.Choice
+
+
+class TTLCache(Generic[V]):
+    """
+    Per-key cache whose entries expire after `ttl` seconds, bounded to `max_entries`
+    (oldest first out). Concurrent misses for one key share a single load.
+    """
+
+    def __init__(self, ttl: float = 30.0, max_entries: int = 1024) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[float, asyncio.Future]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, key: Hashable, loader: Callable[[], Awaitable[V]]) -> V:
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > now:
+            self.hits += 1
+            return await asyncio.shield(entry[1])
+
+        self.misses += 1
+        fut: asyncio.Future = asyncio.ensure_future(loader())
+        self._entries[key] = (now + self.ttl, fut)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        try:
+            return await asyncio.shield(fut)
+        except Exception:
+            # don't cache failures
+            if self._entries.get(key, (None, None))[1] is fut:
+                del self._entries[key]
+            raise
+
+    def invalidate(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+def choice(name: str, value: str) -> Choice[str]:
+    # Discord caps choice names and values at 100 characters
+    return Choice(name=name[:100], value=value[:100])
+
+
+def build_choice_trie(entries: List[Tuple[Tuple[str, ...], Choice[str]]]) -> PrefixTrie[Choice[str]]:
+    """A trie that finds each choice by any of its search texts (key, display name...)."""
+    return PrefixTrie.build((text, ch) for texts, ch in entries for text in texts if text)
+
+
+# --- Per-player instances (/equip, /unequip, /inspect) ---
+@dataclass
+class PlayerInstances:
+    equipped: PrefixTrie[Choice[str]] = field(default_factory=PrefixTrie)
+    unequipped: PrefixTrie[Choice[str]] = field(default_factory=PrefixTrie)
+    owned: PrefixTrie[Choice[str]] = field(default_factory=PrefixTrie)
+
+
+_instance_cache: TTLCache[PlayerInstances] = TTLCache()
+
+
+async def _load_instances(db, user_id: int, use_stash: bool) -> PlayerInstances:
+    result = PlayerInstances()
+    equip_doc = await find_player(db.equipment, user_id, EQUIPMENT_INSTANCES)
+    if not equip_doc:
+        return result
+    slot_of = {equip_doc.get(slot): slot for slot in EQUIPMENT_SLOTS if equip_doc.get(slot)}
+    instances = (equip_doc.get("instances") or []) + await find_stashed_instances(db, user_id, use_stash)
+    for inst in instances:
+        iid = inst.get("instance_id")
+        if not iid:
+            continue
+        template = inst.get("template", "Unknown")
+        slot = slot_of.get(iid)
+        label = f"{iid} — {template}" + (f" (equipped: {slot})" if slot else "")
+        ch = choice(label, iid)
+        for text in (iid, template):
+            result.owned.insert_words(text, ch)
+            (result.equipped if slot else result.unequipped).insert_words(text, ch)
+    return result
+
+
+async def player_instances(db, user_id: int, use_stash: bool = False) -> PlayerInstances:
+    return await _instance_cache.get(user_id, lambda: _load_instances(db, user_id, use_stash))
+
+
+def invalidate_instances(user_id: int) -> None:
+    _instance_cache.invalidate(user_id)
+
+
+# --- Per-player known recipes (/craft) ---
+_recipe_cache: TTLCache[PrefixTrie[Choice[str]]] = TTLCache()
+
+
+async def _load_recipes(db, user_id: int) -> PrefixTrie[Choice[str]]:
+    rec_doc = await db.recipes.find_one({"id": user_id})
+    keys = sorted(k for k, known in (rec_doc or {}).items() if k not in {"_id", "id"} and known)
+    return build_choice_trie([((key,), choice(key.title(), key)) for key in keys])
+
+
+async def known_recipes(db, user_id: int) -> PrefixTrie[Choice[str]]:
+    return await _recipe_cache.get(user_id, lambda: _load_recipes(db, user_id))
+
+
+def invalidate_recipes(user_id: int) -> None:
+    _recipe_cache.invalidate(user_id)
+
+
+def invalidate_player(user_id: int) -> None:
+    invalidate_instances(user_id)
+    invalidate_recipes(user_id)
+
+
+# Per-player caches by name (hit/miss counters are exported as metrics)
+CACHES: Dict[str, TTLCache] = {"instances": _instance_cache, "recipes": _recipe_cache}
+
+
+def merge_choices(*groups: List[Choice[str]], limit: int = MAX_CHOICES) -> List[Choice[str]]:
+    """Concatenate choice lists, dropping repeated values, capped at Discord's 25."""
+    seen = set()
+    out: List[Choice[str]] = []
+    for group in groups:
+        for ch in group:
+            if ch.value in seen:
+                continue
+            seen.add(ch.value)
+            out.append(ch)
+            if len(out) >= limit:
+                return out
+    return out
@@ -0,0 +1,134 @@
+from __future__ import annotations
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger("bot.events")
+
+# Event kinds emitted by commands
+GATHER = "gather"
+CRAFT = "craft"
+KILL = "kill"
+TRAVEL = "travel"
+TALK = "talk"
+DUNGEON_CLEAR = "dungeon_clear"
+
+EVENT_KINDS = (GATHER, CRAFT, KILL, TRAVEL, TALK, DUNGEON_CLEAR)
+
+# handler(user_id, {(kind, target): amount}, latest interaction or None)
+EventHandler = Callable[[int, Dict[Tuple[str, str], int], Optional[Any]], Awaitable[None]]
+
+
+@dataclass(frozen=True)
+class GameEvent:
+    user_id: int
+    kind: str
+    target: str
+    amount: int = 1
+    # Interaction that caused the event; handlers may use its followup to notify the player
+    interaction: Optional[Any] = None
+
+
+class EventBus:
+    """
+    In-process queue for game events (gathers, crafts, kills...).
+
+    Commands call `emit()`, which never waits on I/O. A background consumer drains
+    the queue, coalesces events per user into {(kind, target): amount} and hands
+    each user's batch to the subscribed handlers (e.g. quest progress).
+    """
+
+    def __init__(self, batch_window: float = 0.25, max_batch: int = 500) -> None:
+        # None is the wake-up pushed by stop() so an idle consumer notices it
+        self._queue: asyncio.Queue[Optional[GameEvent]] = asyncio.Queue()
+        self._handlers: List[EventHandler] = []
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+
+    def subscribe(self, handler: EventHandler) -> None:
+        if handler not in self._handlers:
+            self._handlers.append(handler)
+
+    def unsubscribe(self, handler: EventHandler) -> None:
+        if handler in self._handlers:
+            self._handlers.remove(handler)
+
+    def emit(self, user_id: int, kind: str, target: str, amount: int = 1, interaction: Any = None) -> None:
+        if kind not in EVENT_KINDS:
+            raise ValueError(f"Unknown event kind: {kind!r}")
+        if amount <= 0:
+            return
+        self._queue.put_nowait(GameEvent(user_id, kind, target, amount, interaction))
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._stopping = False
+            self._task = asyncio.create_task(self._consume(), name="event-bus")
+
+    async def stop(self) -> None:
+        """Let the consumer finish its current batch, then process everything still queued."""
+        if self._task is None:
+            return
+        self._stopping = True
+        self._queue.put_nowait(None)
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            # cancelled from outside (e.g. loop shutdown); still flush below
+            pass
+        self._task = None
+        while not self._queue.empty():
+            await self._dispatch(self._drain([]))
+
+    def _drain(self, events: List[GameEvent]) -> List[GameEvent]:
+        while len(events) < self.max_batch:
+            try:
+                ev = self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            if ev is not None:
+                events.append(ev)
+        return events
+
+    async def _consume(self) -> None:
+        while not self._stopping:
+            first = await self._queue.get()
+            if first is None:
+                continue
+            if self.batch_window:
+                # let events from the same burst of commands pile up
+                await asyncio.sleep(self.batch_window)
+            await self._dispatch(self._drain([first]))
+
+    async def _dispatch(self, events: List[GameEvent]) -> None:
+        batches: Dict[int, Dict[Tuple[str, str], int]] = {}
+        interactions: Dict[int, Any] = {}
+        for ev in events:
+            counts = batches.setdefault(ev.user_id, {})
+            counts[(ev.kind, ev.target)] = counts.get((ev.kind, ev.target), 0) + ev.amount
+            if ev.interaction is not None:
+                interactions[ev.user_id] = ev.interaction
+
+        for user_id, counts in batches.items():
+            for handler in list(self._handlers):
+                try:
+                    await handler(user_id, counts, interactions.get(user_id))
+                except Exception:
+                    logger.exception("Event handler %r failed for user %s", handler, user_id)
+
+
+def emit(bot, user_id: int, kind: str, target: str, amount: int = 1, interaction: Any = None) -> None:
+    """Emit an event on the bot's bus, doing nothing if the bus isn't running."""
+    bus: Optional[EventBus] = getattr(bot, "events", None)
+    if bus is not None:
+        bus.emit(user_id, kind, target, amount, interaction)
+
+
+def emit_gather(bot, user_id: int, item_key: str, collection_key: Optional[str], amount: int, interaction: Any = None) -> None:
+    """A gather counts towards both the item itself and the collection it feeds."""
+    emit(bot, user_id, GATHER, item_key, amount, interaction)
+    if collection_key and collection_key != item_key:
+        emit(bot, user_id, GATHER, collection_key, amount, interaction)
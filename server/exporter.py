@@ -0,0 +1,168 @@
+from __future__ import annotations
+import logging
+import math
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from aiohttp import web
+
+from server import autocomplete
+from server.metrics import Histogram
+from utils.pagination import LazyPager
+
+logger = logging.getLogger("bot.exporter")
+
+# Optional Prometheus scrape endpoint (METRICS_PORT in config). Everything is rendered on
+# request from the bot's in-memory counters, so an idle exporter costs nothing.
+
+PREFIX = "starfall"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _fmt(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Writer:
+    """Collects samples grouped under their # HELP / # TYPE header."""
+
+    def __init__(self) -> None:
+        self.lines: List[str] = []
+
+    def family(self, name: str, kind: str, help_text: str) -> str:
+        full = f"{PREFIX}_{name}"
+        self.lines.append(f"# HELP {full} {help_text}")
+        self.lines.append(f"# TYPE {full} {kind}")
+        return full
+
+    def sample(self, name: str, value: float, labels: Labels = ()) -> None:
+        label_text = ",".join(f'{k}="{_escape(str(v))}"' for k, v in labels)
+        self.lines.append(f"{name}{{{label_text}}} {_fmt(value)}" if labels else f"{name} {_fmt(value)}")
+
+    def histogram(self, name: str, hist: Histogram, labels: Labels = (), scale: float = 1e-3) -> None:
+        """Write a millisecond Histogram as cumulative buckets in seconds (`scale`)."""
+        cumulative = 0
+        for bound, n in zip(list(hist.bounds) + [math.inf], hist.counts):
+            cumulative += n
+            self.sample(f"{name}_bucket", cumulative, labels + (("le", _fmt(bound * scale)),))
+        self.sample(f"{name}_sum", hist.total * scale, labels)
+        self.sample(f"{name}_count", hist.count, labels)
+
+    def counters(self, name: str, help_text: str, label: str, values: Iterable[Tuple[str, float]],
+                 kind: str = "counter") -> None:
+        full = self.family(name, kind, help_text)
+        for key, value in values:
+            self.sample(full, value, ((label, key),))
+
+    def render(self) -> str:
+        return "\n".join(self.lines) + "\n"
+
+
+def _active_views(bot) -> Dict[str, int]:
+    # discord.py only exposes persistent views publicly; the view store indexes every
+    # listening view's components, so count the distinct views behind them by class.
+    store = getattr(getattr(bot, "_connection", None), "_view_store", None)
+    views = {}
+    for components in getattr(store, "_views", {}).values():
+        for item in components.values():
+            if item.view is not None:
+                views[id(item.view)] = type(item.view).__name__
+    counts: Dict[str, int] = {}
+    for name in views.values():
+        counts[name] = counts.get(name, 0) + 1
+    return counts
+
+
+def render_metrics(bot) -> str:
+    out = _Writer()
+    commands, mongo_ops, mongo_failures = bot.metrics.collect()
+
+    out.counters("command_invocations_total", "Slash commands completed.", "command",
+                 ((name, s.latency.count) for name, s in commands.items()))
+    out.counters("command_errors_total", "Slash commands that raised.", "command",
+                 ((name, s.errors) for name, s in commands.items()))
+    full = out.family("command_latency_seconds", "histogram", "Slash command wall time.")
+    for name, s in commands.items():
+        out.histogram(full, s.latency, (("command", name),))
+    out.counters("command_db_ops_total", "Mongo round trips issued by slash commands.", "command",
+                 ((name, s.db_ops) for name, s in commands.items()))
+    out.counters("command_db_seconds_total", "Time slash commands spent waiting on Mongo.", "command",
+                 ((name, s.db_seconds) for name, s in commands.items()))
+    out.counters("command_db_bytes_total", "Bytes of Mongo replies received by slash commands.", "command",
+                 ((name, s.db_bytes) for name, s in commands.items()))
+
+    out.counters("mongo_ops_total", "Mongo commands sent, by command name.", "op", sorted(mongo_ops.items()))
+    full = out.family("mongo_failures_total", "counter", "Mongo commands that failed.")
+    out.sample(full, mongo_failures)
+
+    monitor = getattr(bot, "loop_monitor", None)
+    if monitor is not None:
+        full = out.family("event_loop_lag_seconds", "histogram", "How late the loop monitor's sleeps woke up.")
+        out.histogram(full, monitor.lag)
+        full = out.family("event_loop_lag_max_seconds", "gauge", "Largest event loop lag seen.")
+        out.sample(full, monitor.max_lag)
+        full = out.family("event_loop_stalls_total", "counter", "Times the loop was blocked past the slow threshold.")
+        out.sample(full, monitor.stalls)
+
+    out.counters("active_views", "UI views currently listening for interactions.", "view",
+                 sorted(_active_views(bot).items()), kind="gauge")
+    dungeons = bot.get_cog("DungeonCog")
+    full = out.family("active_dungeon_runs", "gauge", "Dungeon runs hosted by this process.")
+    out.sample(full, len(getattr(dungeons, "active_dungeons", {})))
+
+    caches = autocomplete.CACHES.items()
+    hits = [(f"autocomplete_{name}", c.hits) for name, c in caches] + [("pages", LazyPager.hits)]
+    misses = [(f"autocomplete_{name}", c.misses) for name, c in caches] + [("pages", LazyPager.misses)]
+    out.counters("cache_hits_total", "Cache lookups served from memory.", "cache", hits)
+    out.counters("cache_misses_total", "Cache lookups that had to load or render.", "cache", misses)
+
+    out.counters("gateway_latency_seconds", "Heartbeat latency per shard.", "shard",
+                 ((str(shard_id), latency) for shard_id, latency in bot.latencies
+                  if not math.isinf(latency) and not math.isnan(latency)), kind="gauge")
+    return out.render()
+
+
+class MetricsExporter:
+    """Small aiohttp web server answering GET /metrics for Prometheus."""
+
+    def __init__(self, bot, host: str = "127.0.0.1", port: int = 9108) -> None:
+        self.bot = bot
+        self.host = host
+        self.port = port
+        self._runner: Optional[web.AppRunner] = None
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        try:
+            body = render_metrics(self.bot)
+        except Exception:
+            logger.exception("Rendering metrics failed")
+            return web.Response(status=500, text="metrics unavailable\n")
+        return web.Response(body=body.encode("utf-8"), headers={"Content-Type": CONTENT_TYPE})
+
+    async def start(self) -> None:
+        if self._runner is not None:
+            return
+        app = web.Application()
+        app.router.add_get("/metrics", self._handle)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        try:
+            await web.TCPSite(runner, self.host, self.port).start()
+        except OSError:
+            # e.g. the port is taken; don't leave the runner behind
+            await runner.cleanup()
+            raise
+        self._runner = runner
+        logger.info("Serving metrics on http://%s:%d/metrics", self.host, self.port)
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
@@ -0,0 +1,174 @@
+from __future__ import annotations
+import logging
+import string
+from typing import Any, Dict, List, Optional, Set
+
+from pymongo import ReturnDocument
+
+from server.playerData import EQUIPMENT_SLOTS, find_equipped
+
+logger = logging.getLogger("bot")
+
+# --- Instance id allocation ---
+# Ids stay 5 chars of A-Z0-9, but instead of drawing random ids and remembering every one
+# ever issued (the old `used_ids` array), each player has a counter (`instanceSeq`) and the
+# n-th id is a fixed permutation of n over the 36^5 id space. Multiplying by a stride coprime
+# with 36 is a bijection mod 36^5, so ids never repeat for a player and still look scrambled.
+_CHARSET = string.ascii_uppercase + string.digits
+_ID_LENGTH = 5
+_ID_SPACE = len(_CHARSET) ** _ID_LENGTH
+_ID_STRIDE = 16_777_259   # odd, not a multiple of 3 -> coprime with 36
+_ID_OFFSET = 20_511_949
+INSTANCE_SEQ_FIELD = "instanceSeq"
+
+
+def encode_instance_id(seq: int) -> str:
+    n = (seq * _ID_STRIDE + _ID_OFFSET) % _ID_SPACE
+    chars = []
+    for _ in range(_ID_LENGTH):
+        n, r = divmod(n, len(_CHARSET))
+        chars.append(_CHARSET[r])
+    return "".join(reversed(chars))
+
+
+async def _taken_ids(db, user_id: int, ids: List[str], use_stash: bool = False) -> Set[str]:
+    """Which of `ids` already exist (only possible against ids issued before the counter)."""
+    taken: Set[str] = set()
+    hot = await find_equipped(db, user_id, slots=(), extra_ids=ids)
+    if hot:
+        taken.update(inst.get("instance_id") for inst in hot.get("instances", []))
+    if use_stash and db.stash is not None:
+        cursor = db.stash.find({"id": user_id, "instance_id": {"$in": ids}}, {"instance_id": 1})
+        taken.update([doc["instance_id"] async for doc in cursor])
+    return taken
+
+
+async def allocate_instance_ids(db, user_id: int, count: int, use_stash: bool = False) -> List[str]:
+    """Reserve `count` fresh instance ids for a player with one atomic counter bump."""
+    ids: List[str] = []
+    while len(ids) < count:
+        need = count - len(ids)
+        doc = await db.equipment.find_one_and_update(
+            {"id": user_id},
+            {"$inc": {INSTANCE_SEQ_FIELD: need}},
+            projection={INSTANCE_SEQ_FIELD: 1},
+            return_document=ReturnDocument.AFTER,
+        )
+        if not doc:
+            return []
+        end = doc[INSTANCE_SEQ_FIELD]
+        batch = [encode_instance_id(seq) for seq in range(end - need, end)]
+        taken = await _taken_ids(db, user_id, batch, use_stash)
+        ids.extend(iid for iid in batch if iid not in taken)
+    return ids
+
+
+# --- Stash: unequipped instances kept out of the hot equipment doc ---
+# Every helper takes `use_stash` (settings.INSTANCE_STASH): with the stash off it is never
+# queried, so listings and allocations cost no extra round trip.
+async def add_instances(db, user_id: int, instances: List[Dict[str, Any]], use_stash: bool = False) -> None:
+    """Store newly created (unequipped) instances."""
+    if not instances:
+        return
+    if use_stash and db.stash is not None:
+        await db.stash.insert_many([{"id": user_id, **inst} for inst in instances])
+    else:
+        await db.equipment.update_one({"id": user_id}, {"$push": {"instances": {"$each": instances}}})
+
+
+def _strip_stash_fields(doc: Dict[str, Any]) -> Dict[str, Any]:
+    doc.pop("_id", None)
+    doc.pop("id", None)
+    return doc
+
+
+async def find_stashed(db, user_id: int, instance_id: str, use_stash: bool = False) -> Optional[Dict[str, Any]]:
+    if not use_stash or db.stash is None:
+        return None
+    doc = await db.stash.find_one({"id": user_id, "instance_id": instance_id})
+    return _strip_stash_fields(doc) if doc else None
+
+
+async def find_stashed_instances(db, user_id: int, use_stash: bool = False) -> List[Dict[str, Any]]:
+    if not use_stash or db.stash is None:
+        return []
+    return [_strip_stash_fields(doc) async for doc in db.stash.find({"id": user_id})]
+
+
+async def find_all_instances(db, user_id: int, use_stash: bool = False) -> List[Dict[str, Any]]:
+    """Every instance a player owns: the equipment doc's plus any stashed ones."""
+    equip_doc = await db.equipment.find_one({"id": user_id}, {"instances": 1})
+    instances = list((equip_doc or {}).get("instances", []) or [])
+    return instances + await find_stashed_instances(db, user_id, use_stash)
+
+
+# Moves write the copy before removing the original: a crash in between leaves the instance
+# in both places (the next move of it tidies that up), never in neither.
+async def unstash_instance(db, user_id: int, instance_id: str, use_stash: bool = False) -> bool:
+    """Move a stashed instance back into the equipment doc (before equipping it)."""
+    if not use_stash or db.stash is None:
+        return False
+    doc = await db.stash.find_one({"id": user_id, "instance_id": instance_id})
+    if not doc:
+        return False
+    # the $ne filter skips the push when an earlier, interrupted move already made it
+    await db.equipment.update_one(
+        {"id": user_id, "instances.instance_id": {"$ne": instance_id}},
+        {"$push": {"instances": _strip_stash_fields(doc)}},
+    )
+    await db.stash.delete_one({"id": user_id, "instance_id": instance_id})
+    return True
+
+
+async def stash_instance(db, user_id: int, instance_id: str) -> bool:
+    """Move an unequipped instance out of the equipment doc into the stash."""
+    if db.stash is None:
+        return False
+    doc = await db.equipment.find_one(
+        {"id": user_id, "instances.instance_id": instance_id},
+        {"instances": {"$elemMatch": {"instance_id": instance_id}}},
+    )
+    moved = (doc or {}).get("instances") or []
+    if not moved:
+        return False
+    # upsert: an earlier, interrupted move may already have written the copy
+    fields = {k: v for k, v in moved[0].items() if k != "instance_id"}
+    await db.stash.update_one(
+        {"id": user_id, "instance_id": instance_id}, {"$setOnInsert": fields}, upsert=True
+    )
+    await db.equipment.update_one({"id": user_id}, {"$pull": {"instances": {"instance_id": instance_id}}})
+    return True
+
+
+# --- Migration ---
+async def migrate_equipment_docs(db, use_stash: bool = False) -> Dict[str, int]:
+    """
+    Bring equipment docs up to the counter-based id layout:
+      - drop the `used_ids` array and start `instanceSeq` at 0 (old random ids are still
+        checked for clashes at allocation time, so nothing needs renumbering),
+      - with the stash on, move every unequipped instance into `db.stash`.
+    Safe to run on every startup; migrated docs are skipped.
+    """
+    counts = {"docs": 0, "stashed": 0}
+    if db.equipment is None:
+        return counts
+
+    result = await db.equipment.update_many(
+        {INSTANCE_SEQ_FIELD: {"$exists": False}},
+        {"$unset": {"used_ids": ""}, "$set": {INSTANCE_SEQ_FIELD: 0}},
+    )
+    counts["docs"] = result.modified_count
+
+    if use_stash and db.stash is not None:
+        await db.stash.create_index([("id", 1), ("instance_id", 1)], unique=True)
+        projection = {"id": 1, "instances.instance_id": 1, **{slot: 1 for slot in EQUIPMENT_SLOTS}}
+        async for doc in db.equipment.find({"instances.0": {"$exists": True}}, projection):
+            equipped = {doc.get(slot) for slot in EQUIPMENT_SLOTS if doc.get(slot)}
+            for inst in doc.get("instances", []):
+                iid = inst.get("instance_id")
+                if iid and iid not in equipped and await stash_instance(db, doc["id"], iid):
+                    counts["stashed"] += 1
+
+    if counts["docs"] or counts["stashed"]:
+        logger.info("Migrated %d equipment doc(s), stashed %d instance(s)", counts["docs"], counts["stashed"])
+    return counts
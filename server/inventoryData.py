@@ -0,0 +1,227 @@
+from __future__ import annotations
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+logger = logging.getLogger("bot")
+
+# Paged reads and slot-checked writes of the inventory doc.
+#
+# db.inventory keeps one flat doc per player ({"id": user_id, "<item key>": count, ...}).
+# Listing it used to mean shipping the whole doc to the bot and sorting/formatting every
+# key; instead the aggregation below does the filtering, sorting and slicing server-side
+# and returns only the requested page plus the total count. Item counts are changed
+# through change_items() so the occupied-slot counter stays right.
+
+# Slot accounting lives on the inventory doc itself so a write can check capacity:
+#   usedSlots - number of item keys with a count > 0, kept in step by change_items()
+#   maxSlots  - capacity; the only copy, shown by /inventory, /profile and /equipment
+#               (general.maxInventory used to hold it and is migrated here)
+USED_SLOTS_FIELD = "usedSlots"
+MAX_SLOTS_FIELD = "maxSlots"
+DEFAULT_MAX_SLOTS = 200
+
+INVENTORY_FULL_MESSAGE = "🎒 Your inventory is full! Free up a slot before collecting new item types."
+
+# Non-item fields of an inventory doc
+INVENTORY_META_FIELDS: Tuple[str, ...] = ("_id", "id", USED_SLOTS_FIELD, MAX_SLOTS_FIELD)
+
+InventoryEntry = Tuple[str, int]
+
+# --- Item facets, precomputed from the manifest ---
+# Filtering a player's inventory by type/rarity is an intersection of these key sets,
+# handed to the page query as one $in, instead of a manifest lookup per inventory line.
+_ITEMS_PATH = Path("data/items.json")
+_items_data: Dict[str, Any] = {}
+if _ITEMS_PATH.exists():
+    _items_data = json.loads(_ITEMS_PATH.read_text(encoding="utf-8")).get("items", {})
+
+RARITY_ORDER: Tuple[str, ...] = ("common", "uncommon", "rare", "epic", "legendary", "mythic")
+
+
+def _rarity_index(rarity: str) -> int:
+    return RARITY_ORDER.index(rarity) if rarity in RARITY_ORDER else len(RARITY_ORDER)
+
+
+def _rarity_of(key: str) -> str:
+    return str(_items_data[key].get("rarity", "common")).lower()
+
+
+keys_by_type: Dict[str, FrozenSet[str]] = {}
+keys_by_rarity: Dict[str, FrozenSet[str]] = {}
+for _key, _info in _items_data.items():
+    keys_by_type.setdefault(str(_info.get("type", "misc")).lower(), set()).add(_key)
+    keys_by_rarity.setdefault(_rarity_of(_key), set()).add(_key)
+keys_by_type = {k: frozenset(v) for k, v in sorted(keys_by_type.items())}
+keys_by_rarity = {k: frozenset(v) for k, v in sorted(keys_by_rarity.items(), key=lambda kv: _rarity_index(kv[0]))}
+
+# Item keys rarest first (then by key); the "rarity" sort ranks by position in this list
+_rarity_rank: List[str] = sorted(_items_data, key=lambda k: (-_rarity_index(_rarity_of(k)), k))
+
+SORT_MODES: Tuple[str, ...] = ("name", "quantity", "rarity")
+
+
+def slot_capacity(inv_doc: Optional[Dict[str, Any]]) -> int:
+    """Capacity of an inventory doc read with INVENTORY_CAPACITY (default when unset)."""
+    return int((inv_doc or {}).get(MAX_SLOTS_FIELD, DEFAULT_MAX_SLOTS))
+
+
+def facet_keys(item_type: Optional[str] = None, rarity: Optional[str] = None) -> Optional[FrozenSet[str]]:
+    """Item keys matching every given facet, or None when no facet is set (no filter)."""
+    selected = []
+    if item_type:
+        selected.append(keys_by_type.get(item_type.lower(), frozenset()))
+    if rarity:
+        selected.append(keys_by_rarity.get(rarity.lower(), frozenset()))
+    if not selected:
+        return None
+    return frozenset.intersection(*selected)
+
+
+def _sort_stages(sort: str) -> list:
+    if sort == "quantity":
+        return [{"$sort": {"v": -1, "k": 1}}]
+    if sort == "rarity":
+        # unknown keys (not in the manifest) rank after everything else
+        return [
+            {"$addFields": {"rank": {"$let": {
+                "vars": {"i": {"$indexOfArray": [_rarity_rank, "$k"]}},
+                "in": {"$cond": [{"$lt": ["$$i", 0]}, len(_rarity_rank), "$$i"]},
+            }}}},
+            {"$sort": {"rank": 1, "k": 1}},
+        ]
+    return [{"$sort": {"k": 1}}]
+
+
+def _held_items_expr() -> Dict[str, Any]:
+    """Expression: the doc's [{"k": item_key, "v": count}] pairs with a count > 0."""
+    return {"$filter": {
+        "input": {"$objectToArray": "$$ROOT"},
+        "as": "kv",
+        "cond": {"$and": [
+            {"$not": [{"$in": ["$$kv.k", list(INVENTORY_META_FIELDS)]}]},
+            {"$isNumber": "$$kv.v"},
+            {"$gt": ["$$kv.v", 0]},
+        ]},
+    }}
+
+
+def _entries_pipeline(user_id: int) -> list:
+    """Stages yielding one {"k": item_key, "v": count} doc per held item (count > 0)."""
+    return [
+        {"$match": {"id": user_id}},
+        {"$limit": 1},
+        {"$project": {"_id": 0, "items": _held_items_expr()}},
+        {"$unwind": "$items"},
+        {"$replaceRoot": {"newRoot": "$items"}},
+    ]
+
+
+async def find_inventory_page(
+    db,
+    user_id: int,
+    skip: int,
+    limit: int,
+    keys: Optional[FrozenSet[str]] = None,
+    sort: str = "name",
+) -> Tuple[int, List[InventoryEntry]]:
+    """
+    One page of a player's held items and the total number matching.
+    keys: only these item keys (see facet_keys); None for all
+    sort: one of SORT_MODES (item key, quantity descending, rarest first)
+    Only `limit` entries cross the wire whatever the inventory size.
+    """
+    if keys is not None and not keys:
+        return 0, []
+    pipeline = _entries_pipeline(user_id)
+    if keys is not None:
+        pipeline.append({"$match": {"k": {"$in": sorted(keys)}}})
+    pipeline += _sort_stages(sort) + [
+        {"$facet": {
+            "total": [{"$count": "n"}],
+            "page": [{"$skip": skip}, {"$limit": limit}],
+        }},
+    ]
+    docs = await db.inventory.aggregate(pipeline).to_list(length=1)
+    if not docs:
+        return 0, []
+    total = docs[0]["total"][0]["n"] if docs[0]["total"] else 0
+    return total, [(e["k"], e["v"]) for e in docs[0]["page"]]
+
+
+async def change_items(db, user_id: int, deltas: Dict[str, int]) -> bool:
+    """
+    Add/remove item counts in one conditional write, keeping usedSlots in step.
+    A key going from <= 0 to > 0 takes a slot, one dropping to <= 0 frees it. The filter
+    rejects the write when the net change would push usedSlots past maxSlots, so capacity
+    costs no extra read. Returns False (and changes nothing) when rejected.
+    A player without an inventory doc gets one (empty, default capacity) and the write is
+    retried, so a missing doc is never reported as a full inventory.
+    """
+    deltas = {k: int(v) for k, v in deltas.items() if v}
+    if not deltas:
+        return True
+
+    slot_changes = []
+    new_counts: Dict[str, Any] = {}
+    for key, delta in deltas.items():
+        old = {"$ifNull": [f"${key}", 0]}
+        new = {"$add": [old, delta]}
+        new_counts[key] = new
+        slot_changes.append({"$cond": [
+            {"$and": [{"$lte": [old, 0]}, {"$gt": [new, 0]}]}, 1,
+            {"$cond": [{"$and": [{"$gt": [old, 0]}, {"$lte": [new, 0]}]}, -1, 0]},
+        ]})
+    net = {"$add": slot_changes}
+    used = {"$ifNull": [f"${USED_SLOTS_FIELD}", 0]}
+
+    result = await db.inventory.update_one(
+        {"id": user_id, "$expr": {"$or": [
+            {"$lte": [net, 0]},
+            {"$lte": [{"$add": [used, net]}, {"$ifNull": [f"${MAX_SLOTS_FIELD}", DEFAULT_MAX_SLOTS]}]},
+        ]}},
+        # one $set stage: every expression sees the counts as they were before this write
+        [{"$set": {**new_counts, USED_SLOTS_FIELD: {"$add": [used, net]}}}],
+    )
+    if result.matched_count:
+        return True
+
+    # nothing matched: either over capacity or there is no doc; only create a missing one
+    created = await db.inventory.update_one(
+        {"id": user_id},
+        {"$setOnInsert": {USED_SLOTS_FIELD: 0, MAX_SLOTS_FIELD: DEFAULT_MAX_SLOTS}},
+        upsert=True,
+    )
+    if created.upserted_id is None:
+        return False
+    return await change_items(db, user_id, deltas)
+
+
+async def migrate_inventory_docs(db) -> int:
+    """
+    Give inventory docs written before slot accounting their usedSlots/maxSlots fields,
+    moving each player's general.maxInventory over as their maxSlots.
+    """
+    if db.inventory is None:
+        return 0
+    moved = 0
+    async for gen in db.general.find({"maxInventory": {"$exists": True}}, {"id": 1, "maxInventory": 1}):
+        await db.inventory.update_one(
+            {"id": gen["id"]}, {"$set": {MAX_SLOTS_FIELD: int(gen["maxInventory"])}}, upsert=True
+        )
+        await db.general.update_one({"id": gen["id"]}, {"$unset": {"maxInventory": ""}})
+        moved += 1
+    if moved:
+        logger.info("Moved maxInventory to inventory maxSlots for %d player(s)", moved)
+
+    result = await db.inventory.update_many(
+        {USED_SLOTS_FIELD: {"$exists": False}},
+        [{"$set": {
+            USED_SLOTS_FIELD: {"$size": _held_items_expr()},
+            MAX_SLOTS_FIELD: {"$ifNull": [f"${MAX_SLOTS_FIELD}", DEFAULT_MAX_SLOTS]},
+        }}],
+    )
+    if result.modified_count:
+        logger.info("Added slot counters to %d inventory doc(s)", result.modified_count)
+    return result.modified_count
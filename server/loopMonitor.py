@@ -0,0 +1,133 @@
+from __future__ import annotations
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from pathlib import Path
+from types import FrameType
+from typing import Optional
+
+from server.metrics import CommandMetrics, Histogram
+
+logger = logging.getLogger("bot.loop")
+
+# Frames from these top-level folders are the bot's own code; the first one found walking
+# out from the blocked frame is reported as the culprit.
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent
+_OWN_CODE = ("cogs", "server", "utils")
+
+STACK_LIMIT = 20
+
+
+def _culprit(frame: Optional[FrameType]) -> str:
+    while frame is not None:
+        try:
+            rel = Path(frame.f_code.co_filename).resolve().relative_to(_PROJECT_ROOT)
+        except ValueError:
+            rel = None
+        if rel is not None and rel.parts[0] in _OWN_CODE and rel.name != "loopMonitor.py":
+            return f"{rel.as_posix()}:{frame.f_lineno} in {frame.f_code.co_name}"
+        frame = frame.f_back
+    return "unknown"
+
+
+class LoopLagMonitor:
+    """
+    Measures event-loop lag: a task sleeps `interval` seconds and records how much later
+    than asked it woke up. Anything running on the loop without yielding (combat maths,
+    page building, JSON work...) shows up as lag for every other coroutine.
+
+    A watchdog thread catches the blocking itself: once the sleeper is more than
+    `slow_threshold` seconds overdue it samples the loop thread's stack and logs it with
+    the slash command being run, so a stall is attributed while it is happening. This is
+    cheap enough to leave on, unlike asyncio debug mode, which only reports the slow
+    callback's handle after the fact and slows every task; `asyncio_debug` turns that on
+    as well, for local digging.
+    """
+
+    def __init__(self, interval: float = 0.5, slow_threshold: float = 0.25,
+                 metrics: Optional[CommandMetrics] = None, asyncio_debug: bool = False) -> None:
+        self.interval = interval
+        self.slow_threshold = slow_threshold
+        self.metrics = metrics
+        self.asyncio_debug = asyncio_debug
+        self.lag = Histogram()
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self.stalls = 0
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        # monotonic time by which the sleeper should have woken up
+        self._due = 0.0
+        self._reported_due = 0.0
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+
+    def start(self) -> None:
+        if self._task is not None and not self._task.done():
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        if self.asyncio_debug:
+            self._loop.set_debug(True)
+            self._loop.slow_callback_duration = self.slow_threshold
+        self._due = time.monotonic() + self.interval
+        self._task = asyncio.create_task(self._run(), name="loop-lag-monitor")
+        if self.slow_threshold:
+            self._stopping.clear()
+            self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+            self._watchdog.start()
+
+    async def stop(self) -> None:
+        self._stopping.set()
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=1.0)
+            self._watchdog = None
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            before = time.monotonic()
+            self._due = before + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.monotonic() - before - self.interval)
+            self.last_lag = lag
+            self.max_lag = max(self.max_lag, lag)
+            self.lag.observe(lag * 1000)
+
+    # --- watchdog thread ---
+    def _watch(self) -> None:
+        poll = max(0.01, self.slow_threshold / 2)
+        while not self._stopping.wait(poll):
+            due = self._due
+            overdue = time.monotonic() - due
+            if overdue > self.slow_threshold and due != self._reported_due:
+                self._reported_due = due
+                self._report(overdue)
+
+    def _report(self, overdue: float) -> None:
+        self.stalls += 1
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return
+        task = asyncio.current_task(self._loop)
+        command = self.metrics.running.get(task) if self.metrics is not None and task is not None else None
+        stack = "".join(traceback.format_stack(frame, limit=STACK_LIMIT))
+        logger.warning(
+            "Event loop blocked for %.0f ms+ (command=%s, task=%s) in %s\n%s",
+            overdue * 1000,
+            f"/{command}" if command else "-",
+            task.get_name() if task is not None else "-",
+            _culprit(frame),
+            stack,
+        )
@@ -0,0 +1,261 @@
+from __future__ import annotations
+import asyncio
+import bisect
+import contextvars
+import copy
+import json
+import logging
+import math
+import threading
+import time
+import weakref
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import bson
+import discord
+from discord import app_commands
+from pymongo import monitoring
+
+logger = logging.getLogger("bot.metrics")
+
+# Per-command instrumentation.
+#
+# InstrumentedTree.interaction_check opens a CommandSample for each slash command and puts
+# it in a context variable; Motor copies the context into the executor thread that runs the
+# pymongo call, so MongoListener can charge every Mongo round trip (count, server time,
+# optionally reply bytes) to the command that issued it. The sample is closed by the bot's
+# on_app_command_completion event or the tree's on_error, and folded into per-command
+# histograms that /stats and the periodic log line read.
+
+# Latency bucket upper bounds in milliseconds (the last bucket is unbounded)
+LATENCY_BUCKETS_MS: Tuple[float, ...] = (
+    1, 2, 3, 5, 7.5, 10, 15, 25, 35, 50, 75, 100, 150, 250, 350, 500, 750,
+    1000, 1500, 2500, 5000, 10000, 30000,
+)
+
+# Where Mongo ops issued outside a slash command (event bus, migrations, views...) are counted
+BACKGROUND = "(background)"
+
+
+class Histogram:
+    """
+    Fixed-bucket latency histogram; percentiles interpolate inside the bucket and are
+    clamped to the smallest/largest value observed.
+    """
+
+    __slots__ = ("bounds", "counts", "count", "total", "min", "max")
+
+    def __init__(self, bounds: Tuple[float, ...] = LATENCY_BUCKETS_MS) -> None:
+        self.bounds = bounds
+        self.counts: List[int] = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                # the overflow bucket has no upper bound; the largest observed value is one
+                lower = self.bounds[i - 1] if i else 0.0
+                upper = self.bounds[i] if i < len(self.bounds) else self.max
+                value = lower + (upper - lower) * (rank - seen) / n
+                return min(max(value, self.min), self.max)
+            seen += n
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+@dataclass
+class CommandSample:
+    """One slash command invocation in flight."""
+    name: str
+    started: float = field(default_factory=time.perf_counter)
+    db_ops: int = 0
+    db_bytes: int = 0
+    db_seconds: float = 0.0
+
+
+@dataclass
+class CommandStats:
+    latency: Histogram = field(default_factory=Histogram)
+    errors: int = 0
+    db_ops: int = 0
+    db_bytes: int = 0
+    db_seconds: float = 0.0
+    wall_seconds: float = 0.0
+
+    def add(self, wall: float, sample: CommandSample, failed: bool) -> None:
+        self.latency.observe(wall * 1000)
+        self.errors += failed
+        self.db_ops += sample.db_ops
+        self.db_bytes += sample.db_bytes
+        self.db_seconds += sample.db_seconds
+        self.wall_seconds += wall
+
+    def summary(self) -> Dict[str, Any]:
+        n = self.latency.count or 1
+        return {
+            "count": self.latency.count,
+            "errors": self.errors,
+            "p50_ms": round(self.latency.percentile(0.50), 1),
+            "p95_ms": round(self.latency.percentile(0.95), 1),
+            "p99_ms": round(self.latency.percentile(0.99), 1),
+            "db_ops": round(self.db_ops / n, 2),
+            "db_kb": round(self.db_bytes / n / 1024, 2),
+            "db_ms": round(self.db_seconds / n * 1000, 1),
+            # everything that isn't a Mongo round trip: Python work and Discord API calls
+            "other_ms": round(max(0.0, self.wall_seconds - self.db_seconds) / n * 1000, 1),
+        }
+
+
+_current: contextvars.ContextVar[Optional[CommandSample]] = contextvars.ContextVar("command_sample", default=None)
+
+
+class CommandMetrics:
+    """
+    Per-command latency/DB statistics since startup, plus a window that is logged as one
+    structured line every `log_interval` seconds and then reset.
+    """
+
+    def __init__(self, log_interval: float = 300.0) -> None:
+        self.commands: Dict[str, CommandStats] = {}
+        self._window: Dict[str, CommandStats] = {}
+        # Mongo ops by command name ("find", "update"...), wherever they came from
+        self.mongo_ops: Dict[str, int] = {}
+        self.mongo_failures = 0
+        self._background = CommandSample(BACKGROUND)
+        # task -> name of the slash command it is running (read by the loop monitor)
+        self.running: "weakref.WeakKeyDictionary[asyncio.Task, str]" = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self.log_interval = log_interval
+        self._task: Optional[asyncio.Task] = None
+
+    # --- command hooks ---
+    def begin(self, interaction: discord.Interaction) -> CommandSample:
+        command = interaction.command
+        name = command.qualified_name if command else str((interaction.data or {}).get("name", "?"))
+        sample = CommandSample(name)
+        interaction.extras["metrics"] = sample
+        _current.set(sample)
+        task = asyncio.current_task()
+        if task is not None:
+            self.running[task] = name
+        return sample
+
+    def finish(self, interaction: discord.Interaction, failed: bool = False) -> None:
+        sample: Optional[CommandSample] = interaction.extras.pop("metrics", None)
+        if sample is None:
+            return
+        wall = time.perf_counter() - sample.started
+        with self._lock:
+            for table in (self.commands, self._window):
+                table.setdefault(sample.name, CommandStats()).add(wall, sample, failed)
+
+    # --- Mongo hooks (called from Motor's executor threads) ---
+    def record_db(self, op: str, seconds: float, nbytes: int, failed: bool = False) -> None:
+        sample = _current.get() or self._background
+        with self._lock:
+            sample.db_ops += 1
+            sample.db_bytes += nbytes
+            sample.db_seconds += seconds
+            self.mongo_ops[op] = self.mongo_ops.get(op, 0) + 1
+            self.mongo_failures += failed
+
+    @property
+    def background(self) -> CommandSample:
+        return self._background
+
+    def collect(self) -> Tuple[Dict[str, CommandStats], Dict[str, int], int]:
+        """Copies of (per-command stats, Mongo ops by name, failed Mongo ops) for exporting."""
+        with self._lock:
+            return copy.deepcopy(self.commands), dict(self.mongo_ops), self.mongo_failures
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {name: stats.summary() for name, stats in sorted(self.commands.items())}
+
+    # --- periodic log line ---
+    def start(self) -> None:
+        if self.log_interval and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._log_loop(), name="command-metrics")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def flush_window(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            window, self._window = self._window, {}
+        return {name: stats.summary() for name, stats in sorted(window.items())}
+
+    async def _log_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.log_interval)
+            window = self.flush_window()
+            if window:
+                logger.info("command_stats %s", json.dumps({"interval_s": self.log_interval, "commands": window}))
+
+
+class MongoListener(monitoring.CommandListener):
+    """
+    pymongo command listener feeding CommandMetrics.record_db.
+
+    Reply sizes are only measured with `reply_bytes` (METRICS_REPLY_BYTES): pymongo hands
+    over the decoded reply, so sizing it means BSON-encoding every reply again on the
+    executor thread. Without it, commands report 0 reply bytes.
+    """
+
+    def __init__(self, metrics: CommandMetrics, reply_bytes: bool = False) -> None:
+        self.metrics = metrics
+        self.reply_bytes = reply_bytes
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        pass
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        # the reply arrives already decoded; re-encoding is the only way to size it
+        nbytes = len(bson.encode(event.reply)) if self.reply_bytes and event.reply else 0
+        self.metrics.record_db(event.command_name, event.duration_micros / 1e6, nbytes)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        self.metrics.record_db(event.command_name, event.duration_micros / 1e6, 0, failed=True)
+
+
+class InstrumentedTree(app_commands.CommandTree):
+    """Command tree that opens a metrics sample before every slash command runs."""
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        metrics: Optional[CommandMetrics] = getattr(self.client, "metrics", None)
+        if metrics is not None and interaction.type is discord.InteractionType.application_command:
+            metrics.begin(interaction)
+        return True
+
+    async def on_error(self, interaction: discord.Interaction, error: app_commands.AppCommandError) -> None:
+        metrics: Optional[CommandMetrics] = getattr(self.client, "metrics", None)
+        if metrics is not None:
+            metrics.finish(interaction, failed=True)
+        await super().on_error(interaction, error)
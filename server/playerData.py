@@ -0,0 +1,99 @@
+from __future__ import annotations
+from typing import Any, Dict, Iterable, Optional, Sequence
+
+# Typed, projection-aware reads of per-player documents.
+#
+# Player docs (general/equipment/areas...) are keyed by {"id": user_id}. The equipment doc
+# carries the full `instances` list and the `used_ids` array, which both grow with every
+# crafted item, so handlers should ask for the access pattern they need instead of
+# `find_one({"id": user_id})`.
+
+Projection = Dict[str, Any]
+PlayerDoc = Dict[str, Any]
+
+# --- Equipment slot layout (matches the doc created by /register) ---
+ARMOR_SLOTS: Sequence[str] = ("head", "chest", "legs", "feet", "gloves")
+WEAPON_SLOTS: Sequence[str] = ("mainHand", "offHand")
+ACCESSORY_SLOTS: Sequence[str] = (
+    "talisman1", "talisman2", "talisman3",
+    "charm1", "charm2",
+    "ring1", "ring2", "amulet",
+)
+TOOL_SLOTS: Sequence[str] = ("fishingTool", "miningTool", "foragingTool", "farmingTool", "scavengingTool")
+EQUIPMENT_SLOTS: Sequence[str] = (*ARMOR_SLOTS, *WEAPON_SLOTS, *ACCESSORY_SLOTS, *TOOL_SLOTS)
+
+# --- Declared projections, one per access pattern ---
+REGISTERED: Projection = {"_id": 1}
+IN_DUNGEON: Projection = {"inDungeon": 1}
+# inventory doc: slot capacity (see server/inventoryData.py)
+INVENTORY_CAPACITY: Projection = {"maxSlots": 1}
+HP: Projection = {"hp": 1, "maxHP": 1}
+CURRENT_SUBAREA: Projection = {"currentArea": 1, "currentSubarea": 1}
+TRAVEL_STATE: Projection = {"currentArea": 1, "currentSubarea": 1, "lastTravel": 1, "travelCooldown": 1}
+# full instance list (listings, /inspect) but never the id bookkeeping
+EQUIPMENT_INSTANCES: Projection = {"used_ids": 0}
+COMBAT_STATS: Projection = {"hp": 1, "maxHP": 1, "strength": 1, "defense": 1, "evasion": 1, "accuracy": 1}
+# stamina regen and power rating, checked by the action commands before they do anything
+STAMINA: Projection = {**COMBAT_STATS, "stamina": 1, "maxStamina": 1, "lastStaminaUpdate": 1, "inDungeon": 1}
+FISHING_PROFILE: Projection = {**STAMINA, "treasureChance": 1, "trashChance": 1}
+HUNT_PROFILE: Projection = {**STAMINA, "wallet": 1}
+ESSENCES: Projection = {f"{skill}Essence": 1 for skill in ("foraging", "mining", "farming", "scavenging", "fishing")}
+PROFILE_CARD: Projection = {
+    **STAMINA, **ESSENCES, "name": 1, "bio": 1, "creation": 1, "wallet": 1,
+}
+# skill levels feeding combat stats (/hunt)
+COMBAT_LEVELS: Projection = {"combatLevel": 1, "miningLevel": 1, "foragingLevel": 1}
+SKILL_LEVELS: Projection = {
+    f"{skill}Level": 1
+    for skill in ("foraging", "mining", "farming", "scavenging", "fishing", "crafting", "combat")
+}
+
+
+def skill_fields(skill: str, *suffixes: str) -> Projection:
+    """The skills-doc fields of one skill, e.g. skill_fields("mining", "XP", "Level")."""
+    return {f"{skill}{suffix}": 1 for suffix in suffixes}
+
+
+def item_counts(*items: str) -> Projection:
+    """Just these item counts from an inventory doc."""
+    return {item: 1 for item in items}
+
+
+async def find_player(collection, user_id: int, projection: Projection) -> Optional[PlayerDoc]:
+    """find_one for a player doc with a declared projection (never the whole document)."""
+    return await collection.find_one({"id": user_id}, projection)
+
+
+async def find_equipped(
+    db,
+    user_id: int,
+    slots: Iterable[str] = EQUIPMENT_SLOTS,
+    extra_ids: Iterable[str] = (),
+) -> Optional[PlayerDoc]:
+    """
+    The equipment doc reduced to the given slot refs plus only the instances equipped in them
+    (and any `extra_ids`, e.g. the instance a command is about to equip).
+    Shaped like the stored doc, so callers can keep using `doc.get(slot)` / `doc["instances"]`.
+    The instance filter runs server-side; unequipped instances and used_ids never leave Mongo.
+    """
+    slots = list(slots)
+    pipeline = [
+        {"$match": {"id": user_id}},
+        {"$limit": 1},
+        {"$project": {
+            "_id": 0,
+            **{slot: 1 for slot in slots},
+            "instances": {"$filter": {
+                "input": {"$ifNull": ["$instances", []]},
+                "as": "inst",
+                # ids come from users; $literal keeps "$..." strings from reading as field paths
+                "cond": {"$in": [
+                    "$$inst.instance_id",
+                    [f"${slot}" for slot in slots] + [{"$literal": iid} for iid in extra_ids],
+                ]},
+            }},
+        }},
+    ]
+    docs = await db.equipment.aggregate(pipeline).to_list(length=1)
+    return docs[0] if docs else None
+
@@ -0,0 +1,172 @@
+from __future__ import annotations
+import asyncio
+import logging
+import re
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from types import CodeType, FrameType
+from typing import Dict, List, Optional
+
+from discord.ui import View
+
+from server.metrics import CommandMetrics
+
+logger = logging.getLogger("bot.profiler")
+
+# In-process sampling profiler for /profile_bot.
+#
+# On Unix, when started from the loop's (main) thread, a SIGPROF interval timer interrupts
+# the interpreter every `interval` seconds of CPU time and the handler records the
+# interrupted stack, so an idle bot waiting in select() costs nothing. Elsewhere a daemon
+# thread samples the loop thread through sys._current_frames() instead. Each stack is tagged
+# with what the loop was doing (the slash command, the UI view, or the task name) and
+# written in collapsed-stack format ("tag;outer;...;inner count"), ready for flamegraph.pl
+# or speedscope.
+
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent
+_VIEW_TASK = "discord-ui-view-"
+# trailing ids in task names ("event-bus", "discord-ui-view-timeout-3f9a...")
+_TASK_ID = re.compile(r"[-_:]?(?:[0-9a-f]{8,}|\d+)$")
+
+IDLE = "(idle)"
+MAX_DEPTH = 128
+
+
+# code object -> "func (path)"; keeps path resolution out of the sampling hot path
+_labels: Dict[CodeType, str] = {}
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    label = _labels.get(code)
+    if label is None:
+        path = Path(code.co_filename)
+        try:
+            where = path.resolve().relative_to(_PROJECT_ROOT).as_posix()
+        except ValueError:
+            where = path.name
+        label = _labels[code] = f"{code.co_name} ({where})"
+    return label
+
+
+def _view_name(frame: Optional[FrameType]) -> Optional[str]:
+    while frame is not None:
+        if "self" in frame.f_code.co_varnames:
+            owner = frame.f_locals.get("self")
+            if isinstance(owner, View):
+                return type(owner).__name__
+        frame = frame.f_back
+    return None
+
+
+class StackSampler:
+    """Samples the event-loop thread's stack for a fixed time and counts collapsed stacks."""
+
+    def __init__(self, metrics: Optional[CommandMetrics] = None, interval: float = 0.005) -> None:
+        self.metrics = metrics
+        self.interval = interval
+        self.samples: Counter = Counter()
+        # "signal" or "thread", once started
+        self.mode: Optional[str] = None
+        self._active = False
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        self._old_handler = None
+
+    @property
+    def running(self) -> bool:
+        return self._active
+
+    def start(self) -> None:
+        if self.running:
+            raise RuntimeError("The profiler is already running.")
+        self.samples.clear()
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._active = True
+        if hasattr(signal, "setitimer") and threading.current_thread() is threading.main_thread():
+            self.mode = "signal"
+            self._old_handler = signal.signal(signal.SIGPROF, self._on_signal)
+            signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+        else:
+            self.mode = "thread"
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._sample_thread, name="stack-sampler", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        if not self._active:
+            return
+        if self.mode == "signal":
+            signal.setitimer(signal.ITIMER_PROF, 0, 0)
+            signal.signal(signal.SIGPROF, self._old_handler or signal.SIG_DFL)
+        elif self.mode == "thread":
+            self._stopping.set()
+            if self._thread is not None:
+                self._thread.join(timeout=1.0)
+                self._thread = None
+        self._active = False
+
+    async def run_for(self, seconds: float) -> None:
+        self.start()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            self.stop()
+
+    # --- sampling ---
+    def _on_signal(self, signum, frame: Optional[FrameType]) -> None:
+        self._record(frame)
+
+    def _sample_thread(self) -> None:
+        while not self._stopping.wait(self.interval):
+            self._record(sys._current_frames().get(self._loop_thread_id))
+
+    def _tag(self, frame: Optional[FrameType]) -> str:
+        task = asyncio.current_task(self._loop)
+        if task is None:
+            return IDLE
+        if self.metrics is not None:
+            command = self.metrics.running.get(task)
+            if command:
+                return f"/{command}"
+        name = task.get_name()
+        if name.startswith(_VIEW_TASK):
+            view = _view_name(frame)
+            if view:
+                return view
+        return _TASK_ID.sub("", name) or "task"
+
+    def _record(self, frame: Optional[FrameType]) -> None:
+        if frame is None:
+            return
+        labels: List[str] = []
+        f = frame
+        while f is not None and len(labels) < MAX_DEPTH:
+            labels.append(_frame_label(f))
+            f = f.f_back
+        labels.append(self._tag(frame))
+        self.samples[";".join(reversed(labels))] += 1
+
+    # --- output ---
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+    def by_tag(self) -> Counter:
+        totals: Counter = Counter()
+        for stack, count in self.samples.items():
+            totals[stack.split(";", 1)[0]] += count
+        return totals
+
+    def write(self, directory: Path) -> Path:
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / time.strftime("profile-%Y%m%d-%H%M%S.collapsed")
+        path.write_text(self.collapsed(), encoding="utf-8")
+        logger.info("Wrote %d stack sample(s) to %s", sum(self.samples.values()), path)
+        return path
@@ -6,6 +6,9 @@ import json
 import math
 import random
 
+from server.inventoryData import change_items
+from server.playerData import ARMOR_SLOTS, find_equipped, find_player, skill_fields
+
 # load templates once
 _ITEM_TEMPLATES_PATH = Path("data/itemTemplates.json")
 _item_templates: Dict[str, Any] = {}
@@ -26,7 +29,7 @@ async def get_skill_set_bonuses(db, user_id: int, skill_name: str) -> Dict[str,
     Calculate skill-related set bonuses for a specific skill.
     Returns a dict with multipliers and bonuses for the given skill.
     """
-    equip_doc = await db.equipment.find_one({"id": user_id}) or {}
+    equip_doc = await find_equipped(db, user_id, ARMOR_SLOTS) or {}
     
     skill_bonuses = {
         "yield_multiplier": 0.0,
@@ -97,7 +100,7 @@ async def get_equipped_tool(db, user_id: int, slot: str) -> Tuple[Optional[Dict[
     - slot is like "farmingTool", "foragingTool", etc.
     - returns (None, None) if equipment missing or no tool equipped.
     """
-    equip_doc = await db.equipment.find_one({"id": user_id})
+    equip_doc = await find_equipped(db, user_id, (slot,))
     if not equip_doc:
         return None, None
 
@@ -157,16 +160,18 @@ async def apply_gather_results(
     essence_field: str,
     collection_key: str,
     set_bonuses: Dict[str, float] = None
-) -> Dict[str, Any]:
+) -> Optional[Dict[str, Any]]:
     """
     Apply DB updates for a gather action and handle skill & collection levelups.
     Now includes set bonus multipliers for XP and essence.
+    Returns None, with nothing applied, if the inventory has no free slot for the item.
     """
     if set_bonuses is None:
         set_bonuses = {"xp_multiplier": 0.0, "essence_multiplier": 0.0}
     
-    # 1) inventory
-    await db.inventory.update_one({"id": user_id}, {"$inc": {picked_key: final_qty}})
+    # 1) inventory (rejected when it would need a slot the player doesn't have)
+    if not await change_items(db, user_id, {picked_key: final_qty}):
+        return None
 
     # 2) stamina
     await db.general.update_one({"id": user_id}, {"$inc": {"stamina": -1}})
@@ -175,7 +180,7 @@ async def apply_gather_results(
     base_xp_gain = xp_per_unit * final_qty
     xp_gain = int(base_xp_gain * (1 + set_bonuses["xp_multiplier"]))
     
-    skill_doc = await db.skills.find_one({"id": user_id})
+    skill_doc = await find_player(db.skills, user_id, skill_fields(skill_prefix, "XP", "Level"))
     # defensive fetch
     old_xp = int(skill_doc.get(f"{skill_prefix}XP", 0))
     old_lvl = int(skill_doc.get(f"{skill_prefix}Level", 0))
@@ -223,7 +228,7 @@ async def apply_gather_results(
     await db.general.update_one({"id": user_id}, {"$inc": {essence_field: essence_gain}})
 
     # 5) collection
-    coll = await db.collections.find_one({"id": user_id})
+    coll = await find_player(db.collections, user_id, {collection_key: 1, f"{collection_key}Level": 1})
     old_coll = int(coll.get(collection_key, 0))
     old_coll_lvl = int(coll.get(f"{collection_key}Level", 0))
     new_coll = old_coll + final_qty
@@ -0,0 +1,98 @@
+from __future__ import annotations
+import copy
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+
+
+class StateBackend(ABC):
+    """
+    Storage for transient game state shared between bot processes (dungeon runs, caches...).
+    Values are plain JSON-like dicts addressed by (namespace, key).
+    """
+
+    async def ensure_indexes(self) -> None:
+        """Prepare the storage once at startup (nothing to do by default)."""
+
+    @abstractmethod
+    async def load(self, namespace: str, key: Any) -> Optional[Dict[str, Any]]:
+        ...
+
+    @abstractmethod
+    async def save(self, namespace: str, key: Any, value: Dict[str, Any]) -> None:
+        ...
+
+    @abstractmethod
+    async def delete(self, namespace: str, key: Any) -> None:
+        ...
+
+    @abstractmethod
+    async def keys(self, namespace: str) -> List[Any]:
+        ...
+
+
+class MemoryStateBackend(StateBackend):
+    """In-process backend; the default when the bot runs as a single process."""
+
+    def __init__(self) -> None:
+        self._data: Dict[str, Dict[Any, Dict[str, Any]]] = {}
+
+    async def load(self, namespace: str, key: Any) -> Optional[Dict[str, Any]]:
+        value = self._data.get(namespace, {}).get(key)
+        return copy.deepcopy(value) if value is not None else None
+
+    async def save(self, namespace: str, key: Any, value: Dict[str, Any]) -> None:
+        self._data.setdefault(namespace, {})[key] = copy.deepcopy(value)
+
+    async def delete(self, namespace: str, key: Any) -> None:
+        self._data.get(namespace, {}).pop(key, None)
+
+    async def keys(self, namespace: str) -> List[Any]:
+        return list(self._data.get(namespace, {}).keys())
+
+
+class MongoStateBackend(StateBackend):
+    """
+    Backend storing state in a Mongo collection so every shard process sees it.
+    Documents look like {"ns": namespace, "key": key, "value": {...}, "updated": epoch}.
+    """
+
+    def __init__(self, collection) -> None:
+        self._collection = collection
+
+    async def ensure_indexes(self) -> None:
+        # without it two processes upserting the same key at once can insert two docs
+        await self._collection.create_index([("ns", 1), ("key", 1)], unique=True)
+
+    async def load(self, namespace: str, key: Any) -> Optional[Dict[str, Any]]:
+        doc = await self._collection.find_one({"ns": namespace, "key": key}, {"value": 1})
+        return doc.get("value") if doc else None
+
+    async def save(self, namespace: str, key: Any, value: Dict[str, Any]) -> None:
+        await self._collection.update_one(
+            {"ns": namespace, "key": key},
+            {"$set": {"value": value, "updated": time.time()}},
+            upsert=True
+        )
+
+    async def delete(self, namespace: str, key: Any) -> None:
+        await self._collection.delete_one({"ns": namespace, "key": key})
+
+    async def keys(self, namespace: str) -> List[Any]:
+        cursor = self._collection.find({"ns": namespace}, {"key": 1})
+        return [doc["key"] async for doc in cursor]
+
+
+def create_state_backend(kind: str, db=None) -> StateBackend:
+    """
+    Build the backend named in config ("memory" or "mongo").
+    The mongo backend needs a connected Database wrapper.
+    """
+    kind = (kind or "memory").lower()
+    if kind == "memory":
+        return MemoryStateBackend()
+    if kind == "mongo":
+        if db is None or db.state is None:
+            raise ValueError("The mongo state backend needs a connected database.")
+        return MongoStateBackend(db.state)
+    raise ValueError(f"Unknown state backend: {kind!r}")
@@ -0,0 +1,61 @@
+from __future__ import annotations
+from typing import Dict, Generic, Iterable, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+# Discord shows at most 25 autocomplete choices, so that is all a node needs to keep.
+MAX_CHOICES = 25
+
+
+class _Node(Generic[T]):
+    __slots__ = ("children", "values")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, _Node[T]] = {}
+        self.values: List[T] = []
+
+
+class PrefixTrie(Generic[T]):
+    """
+    Case-insensitive prefix index for autocomplete over static game data.
+    Every node keeps the first `limit` values inserted below it, so `complete()` is a walk of
+    len(prefix) nodes and never enumerates the subtree.
+    """
+
+    def __init__(self, limit: int = MAX_CHOICES) -> None:
+        self.limit = limit
+        self._root: _Node[T] = _Node()
+
+    def insert(self, text: str, value: T) -> None:
+        node = self._root
+        self._add(node, value)
+        for ch in text.strip().lower():
+            node = node.children.setdefault(ch, _Node())
+            self._add(node, value)
+
+    def insert_words(self, text: str, value: T) -> None:
+        """Index the whole text and every word in it, so "forest" also finds "Dark Forest"."""
+        self.insert(text, value)
+        words = text.split()
+        for i in range(1, len(words)):
+            self.insert(" ".join(words[i:]), value)
+
+    def _add(self, node: _Node[T], value: T) -> None:
+        if len(node.values) < self.limit and value not in node.values:
+            node.values.append(value)
+
+    def complete(self, prefix: str, limit: Optional[int] = None) -> List[T]:
+        node: Optional[_Node[T]] = self._root
+        for ch in prefix.strip().lower():
+            node = node.children.get(ch)
+            if node is None:
+                return []
+        return node.values[: limit or self.limit]
+
+    @classmethod
+    def build(cls, entries: Iterable[tuple], limit: int = MAX_CHOICES) -> "PrefixTrie":
+        """Build from (text, value) pairs, indexing every word of each text."""
+        trie = cls(limit)
+        for text, value in entries:
+            trie.insert_words(text, value)
+        return trie
@@ -4,6 +4,8 @@ from typing import Dict, Any
 import json
 from pathlib import Path
 
+from server import autocomplete
+
 def regenerate_stamina(user_data: Dict) -> Dict:
     """Regenerates stamina based on time elapsed."""
     now = time.time()
@@ -78,5 +80,6 @@ async def unlock_collection_recipes(db, user_id: int, collection_name: str, new_
         {"$set": update_fields},
         upsert=True
     )
+    autocomplete.invalidate_recipes(user_id)
 
     print(f"[INFO] Unlocked {len(unlocked_recipes)} recipes for {collection_name} level {new_level} (User {user_id})")
\ No newline at end of file
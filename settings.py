@@ -1,4 +1,5 @@
 from pathlib import Path
+from typing import List, Optional
 import json
 
 _cfg = json.loads(Path("data/config.json").read_text(encoding="utf-8"))
@@ -6,4 +7,26 @@ DISCORD_TOKEN: str = _cfg["DISCORD_TOKEN"]
 APPLICATION_ID: int = int(_cfg["APPLICATION_ID"])
 COMMAND_PREFIX: str = _cfg["PREFIX"]
 GUILD_ID: int = _cfg["GUILD_ID"]
-DATABASE_URI: str = _cfg["DATABASE_TOKEN"]
\ No newline at end of file
+DATABASE_URI: str = _cfg["DATABASE_TOKEN"]
+# Optional sharding / multi-process settings
+SHARD_COUNT: Optional[int] = _cfg.get("SHARD_COUNT")
+SHARD_IDS: Optional[List[int]] = _cfg.get("SHARD_IDS")
+if SHARD_IDS is not None and SHARD_COUNT is None:
+    # each process runs a slice of the shards, so all of them must agree on the total
+    raise ValueError("SHARD_IDS is set in data/config.json but SHARD_COUNT is not; set both.")
+STATE_BACKEND: str = _cfg.get("STATE_BACKEND", "memory")
+# Keep unequipped item instances in a separate "stash" collection instead of the equipment doc
+INSTANCE_STASH: bool = _cfg.get("INSTANCE_STASH", False)
+# Seconds between structured per-command stats log lines (0 disables them)
+METRICS_LOG_INTERVAL: float = _cfg.get("METRICS_LOG_INTERVAL", 300)
+# Size every Mongo reply for the per-command KB figures (re-encodes each reply; 0 KB when off)
+METRICS_REPLY_BYTES: bool = _cfg.get("METRICS_REPLY_BYTES", False)
+# Serve Prometheus metrics on this port (unset disables the exporter)
+METRICS_PORT: Optional[int] = _cfg.get("METRICS_PORT")
+METRICS_HOST: str = _cfg.get("METRICS_HOST", "127.0.0.1")
+# Log a stack sample when the event loop is blocked longer than this many seconds (0 disables)
+LOOP_SLOW_THRESHOLD: float = _cfg.get("LOOP_SLOW_THRESHOLD", 0.25)
+# Also run asyncio in debug mode (slow callback warnings; too costly for production)
+LOOP_ASYNCIO_DEBUG: bool = _cfg.get("LOOP_ASYNCIO_DEBUG", False)
+# Where /profile_bot writes collapsed-stack files
+PROFILE_DIR: str = _cfg.get("PROFILE_DIR", "profiles")
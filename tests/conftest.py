@@ -0,0 +1,29 @@
+import json
+import os
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+CONFIG_PATH = ROOT / "data" / "config.json"
+
+# cogs load their data files relative to the repository root
+sys.path.insert(0, str(ROOT))
+os.chdir(ROOT)
+
+_wrote_config = False
+
+
+def pytest_configure(config):
+    # settings.py reads data/config.json on import; any values work, nothing connects
+    global _wrote_config
+    if not CONFIG_PATH.exists():
+        CONFIG_PATH.write_text(json.dumps({
+            "DISCORD_TOKEN": "test", "APPLICATION_ID": "1", "PREFIX": "!",
+            "GUILD_ID": 1, "DATABASE_TOKEN": "mongodb://localhost:27017",
+        }), encoding="utf-8")
+        _wrote_config = True
+
+
+def pytest_unconfigure(config):
+    if _wrote_config:
+        CONFIG_PATH.unlink()
@@ -0,0 +1,38 @@
+import asyncio
+from typing import Dict, Tuple
+
+from server.events import GATHER, EventBus
+
+
+def _run_bus(emits: int, batch_window: float, max_batch: int, settle: float) -> Dict[Tuple[str, str], int]:
+    totals: Dict[Tuple[str, str], int] = {}
+
+    async def handler(user_id, counts, interaction):
+        await asyncio.sleep(0)
+        for key, amount in counts.items():
+            totals[key] = totals.get(key, 0) + amount
+
+    async def main():
+        bus = EventBus(batch_window=batch_window, max_batch=max_batch)
+        bus.subscribe(handler)
+        bus.start()
+        for _ in range(emits):
+            bus.emit(1, GATHER, "oak")
+        await asyncio.sleep(settle)
+        await bus.stop()
+
+    asyncio.run(main())
+    return totals
+
+
+def test_stop_during_batch_window_keeps_the_taken_event():
+    # the consumer has already taken the first event and is waiting out the window
+    assert _run_bus(emits=1, batch_window=0.2, max_batch=500, settle=0.01) == {(GATHER, "oak"): 1}
+
+
+def test_stop_flushes_more_than_one_batch():
+    assert _run_bus(emits=1234, batch_window=0.2, max_batch=100, settle=0) == {(GATHER, "oak"): 1234}
+
+
+def test_stop_when_idle():
+    assert _run_bus(emits=0, batch_window=0.2, max_batch=500, settle=0.01) == {}
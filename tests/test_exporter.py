@@ -0,0 +1,25 @@
+import asyncio
+import socket
+
+import pytest
+
+from server.exporter import MetricsExporter
+from server.metrics import CommandMetrics
+
+
+class _Bot:
+    def __init__(self) -> None:
+        self.metrics = CommandMetrics(log_interval=0)
+
+
+def test_failed_bind_leaves_no_runner_behind():
+    async def main():
+        with socket.socket() as taken:
+            taken.bind(("127.0.0.1", 0))
+            taken.listen()
+            exporter = MetricsExporter(_Bot(), host="127.0.0.1", port=taken.getsockname()[1])
+            with pytest.raises(OSError):
+                await exporter.start()
+            return exporter._runner
+
+    assert asyncio.run(main()) is None
@@ -0,0 +1,97 @@
+import asyncio
+
+from benchmarks.memorydb import MemoryDatabase
+from server.instances import (
+    add_instances, allocate_instance_ids, find_all_instances, stash_instance, unstash_instance,
+)
+
+
+class UnusedCollection:
+    """Stands in for db.stash when it must not be queried."""
+
+    def __getattr__(self, name):
+        raise AssertionError(f"stash.{name} used with the stash off")
+
+
+def _new_player_db():
+    db = MemoryDatabase()
+
+    async def seed():
+        await db.equipment.insert_one({"id": 1, "instances": [], "instanceSeq": 0})
+    asyncio.run(seed())
+    return db
+
+
+def test_stash_not_queried_when_off():
+    db = _new_player_db()
+    db.stash = UnusedCollection()
+
+    async def main():
+        ids = await allocate_instance_ids(db, 1, 2)
+        await add_instances(db, 1, [{"instance_id": iid, "template": "toolrod"} for iid in ids])
+        return ids, await find_all_instances(db, 1)
+
+    ids, instances = asyncio.run(main())
+    assert [inst["instance_id"] for inst in instances] == ids
+
+
+def test_stashed_instances_listed_when_on():
+    db = _new_player_db()
+
+    async def main():
+        ids = await allocate_instance_ids(db, 1, 2, use_stash=True)
+        await add_instances(db, 1, [{"instance_id": iid, "template": "toolrod"} for iid in ids], use_stash=True)
+        return ids, await find_all_instances(db, 1, use_stash=True)
+
+    ids, instances = asyncio.run(main())
+    assert sorted(inst["instance_id"] for inst in instances) == sorted(ids)
+
+
+
+async def _locations(db, instance_id):
+    """(copies in the equipment doc, copies in the stash)"""
+    equip = await db.equipment.find_one({"id": 1}, {"instances": 1})
+    in_equipment = sum(inst["instance_id"] == instance_id for inst in equip["instances"])
+    return in_equipment, await db.stash.count_documents({"id": 1, "instance_id": instance_id})
+
+
+INSTANCE = {"instance_id": "AAAAA", "template": "toolrod"}
+
+
+def test_stash_round_trip():
+    db = _new_player_db()
+
+    async def main():
+        await add_instances(db, 1, [dict(INSTANCE)])
+        assert await stash_instance(db, 1, "AAAAA")
+        stashed = await _locations(db, "AAAAA")
+        assert await unstash_instance(db, 1, "AAAAA", use_stash=True)
+        return stashed, await _locations(db, "AAAAA")
+
+    assert asyncio.run(main()) == ((0, 1), (1, 0))
+
+
+def test_interrupted_stash_is_finished_by_the_next_move():
+    db = _new_player_db()
+
+    async def main():
+        await add_instances(db, 1, [dict(INSTANCE)])
+        # the stash copy was written, then the process died before the $pull
+        await db.stash.insert_one({"id": 1, **INSTANCE})
+        assert await stash_instance(db, 1, "AAAAA")
+        return await _locations(db, "AAAAA")
+
+    assert asyncio.run(main()) == (0, 1)
+
+
+def test_interrupted_unstash_is_finished_by_the_next_move():
+    db = _new_player_db()
+
+    async def main():
+        await add_instances(db, 1, [dict(INSTANCE)], use_stash=True)
+        # pushed back into the equipment doc, then the process died before the stash delete
+        await db.equipment.update_one({"id": 1}, {"$push": {"instances": dict(INSTANCE)}})
+        assert await unstash_instance(db, 1, "AAAAA", use_stash=True)
+        return await _locations(db, "AAAAA")
+
+    assert asyncio.run(main()) == (1, 0)
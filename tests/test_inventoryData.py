@@ -0,0 +1,49 @@
+import asyncio
+
+from benchmarks.memorydb import MemoryDatabase
+from server.inventoryData import MAX_SLOTS_FIELD, USED_SLOTS_FIELD, change_items, migrate_inventory_docs
+
+
+def test_migration_moves_max_inventory_to_max_slots():
+    async def main():
+        db = MemoryDatabase()
+        await db.general.insert_one({"id": 1, "maxInventory": 2})
+        await db.inventory.insert_one({"id": 1, "oak": 1})
+        await migrate_inventory_docs(db)
+        inv = await db.inventory.find_one({"id": 1})
+        gen = await db.general.find_one({"id": 1})
+        # the migrated capacity is the one enforced
+        full = not await change_items(db, 1, {"stone": 1, "coal": 1})
+        return inv, gen, full
+
+    inv, gen, full = asyncio.run(main())
+    assert inv[MAX_SLOTS_FIELD] == 2
+    assert inv[USED_SLOTS_FIELD] == 1
+    assert "maxInventory" not in gen
+    assert full
+
+
+def test_change_items_creates_a_missing_inventory_doc():
+    async def main():
+        db = MemoryDatabase()
+        added = await change_items(db, 1, {"oak": 3})
+        return added, await db.inventory.find_one({"id": 1})
+
+    added, inv = asyncio.run(main())
+    assert added
+    assert inv["oak"] == 3
+    assert inv[USED_SLOTS_FIELD] == 1
+    assert inv[MAX_SLOTS_FIELD] == 200
+
+
+def test_change_items_rejects_over_capacity():
+    async def main():
+        db = MemoryDatabase()
+        await db.inventory.insert_one({"id": 1, "oak": 1, USED_SLOTS_FIELD: 1, MAX_SLOTS_FIELD: 1})
+        added = await change_items(db, 1, {"stone": 1})
+        return added, await db.inventory.count_documents({"id": 1}), await db.inventory.find_one({"id": 1})
+
+    added, docs, inv = asyncio.run(main())
+    assert not added
+    assert docs == 1
+    assert "stone" not in inv
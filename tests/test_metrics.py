@@ -0,0 +1,40 @@
+from types import SimpleNamespace
+
+from server.metrics import CommandMetrics, Histogram, MongoListener
+
+
+def test_overflow_percentile_stays_within_observed_max():
+    hist = Histogram(bounds=(1, 10, 100))
+    for value in (150, 160, 170):
+        hist.observe(value)
+    assert hist.percentile(0.99) <= 170
+    assert hist.percentile(0.50) >= 150
+
+
+def test_percentile_clamped_to_observed_min():
+    hist = Histogram(bounds=(1, 10, 100))
+    for value in (90, 95):
+        hist.observe(value)
+    assert 90 <= hist.percentile(0.01) <= 95
+    assert hist.percentile(1.0) == 95
+
+
+def test_empty_histogram():
+    assert Histogram().percentile(0.99) == 0.0
+
+
+def _reply_event(reply):
+    return SimpleNamespace(command_name="find", duration_micros=1500, reply=reply)
+
+
+def test_reply_bytes_are_opt_in():
+    reply = {"ok": 1, "cursor": {"firstBatch": [{"id": 1, "name": "x" * 100}]}}
+
+    metrics = CommandMetrics(log_interval=0)
+    MongoListener(metrics).succeeded(_reply_event(reply))
+    assert metrics.background.db_ops == 1
+    assert metrics.background.db_bytes == 0
+
+    metrics = CommandMetrics(log_interval=0)
+    MongoListener(metrics, reply_bytes=True).succeeded(_reply_event(reply))
+    assert metrics.background.db_bytes > 100
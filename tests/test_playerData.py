@@ -0,0 +1,97 @@
+import asyncio
+from typing import Any, Dict, List
+
+import pytest
+
+from benchmarks.memorydb import MemoryDatabase
+from benchmarks.scenarios import Bench, grant_items, recipe_ingredients, seed_players
+from benchmarks.stubs import EXTENSIONS, StubInteraction, build_bot, close_bot
+
+# Per-player docs that grow with play; handlers must declare what they read from them
+# (server/playerData.py) instead of fetching the whole document.
+GUARDED = ("general", "skills", "inventory", "equipment", "collections")
+
+
+class ProjectionGuard:
+    """A collection that records every read made without a projection."""
+
+    def __init__(self, name: str, collection, violations: List[str]) -> None:
+        self._name = name
+        self._collection = collection
+        self._violations = violations
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._collection, attr)
+
+    def _check(self, how: str, projection) -> None:
+        if not projection:
+            self._violations.append(f"{how} on {self._name} without a projection")
+
+    def find_one(self, filter=None, projection=None, **kwargs):
+        self._check("find_one", projection)
+        return self._collection.find_one(filter, projection, **kwargs)
+
+    def find(self, filter=None, projection=None, **kwargs):
+        self._check("find", projection)
+        return self._collection.find(filter, projection, **kwargs)
+
+    def aggregate(self, pipeline: List[Dict[str, Any]], **kwargs):
+        self._check("aggregate", [stage for stage in pipeline if "$project" in stage])
+        return self._collection.aggregate(pipeline, **kwargs)
+
+
+@pytest.fixture(scope="module")
+def loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(scope="module")
+def game(loop):
+    db = MemoryDatabase()
+    bot = loop.run_until_complete(build_bot(db, EXTENSIONS + ("cogs.features.profile", "cogs.features.inspect")))
+    player = loop.run_until_complete(seed_players(bot, db, 1))[0]
+    grant_items(Bench(bot, db, [player]), player, {
+        **recipe_ingredients("toolrod", 10), **recipe_ingredients("wooden helmet", 10), "oak": 1,
+    })
+    violations: List[str] = []
+    for name in GUARDED:
+        setattr(db, name, ProjectionGuard(name, getattr(db, name), violations))
+    yield bot, db, player, violations
+    loop.run_until_complete(close_bot(bot))
+
+
+def _call(bot, player, cog_name: str, command: str, *args):
+    cog = bot.get_cog(cog_name)
+    interaction = StubInteraction(bot, player.user, command=command)
+    return getattr(cog, command).callback(cog, interaction, *args)
+
+
+HANDLERS = {
+    "mine": ("MiningCog", "mine"),
+    "forage": ("ForagingCog", "forage"),
+    "scavenge": ("ScavengingCog", "scavenge"),
+    "hunt": ("CombatCog", "hunt"),
+    "craft": ("CraftingCog", "craft", "toolrod"),
+    "craft_armor": ("CraftingCog", "craft", "wooden helmet"),
+    "inspect": ("InspectCog", "inspect", "oak"),
+    "inventory": ("InventoryCog", "inventory"),
+    "profile": ("ProfileCog", "profile"),
+    "dungeon": ("DungeonCog", "dungeon"),
+}
+
+
+@pytest.mark.parametrize("handler", list(HANDLERS))
+def test_handler_reads_player_docs_through_projections(loop, game, handler):
+    bot, db, player, violations = game
+    violations.clear()
+    loop.run_until_complete(_call(bot, player, *HANDLERS[handler]))
+    assert violations == []
+
+
+def test_guard_flags_unprojected_equipment_read(loop, game):
+    bot, db, player, violations = game
+    violations.clear()
+    loop.run_until_complete(db.equipment.find_one({"id": player.id}))
+    assert violations == ["find_one on equipment without a projection"]
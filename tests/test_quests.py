@@ -0,0 +1,91 @@
+import asyncio
+from typing import Dict, Tuple
+
+from benchmarks.memorydb import MemoryDatabase
+from benchmarks.scenarios import seed_players
+from benchmarks.stubs import build_bot, close_bot
+
+# meadow quest: collect wood 10, ore 10, herb 5; seeded players stand in the meadow
+QUEST_ID = "crafting_basics_intro"
+# lynthaven quest: explore lynthaven, talk to its blacksmith
+EXPLORE_QUEST_ID = "wayfarers_welcome"
+
+Batch = Dict[Tuple[str, str], int]
+WOOD = ("collect", "wood")
+
+
+def _play(progress: Dict[str, int], *batches: Batch, quest_id: str = QUEST_ID):
+    """Run the batches concurrently against one player holding quest_id; returns (completions, quests doc, general doc)."""
+
+    async def main():
+        # a round-trip delay lets the concurrent batches interleave between their reads and writes
+        db = MemoryDatabase(latency=0.002)
+        bot = await build_bot(db, ("cogs.register", "cogs.features.quests"))
+        try:
+            player = (await seed_players(bot, db, 1))[0]
+            await db.quests.update_one({"id": player.id}, {"$set": {
+                f"active_quests.{quest_id}": {"objectives": dict(progress), "status": "active"},
+            }}, upsert=True)
+            cog = bot.get_cog("QuestCog")
+            results = await asyncio.gather(*(cog.update_progress_many(player.id, batch) for batch in batches))
+            completions = [comp for result in results for comp in result]
+            quests = await db.quests.find_one({"id": player.id}, {"active_quests": 1, "completed_quests": 1})
+            general = await db.general.find_one({"id": player.id}, {"wallet": 1})
+            return completions, quests, general
+        finally:
+            await close_bot(bot)
+
+    return asyncio.run(main())
+
+
+def test_concurrent_progress_adds_up():
+    start = {"collect:wood": 0, "collect:ore": 0, "collect:herb": 0}
+    completions, quests, _ = _play(start, {WOOD: 2}, {WOOD: 3}, {WOOD: 4})
+    assert completions == []
+    assert quests["active_quests"][QUEST_ID]["objectives"]["collect:wood"] == 9
+
+
+def test_concurrent_completion_rewards_once():
+    almost = {"collect:wood": 9, "collect:ore": 10, "collect:herb": 5}
+    _, _, before = _play(almost)
+    completions, quests, general = _play(almost, {WOOD: 1}, {WOOD: 1}, {WOOD: 1})
+    assert [comp["quest_id"] for comp in completions] == [QUEST_ID]
+    assert QUEST_ID not in quests.get("active_quests", {})
+    assert quests["completed_quests"].count(QUEST_ID) == 1
+    assert 15 <= general["wallet"] - before["wallet"] <= 25
+
+
+def test_explore_counts_outside_the_quest_sub_area():
+    # /travel emits explore for each sub-area on the route while the player ends up elsewhere
+    start = {"explore:lynthaven": 0, "talk:lynthaven_blacksmith": 0}
+    _, quests, _ = _play(start, {("explore", "lynthaven"): 1}, quest_id=EXPLORE_QUEST_ID)
+    assert quests["active_quests"][EXPLORE_QUEST_ID]["objectives"]["explore:lynthaven"] == 1
+
+
+def test_other_objectives_still_need_the_quest_sub_area():
+    start = {"explore:lynthaven": 0, "talk:lynthaven_blacksmith": 0}
+    _, quests, _ = _play(start, {("talk", "lynthaven_blacksmith"): 1}, quest_id=EXPLORE_QUEST_ID)
+    assert quests["active_quests"][EXPLORE_QUEST_ID]["objectives"]["talk:lynthaven_blacksmith"] == 0
+
+
+def test_available_matches_a_scan_of_every_template():
+    from cogs.features.quests import QuestGraph
+
+    templates = {
+        "a": {}, "b": {"prereqs": ["a"]}, "c": {"prereqs": ["a", "b"]},
+        "d": {"prereqs": ["a"], "npc_given": True}, "e": {}, "f": {"prereqs": ["e"]},
+    }
+    graph = QuestGraph(templates, {})
+
+    def scan(completed, active):
+        done = graph.mask_of(completed)
+        return [
+            qid for qid, tpl in templates.items()
+            if qid not in completed and qid not in active
+            and not tpl.get("npc_given") and graph.prereqs_met(qid, done)
+        ]
+
+    for completed, active in (
+        ([], []), (["a"], []), (["a"], ["b"]), (["b", "a"], []), (["e", "a", "b"], ["c"]), (["f"], []),
+    ):
+        assert graph.available(completed, active) == scan(completed, active)
@@ -1,75 +1,122 @@
 from __future__ import annotations
+import inspect
 import math
-from typing import Any, Dict, List, Sequence
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple, Union
 
-# Build inventory pages from an inventory document.
-def build_inventory_pages(
-    inv_doc: Dict[str, Any],
+import discord
+from discord.ui import Button, Select, View
+
+PageRenderer = Callable[[int], Union[str, Awaitable[str]]]
+
+
+class LazyPager:
+    """
+    A paged listing that renders a page only when it is first shown.
+    `render(index)` may be sync or async (e.g. a DB query for just that slice); the last
+    `cache_size` rendered pages are kept so flipping back and forth doesn't re-render.
+    """
+
+    # Page cache counters across every pager (exported as metrics)
+    hits = 0
+    misses = 0
+
+    def __init__(self, total_pages: int, render: PageRenderer, cache_size: int = 4) -> None:
+        self.total_pages = max(1, total_pages)
+        self._render = render
+        self._cache_size = cache_size
+        self._cache: "OrderedDict[int, str]" = OrderedDict()
+
+    async def get(self, index: int) -> str:
+        index = max(0, min(index, self.total_pages - 1))
+        if index in self._cache:
+            LazyPager.hits += 1
+            self._cache.move_to_end(index)
+            return self._cache[index]
+        LazyPager.misses += 1
+        content = self._render(index)
+        if inspect.isawaitable(content):
+            content = await content
+        self._cache[index] = content
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+        return content
+
+    def prime(self, index: int, content: str) -> None:
+        """Store a page that was rendered as a by-product of something else."""
+        self._cache[index] = content
+
+    @classmethod
+    def static(cls, content: str) -> "LazyPager":
+        return cls(1, lambda _index: content)
+
+
+InventoryFetch = Callable[[int, int], Awaitable[Tuple[int, List[Tuple[str, int]]]]]
+
+
+# Inventory pages, queried one page at a time (see server/inventoryData.py).
+async def inventory_pager(
+    fetch: InventoryFetch,
     items_manifest: Dict[str, Any],
     max_slots: int,
     items_per_page: int = 10,
-    title: str = "Inventory"
-) -> List[str]:
+    title: str = "Inventory",
+    filtered: bool = False
+) -> LazyPager:
     """
-    Convert inventory document -> pages (list[str]).
-    inv_doc: mongo document for db.inventory
+    fetch(skip, limit) -> (total items held, [(item_key, qty), ...]) for one sorted slice
     items_manifest: data/items.json['items'] mapping for names & emojis
-    max_slots: maxInventory to display in header
+    max_slots: inventory capacity (maxSlots) to display in header
     items_per_page: page size
+    filtered: fetch returns a filtered subset (header shows matches, not slots used)
+    Page 1 is fetched now (it also yields the total); other pages when navigated to.
     """
-    if not inv_doc:
-        return [f"**{title}** — 0 items\n\n*(empty)*"]
-
-    # Filter out metadata fields
-    item_entries = [
-        (k, inv_doc[k]) for k in inv_doc.keys()
-        if k not in ("_id", "id") and isinstance(inv_doc[k], int) and inv_doc[k] > 0
-    ]
-    if not item_entries:
-        return [f"**{title}** — 0 items\n\n*(empty)*"]
-
-    # Build display lines
-    lines: List[str] = []
-    for key, qty in sorted(item_entries):
-        emoji = items_manifest.get(key, {}).get("emoji", "")
-        name = items_manifest.get(key, {}).get("name", key).title()
-        lines.append(f"{qty} x {name} {emoji}".strip())
-
-    pages: List[str] = []
-    total_pages = max(1, math.ceil(len(lines) / items_per_page))
-    for p in range(total_pages):
-        start = p * items_per_page
-        end = start + items_per_page
-        page_lines = lines[start:end]
-        header = f"**{title}** — Page {p+1}/{total_pages} — {len(lines):,}/{max_slots:,} slots \n\n"
-        pages.append(header + "\n".join(page_lines))
-
-    return pages
-
-
-# Build pages for instances array (owned item instances)
-def build_instance_pages(
+    total, first = await fetch(0, items_per_page)
+    if not total:
+        return LazyPager.static(f"**{title}** — 0 items\n\n*({'no matching items' if filtered else 'empty'})*")
+
+    total_pages = max(1, math.ceil(total / items_per_page))
+
+    def format_page(p: int, entries: List[Tuple[str, int]], count: int) -> str:
+        page_lines: List[str] = []
+        for key, qty in entries:
+            emoji = items_manifest.get(key, {}).get("emoji", "")
+            name = items_manifest.get(key, {}).get("name", key).title()
+            page_lines.append(f"{qty} x {name} {emoji}".strip())
+        counter = f"{count:,} matching" if filtered else f"{count:,}/{max_slots:,} slots"
+        header = f"**{title}** — Page {p+1}/{total_pages} — {counter} \n\n"
+        return header + "\n".join(page_lines)
+
+    async def render(p: int) -> str:
+        count, entries = await fetch(p * items_per_page, items_per_page)
+        return format_page(p, entries, count)
+
+    pager = LazyPager(total_pages, render)
+    pager.prime(0, format_page(0, first, total))
+    return pager
+
+
+# Pages for the instances array (owned item instances)
+def instance_pager(
     instances: Sequence[Dict[str, Any]],
     page_size: int = 15,
     title: str = "Items"
-) -> List[str]:
+) -> LazyPager:
     """
-    Convert list of instance docs -> pages (list[str]).
+    List of instance docs -> pager.
     instances: list-like of instance dicts with 'instance_id', 'template', 'custom_name', 'enchants'
     """
     insts = list(instances or [])
     if not insts:
-        return [f"**{title}** — 0 items\n\n*(no instances)*"]
+        return LazyPager.static(f"**{title}** — 0 items\n\n*(no instances)*")
 
     total_pages = max(1, math.ceil(len(insts) / page_size))
-    pages: List[str] = []
-    for p in range(total_pages):
+
+    def render(p: int) -> str:
         start = p * page_size
-        end = start + page_size
-        page_items = insts[start:end]
         header = f"**{title}** — Page {p+1}/{total_pages} — {len(insts)} total instance(s)\n\n"
         lines: List[str] = []
-        for inst in page_items:
+        for inst in insts[start:start + page_size]:
             iid = inst.get("instance_id", "<no-id>")
             template = inst.get("template", "Unknown")
             custom = inst.get("custom_name")
@@ -77,5 +124,88 @@ def build_instance_pages(
             name_part = template if not custom else f"{template} ({custom})"
             enchants_part = f" [enchants: {len(enchants)}]" if enchants else ""
             lines.append(f"`{iid}` — {name_part}{enchants_part}")
-        pages.append(header + "\n".join(lines))
-    return pages
+        return header + "\n".join(lines)
+
+    return LazyPager(total_pages, render)
+
+
+class PagedView(View):
+    """
+    Prev/Next buttons (row 0) over one of several pagers, with a dropdown to switch
+    between them (row 1). Each mode is (SelectOption, LazyPager); the first is shown first.
+    """
+
+    def __init__(self, owner_id: int, modes: Sequence[Tuple[discord.SelectOption, LazyPager]],
+                 placeholder: str = "Switch view...", timeout: float = 120.0):
+        super().__init__(timeout=timeout)
+        self.owner_id = owner_id
+        self.pagers: Dict[str, LazyPager] = {opt.value: pager for opt, pager in modes}
+        self.mode = modes[0][0].value
+        self.page = 0
+        self.message: Optional[discord.Message] = None
+
+        # Prev / Next buttons row=0
+        self.prev_button = Button(emoji="⬅️", style=discord.ButtonStyle.gray, row=0)
+        self.next_button = Button(emoji="➡️", style=discord.ButtonStyle.gray, row=0)
+        self.prev_button.callback = self._on_prev
+        self.next_button.callback = self._on_next
+        self.add_item(self.prev_button)
+        self.add_item(self.next_button)
+
+        # Selector row=1 (appears below buttons)
+        self.selector = Select(
+            placeholder=placeholder,
+            options=[opt for opt, _ in modes],
+            min_values=1,
+            max_values=1,
+            row=1
+        )
+        self.selector.callback = self._on_select
+        self.add_item(self.selector)
+        self._update_controls()
+
+    @property
+    def pager(self) -> LazyPager:
+        return self.pagers[self.mode]
+
+    def _update_controls(self) -> None:
+        if self.page >= self.pager.total_pages:
+            self.page = self.pager.total_pages - 1
+        self.prev_button.disabled = (self.page == 0)
+        self.next_button.disabled = (self.page >= self.pager.total_pages - 1)
+
+    async def current_content(self) -> str:
+        return await self.pager.get(self.page)
+
+    async def _show(self, interaction: discord.Interaction) -> None:
+        self._update_controls()
+        await interaction.response.edit_message(content=await self.current_content(), view=self)
+
+    async def _on_prev(self, interaction: discord.Interaction) -> None:
+        if interaction.user.id != self.owner_id:
+            return await interaction.response.send_message("Only the command user may use these buttons.", ephemeral=True)
+        if self.page <= 0:
+            return await interaction.response.defer()
+        self.page -= 1
+        await self._show(interaction)
+
+    async def _on_next(self, interaction: discord.Interaction) -> None:
+        if interaction.user.id != self.owner_id:
+            return await interaction.response.send_message("Only the command user may use these buttons.", ephemeral=True)
+        if self.page >= self.pager.total_pages - 1:
+            return await interaction.response.defer()
+        self.page += 1
+        await self._show(interaction)
+
+    async def _on_select(self, interaction: discord.Interaction) -> None:
+        if interaction.user.id != self.owner_id:
+            return await interaction.response.send_message("Only the command user may switch views.", ephemeral=True)
+        self.mode = interaction.data["values"][0]
+        # reset to first page when switching
+        self.page = 0
+        await self._show(interaction)
+
+    async def on_timeout(self) -> None:
+        # disable all controls when the view times out
+        for item in self.children:
+            item.disabled = True